@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：Shopify 實際金額效能比較（舊 df.apply vs 向量化）
+# 用法：python benchmarks/bench_actual_amount.py --rows 1000000
+# 說明：
+#   1. 產生計算版-V3 的欄位（約一半的明細有分攤後金額）
+#   2. 分別計時舊的逐行 apply 和 money.prefer_positive，
+#      以及整個 standardize_shopify（只換掉實際金額的算法）
+#   3. 兩種算法的結果要完全相同，不同時標示 ❌
+# ============================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from ecommerce_analytics.channels import CHANNEL_ADAPTERS, standardize_orders, standardize_shopify
+from ecommerce_analytics.money import times_cents
+
+
+def make_v3_orders(n_rows, seed=0):
+    """計算版-V3 的欄位（standardize_shopify 用到的）"""
+    rng = np.random.default_rng(seed)
+    quantity = rng.integers(1, 4, size=n_rows)
+    price = rng.integers(100, 2000, size=n_rows).astype('float64')
+    allocated = np.where(rng.random(n_rows) < 0.5, np.round(quantity * price * 0.9, 2), 0.0)
+    return pd.DataFrame({
+        'Order No': [f"#{1001 + i // 3}" for i in range(n_rows)],
+        'Created at': pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 31 * 86400, size=n_rows), unit='s'),
+        'Customer Name': rng.choice(['王小明', '陳美玲', 'Amy Chen', 'John Lee'], size=n_rows),
+        'Product Name': rng.choice([f"商品 {i}" for i in range(200)], size=n_rows),
+        'Quantity': quantity,
+        'Selling Price': price,
+        'Total': quantity * price,
+        'Discount Amount': np.round(quantity * price * 0.1, 2),
+        '分攤後金額': allocated,
+        '分攤後折扣': np.round(quantity * price - allocated, 2),
+        'Cost  (unit)': np.round(price * 0.4, 2),
+        'Profit (unit)': np.round(price * 0.6, 2),
+        'Total Cost': np.round(quantity * price * 0.4, 2),
+        'Total Profit': np.round(quantity * price * 0.6, 2),
+        ' Gross Profit Margin': 0.6,
+    })
+
+
+def legacy_derive(std):
+    """standardize_shopify 原本的實際金額算法（只用於比較）"""
+    std = std.assign(商品原始金額=times_cents(std['數量'], std['單價']))
+    std['實際金額'] = std.apply(
+        lambda row: row['分攤後金額'] if row['分攤後金額'] > 0 else row['商品原始金額'],
+        axis=1
+    )
+    return std
+
+
+def legacy_standardize(df):
+    adapter = CHANNEL_ADAPTERS['Shopify']
+    CHANNEL_ADAPTERS['Shopify'] = dict(adapter, derive=legacy_derive)
+    try:
+        return standardize_orders(df, 'Shopify')
+    finally:
+        CHANNEL_ADAPTERS['Shopify'] = adapter
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    result = func(df)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shopify 實際金額效能比較')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = make_v3_orders(args.rows)
+
+    print("=" * 60)
+    print(f"⏱️ Shopify 實際金額效能比較（{args.rows:,} 行）")
+    print("=" * 60)
+
+    legacy_seconds, legacy = timed(legacy_standardize, df)
+    vectorized_seconds, vectorized = timed(standardize_shopify, df)
+    same = '✅ 結果相同' if legacy.equals(vectorized) else '❌ 結果不同'
+
+    print(f"\n   standardize_shopify（{same}）")
+    print(f"   舊 df.apply：{legacy_seconds:8.2f} 秒（{args.rows / legacy_seconds:12,.0f} 行/秒）")
+    print(f"   向量化    ：{vectorized_seconds:8.2f} 秒（{args.rows / vectorized_seconds:12,.0f} 行/秒）")
+    print(f"   加速      ：{legacy_seconds / vectorized_seconds:8.1f}x")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：分攤效能比較（舊 df.loc 迴圈 vs 向量化）
+# 用法：python benchmarks/bench_allocation.py --sizes 10000 100000 1000000
+# 說明：
+#   1. 產生假的 Shopify 明細（多商品訂單，Total 只在第一行）
+#   2. 分別計時舊迴圈與 allocate_order_amounts
+#   3. 舊迴圈太慢，超過 --loop-max-rows 的規模會跳過
+# ============================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from ecommerce_analytics import allocate_order_amounts, verify_allocation
+
+
+def make_orders(n_rows, seed=0):
+    """產生 n_rows 行的假訂單明細，每筆訂單 1~5 個商品"""
+    rng = np.random.default_rng(seed)
+    items_per_order = rng.integers(1, 6, size=n_rows)
+    order_ids = np.repeat(np.arange(n_rows), items_per_order)[:n_rows]
+
+    df = pd.DataFrame({
+        'Order No': '#' + pd.Series(order_ids + 1000).astype(str),
+        'Selling Price': rng.integers(50, 5000, size=n_rows) / 10,
+        'Quantity': rng.integers(1, 4, size=n_rows),
+    })
+    goods = df['Selling Price'] * df['Quantity']
+    goods_total = goods.groupby(df['Order No']).transform('sum')
+    discount = (goods_total * rng.choice([0, 0, 0.1, 0.15], size=n_rows)).round(2)
+
+    first_row = ~df['Order No'].duplicated()
+    df['Total'] = np.where(first_row, (goods_total - discount).round(2), 0.0)
+    df['Discount Amount'] = np.where(first_row, discount, 0.0)
+    return df
+
+
+def legacy_allocate(df):
+    """01_shopify_data_cleaning.py 原本的逐行分攤迴圈（只用於比較）"""
+    df = df.copy()
+    df['商品金額'] = df['Selling Price'] * df['Quantity']
+    df['分攤後金額'] = 0.0
+    df['分攤後折扣'] = 0.0
+
+    for order_no, group in df.groupby('Order No'):
+        total_rows = group[group['Total'] > 0]
+        if len(total_rows) == 0:
+            continue
+        order_total = total_rows['Total'].iloc[0]
+
+        discount_rows = group[group['Discount Amount'] > 0]
+        order_discount = discount_rows['Discount Amount'].iloc[0] if len(discount_rows) > 0 else 0
+
+        group_total_goods = group['商品金額'].sum()
+        if group_total_goods > 0:
+            for idx in group.index:
+                ratio = group.loc[idx, '商品金額'] / group_total_goods
+                df.loc[idx, '分攤後金額'] = round(order_total * ratio, 2)
+                df.loc[idx, '分攤後折扣'] = round(order_discount * ratio, 2)
+    return df
+
+
+def legacy_verify(df):
+    """01_shopify_data_cleaning.py 原本的逐筆驗證迴圈（只用於比較）"""
+    verification = []
+    for order_no, group in df.groupby('Order No'):
+        original_total = group[group['Total'] > 0]['Total'].iloc[0] if any(group['Total'] > 0) else 0
+        original_discount = group[group['Discount Amount'] > 0]['Discount Amount'].iloc[0] if any(group['Discount Amount'] > 0) else 0
+        allocated_total = group['分攤後金額'].sum()
+        allocated_discount = group['分攤後折扣'].sum()
+        total_diff = abs(original_total - allocated_total)
+        discount_diff = abs(original_discount - allocated_discount)
+        is_correct = total_diff < 0.1 and discount_diff < 0.1
+        verification.append({
+            '訂單編號': order_no,
+            '原始Total': original_total,
+            '分攤後Total總和': allocated_total,
+            'Total差異': total_diff,
+            '原始Discount': original_discount,
+            '分攤後Discount總和': allocated_discount,
+            'Discount差異': discount_diff,
+            '正確': '✅' if is_correct else '❌'
+        })
+    return pd.DataFrame(verification)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分攤效能比較')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--loop-max-rows', type=int, default=100_000,
+                        help='超過這個行數就不跑舊迴圈')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("⏱️ 分攤效能比較")
+    print("=" * 60)
+    print(f"\n{'行數':>10} {'訂單數':>10} {'舊迴圈(秒)':>12} {'向量化(秒)':>12} {'加速':>8} {'分位誤差':>8}"
+          f" {'舊驗證(秒)':>12} {'新驗證(秒)':>12}")
+
+    for n_rows in args.sizes:
+        df = make_orders(n_rows)
+        n_orders = df['Order No'].nunique()
+
+        (vectorized, _), vec_seconds = timed(allocate_order_amounts, df)
+
+        # 每筆訂單分攤後的分位加總 - 原始 Total 的分位（應該全部為 0）
+        allocated = np.rint(vectorized.groupby('Order No')['分攤後金額'].sum() * 100)
+        original = np.rint(vectorized.groupby('Order No')['Total'].max() * 100)
+        cent_errors = int((allocated != original).sum())
+
+        verification, verify_seconds = timed(verify_allocation, vectorized)
+
+        if n_rows <= args.loop_max_rows:
+            _, loop_seconds = timed(legacy_allocate, df)
+            loop_text = f"{loop_seconds:12.2f}"
+            speedup_text = f"{loop_seconds / vec_seconds:7.0f}x"
+
+            legacy_verification, legacy_verify_seconds = timed(legacy_verify, vectorized)
+            pd.testing.assert_frame_equal(verification, legacy_verification, check_dtype=False)
+            verify_text = f"{legacy_verify_seconds:12.2f}"
+        else:
+            loop_text = f"{'(略過)':>10}"
+            speedup_text = f"{'-':>8}"
+            verify_text = f"{'(略過)':>10}"
+
+        print(f"{n_rows:>10,} {n_orders:>10,} {loop_text} {vec_seconds:12.3f} {speedup_text} {cent_errors:>8}"
+              f" {verify_text} {verify_seconds:12.3f}")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：電話合併效能比較（舊 df.apply vs 向量化）
+# 用法：python benchmarks/bench_phone_merge.py --rows 1000000
+# 說明：
+#   1. 產生 Billing Phone / Phone 兩欄（空值、數字、'開頭、+886、空白混在一起）
+#   2. 分別計時舊的 astype(str) + df.apply 和 merge_phone_columns
+#   3. 顯示每秒處理行數
+# ============================================
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from ecommerce_analytics.cleaning import merge_phone_columns
+
+
+def make_phones(n_rows, seed=0):
+    """產生各種格式的電話"""
+    rng = np.random.default_rng(seed)
+    digits = pd.Series(rng.integers(10_000_000, 99_999_999, size=n_rows)).astype(str)
+    formats = np.array([
+        "09" + digits,
+        "'09" + digits,
+        "+886 9" + digits.str[:2] + "-" + digits.str[2:],
+        " 09" + digits + " ",
+    ])
+    picked = formats[rng.integers(0, len(formats), size=n_rows), np.arange(n_rows)]
+
+    billing = pd.Series(picked, dtype=object)
+    billing[rng.random(n_rows) < 0.3] = np.nan
+    phone = pd.Series(picked[::-1], dtype=object)
+    phone[rng.random(n_rows) < 0.5] = np.nan
+    return pd.DataFrame({'Billing Phone': billing, 'Phone': phone})
+
+
+def legacy_merge(df):
+    """01_shopify_data_cleaning.py 原本的電話合併（只用於比較）"""
+    df = df.copy()
+    df['Billing Phone'] = df['Billing Phone'].fillna('').astype(str).replace('nan', '').replace('None', '')
+    df['Phone'] = df['Phone'].fillna('').astype(str).replace('nan', '').replace('None', '')
+    df['Phone'] = df.apply(
+        lambda row: row['Billing Phone'] if row['Billing Phone'] and row['Billing Phone'].strip()
+        else (row['Phone'] if row['Phone'] and row['Phone'].strip() else ''),
+        axis=1
+    )
+    return df.drop(columns=['Billing Phone'])
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    func(df.copy())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='電話合併效能比較')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = make_phones(args.rows)
+
+    print("=" * 60)
+    print(f"⏱️ 電話合併效能比較（{args.rows:,} 行）")
+    print("=" * 60)
+
+    legacy_seconds = timed(legacy_merge, df)
+    vectorized_seconds = timed(merge_phone_columns, df)
+
+    print(f"\n   舊 df.apply：{legacy_seconds:8.2f} 秒（{args.rows / legacy_seconds:12,.0f} 行/秒）")
+    print(f"   向量化    ：{vectorized_seconds:8.2f} 秒（{args.rows / vectorized_seconds:12,.0f} 行/秒）")
+    print(f"   加速      ：{legacy_seconds / vectorized_seconds:8.1f}x")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
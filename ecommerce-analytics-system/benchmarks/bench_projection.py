@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：Shopify 後台匯出只讀需要欄位的效能比較
+# 用法：python benchmarks/bench_projection.py --rows 50000
+# 說明：
+#   1. 產生完整的 Shopify 後台匯出（約 70 欄），存成 xlsx 和 CSV
+#   2. 每種讀法在獨立的 process 中執行，記錄讀檔時間、最高記憶體（peak RSS）、
+#      DataFrame 大小
+#   3. 比較：全部欄位 vs 只讀 shopify_columns()（columns.py）
+# ============================================
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'scripts'))
+
+from ecommerce_analytics.columns import shopify_columns, shopify_read_options
+from ecommerce_analytics.timing import peak_rss_mb
+from synthetic import make_full_shopify_export
+
+READERS = {
+    'xlsx 全部欄位': lambda path: pd.read_excel(path),
+    'xlsx 只讀需要的欄位': lambda path: pd.read_excel(path, **shopify_read_options('xlsx')),
+    'CSV 全部欄位': lambda path: pd.read_csv(path, dtype=str, encoding='utf-8-sig'),
+    'CSV 只讀需要的欄位': lambda path: pd.read_csv(path, encoding='utf-8-sig', **shopify_read_options('csv')),
+}
+
+
+def write_exports(n_rows, paths):
+    """在子 process 中執行：產生完整匯出並存成 xlsx / CSV，回傳欄數"""
+    export = make_full_shopify_export(n_rows)
+    export.to_excel(paths['xlsx'], index=False)
+    export.to_csv(paths['CSV'], index=False, encoding='utf-8-sig')
+    return len(export.columns)
+
+
+def run_reader(name, path):
+    """在子 process 中執行：讀檔，回傳 (秒數, 讀檔前 RSS, 最高 RSS, 欄數, DataFrame MB)"""
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    df = READERS[name](path)
+    seconds = time.perf_counter() - start
+    frame_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    return seconds, before, peak_rss_mb(), len(df.columns), frame_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Shopify 後台匯出只讀需要欄位的效能比較')
+    parser.add_argument('--rows', type=int, default=50_000, help='Shopify 明細行數')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"⏱️ 只讀需要的欄位（Shopify {args.rows:,} 行，需要 {len(shopify_columns())} 欄）")
+    print("=" * 60)
+
+    # 產生資料和每種讀法都用新的 process（spawn）；Linux 的 peak RSS 會從父 process 繼承，
+    # 主程式本身不產生資料，各讀法的 peak RSS 才不會互相影響
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = {'xlsx': os.path.join(tmp_dir, 'Shopify-Orders.xlsx'), 'CSV': os.path.join(tmp_dir, 'orders_export.csv')}
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            print(f"\n   完整匯出：{pool.submit(write_exports, args.rows, paths).result()} 欄")
+
+        for name in READERS:
+            path = paths[name.split()[0]]
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                seconds, before, peak, n_cols, frame_mb = pool.submit(run_reader, name, path).result()
+            print(f"\n   {name}（{n_cols} 欄）")
+            print(f"      讀檔時間：{seconds:8.2f} 秒")
+            print(f"      peak RSS：{peak:8.0f} MB（讀檔增加 {peak - before:,.0f} MB）")
+            print(f"      DataFrame：{frame_mb:8.1f} MB")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：xlsx 讀取引擎效能比較（readers.py）
+# 用法：python benchmarks/bench_readers.py --scale 2000
+# 說明：
+#   1. sample_data 的 xlsx 每個工作表重複 --scale 次，存成放大版的檔案
+#   2. 每個已安裝的引擎在獨立的 process 中讀完整個檔案（全部工作表），
+#      記錄讀檔時間和最高記憶體（peak RSS）
+#   3. 每個引擎的結果（值、dtype）都要和 openpyxl 相同，不同時標示 ❌
+# ============================================
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'scripts'))
+
+from ecommerce_analytics.readers import available_engines, read_excel
+from ecommerce_analytics.timing import peak_rss_mb
+
+SAMPLE_DIR = os.path.join(BENCH_DIR, '..', 'sample_data')
+SAMPLE_FILES = ['sample_shopify.xlsx', 'sample_pinkoi.xlsx', 'sample_monthly_report.xlsx']
+
+
+def write_scaled(sample_path, output_path, scale):
+    """在子 process 中執行：每個工作表重複 scale 次後存檔，回傳 {工作表: 行數}"""
+    sheets = pd.read_excel(sample_path, sheet_name=None)
+    scaled = {name: pd.concat([df] * scale, ignore_index=True) for name, df in sheets.items()}
+    with pd.ExcelWriter(output_path) as writer:
+        for name, df in scaled.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+    return {name: len(df) for name, df in scaled.items()}
+
+
+def frame_signature(df):
+    """(欄位, dtype, 內容 hash)：比較不同引擎的結果是否相同"""
+    return list(df.columns), [str(dtype) for dtype in df.dtypes], int(pd.util.hash_pandas_object(df, index=False).sum())
+
+
+def run_engine(engine, path):
+    """在子 process 中執行：讀全部工作表，回傳 (秒數, 讀檔前 RSS, 最高 RSS, {工作表: signature})"""
+    before = peak_rss_mb()
+    start = time.perf_counter()
+    sheets = read_excel(path, sheet_name=None, engine=engine)
+    seconds = time.perf_counter() - start
+    return seconds, before, peak_rss_mb(), {name: frame_signature(df) for name, df in sheets.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='xlsx 讀取引擎效能比較')
+    parser.add_argument('--scale', type=int, default=2000, help='sample_data 每個工作表重複幾次')
+    args = parser.parse_args()
+
+    engines = available_engines()
+    # openpyxl 排第一個，作為比對結果的基準
+    engines = ['openpyxl'] + [engine for engine in engines if engine != 'openpyxl']
+
+    print("=" * 60)
+    print(f"⏱️ xlsx 讀取引擎效能比較（sample_data × {args.scale:,}）")
+    print(f"   已安裝的引擎：{' / '.join(available_engines())}")
+    print("=" * 60)
+
+    # 每次都用新的 process（spawn）：Linux 的 peak RSS 會從父 process 繼承
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for file_name in SAMPLE_FILES:
+            path = os.path.join(tmp_dir, file_name)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                rows = pool.submit(write_scaled, os.path.join(SAMPLE_DIR, file_name), path, args.scale).result()
+            sheets = '、'.join(f"{name} {n:,} 行" for name, n in rows.items())
+            print(f"\n📄 {file_name}（{sheets}，{os.path.getsize(path) / 1024 / 1024:.1f} MB）")
+
+            baseline = None
+            for engine in engines:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    seconds, before, peak, signature = pool.submit(run_engine, engine, path).result()
+                baseline = baseline or (seconds, signature)
+                same = '✅ 和 openpyxl 相同' if signature == baseline[1] else '❌ 和 openpyxl 不同'
+                print(f"   {engine:<10}{seconds:8.2f} 秒（{baseline[0] / seconds:4.1f}x）"
+                      f"  peak RSS +{peak - before:,.0f} MB  {same}")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：月度財務報表寫檔效能比較（舊 openpyxl to_excel vs 新寫檔方式）
+# 用法：python benchmarks/bench_report_write.py --rows 200000
+# 說明：
+#   1. 產生 Shopify / Pinkoi 統一欄位的明細，組成月度財務報表的工作表
+#   2. 每種寫法在獨立的 process 中執行，分別記錄寫檔時間和最高記憶體（peak RSS）
+#   3. 比較：舊寫法、新 openpyxl（數字格式）、xlsxwriter constant_memory
+# ============================================
+
+import argparse
+import importlib.util
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+from ecommerce_analytics.report import FINAL_COLS, build_monthly_report, write_monthly_report
+
+
+def peak_rss_mb():
+    """這個 process 到目前為止的最高記憶體用量（MB）"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        import psutil
+        return psutil.Process().memory_info().peak_wset / 1024 / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def make_channel(channel, n_rows, rng):
+    """一個渠道的統一欄位明細（每筆訂單 1-4 行）"""
+    order_ids = np.cumsum(rng.random(n_rows) < 0.4)
+    quantity = rng.integers(1, 5, size=n_rows)
+    price = rng.integers(50, 2000, size=n_rows) / 10
+    discount = np.where(rng.random(n_rows) < 0.2, rng.integers(10, 100, size=n_rows), 0).astype(float)
+    cost = (price * rng.uniform(0.3, 0.7, size=n_rows)).round(2)
+    amount = quantity * price
+
+    frame = pd.DataFrame({
+        '渠道': channel,
+        '訂單編號': pd.Series(order_ids).map(lambda i: f"{channel[:4].upper()}-{i}"),
+        '訂單日期': pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, 31 * 86400, size=n_rows), unit='s'),
+        '客戶名稱': pd.Series(rng.integers(0, n_rows // 5 + 1, size=n_rows)).map(lambda i: f"客戶{i}"),
+        '商品名稱': pd.Series(rng.integers(0, 300, size=n_rows)).map(lambda i: f"商品{i}"),
+        '數量': quantity,
+        '單價': price,
+        '商品原始金額': amount,
+        '折扣': discount,
+        '分攤後金額': amount - discount,
+        '分攤後折扣': discount,
+        '實際金額': amount - discount,
+        '總金額': amount - discount,
+        '成本': cost,
+        '總成本': cost * quantity,
+        '單件利潤': price - cost,
+        '總利潤': amount - discount - cost * quantity,
+        '利潤率': ((price - cost) / price).round(3),
+    })
+    return frame[FINAL_COLS]
+
+
+def make_sheets(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    shopify_std = make_channel('Shopify', n_rows, rng)
+    pinkoi_std = make_channel('Pinkoi', max(n_rows // 4, 1), rng)
+    sheets, _ = build_monthly_report(shopify_std, pinkoi_std)
+    return sheets
+
+
+def legacy_write(sheets, output_path):
+    """02_monthly_report.py 原本的寫法（只用於比較）"""
+    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+        for sheet_name, sheet in sheets.items():
+            sheet.to_excel(writer, sheet_name=sheet_name, index=(sheet_name == '渠道對比'))
+
+
+WRITERS = {
+    '舊 openpyxl to_excel': legacy_write,
+    '新 openpyxl（數字格式）': lambda sheets, path: write_monthly_report(sheets, path, engine='openpyxl'),
+    'xlsxwriter constant_memory': lambda sheets, path: write_monthly_report(sheets, path, engine='xlsxwriter'),
+}
+
+
+def run_writer(name, n_rows):
+    """在子 process 中執行：產生資料 → 寫檔，回傳 (秒數, 寫檔前 RSS, 最高 RSS, 檔案大小)"""
+    sheets = make_sheets(n_rows)
+    before = peak_rss_mb()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_path = os.path.join(tmp_dir, 'report.xlsx')
+        start = time.perf_counter()
+        WRITERS[name](sheets, output_path)
+        seconds = time.perf_counter() - start
+        size_mb = os.path.getsize(output_path) / 1024 / 1024
+    return seconds, before, peak_rss_mb(), size_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description='月度財務報表寫檔效能比較')
+    parser.add_argument('--rows', type=int, default=200_000, help='Shopify 明細行數（Pinkoi 為 1/4）')
+    args = parser.parse_args()
+
+    if importlib.util.find_spec('xlsxwriter') is None:
+        print("⚠️ 沒有安裝 xlsxwriter，略過 xlsxwriter 的比較")
+        WRITERS.pop('xlsxwriter constant_memory')
+
+    print("=" * 60)
+    print(f"⏱️ 月度財務報表寫檔效能比較（Shopify {args.rows:,} 行 + Pinkoi {args.rows // 4:,} 行）")
+    print("=" * 60)
+
+    for name in WRITERS:
+        # 每種寫法用新的 process，peak RSS 才不會互相影響
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            seconds, before, peak, size_mb = pool.submit(run_writer, name, args.rows).result()
+        print(f"\n   {name}")
+        print(f"      寫檔時間：{seconds:8.2f} 秒")
+        print(f"      peak RSS：{peak:8.0f} MB（寫檔增加 {peak - before:,.0f} MB）")
+        print(f"      檔案大小：{size_mb:8.1f} MB")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
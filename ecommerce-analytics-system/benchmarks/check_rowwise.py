@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：檢查逐行處理（df.apply(axis=1) / iterrows）
+# 用法：python benchmarks/check_rowwise.py（tests/test_no_rowwise.py 也會執行同樣的檢查）
+# 說明：
+#   1. 掃描 scripts/ecommerce_analytics/ 的 .py（資料處理的主要路徑；只看程式碼，不看註解和字串）
+#   2. 找到 .apply(..., axis=1)（包括 .apply(f, 1) 這種位置參數）、.apply(..., axis='columns')
+#      或 .iterrows() 時列出位置，結束碼為 1；改用逐欄運算（例如 money.prefer_positive、Series.where）
+# ============================================
+
+import ast
+import glob
+import os
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+ROW_AXES = (1, 'columns')
+
+
+def _constant(node, position, name):
+    """呼叫的第 position 個位置參數或 name= 參數，是常數時回傳它的值"""
+    value = node.args[position] if len(node.args) > position else None
+    value = next((keyword.value for keyword in node.keywords if keyword.arg == name), value)
+    return value.value if isinstance(value, ast.Constant) else None
+
+
+def rowwise_calls(source, filename):
+    """原始碼 → [(行號, 說明)]"""
+    found = []
+    for node in ast.walk(ast.parse(source, filename=filename)):
+        if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+            continue
+        if node.func.attr == 'iterrows':
+            found.append((node.lineno, '.iterrows()'))
+        elif node.func.attr == 'apply':
+            # DataFrame.apply(func, axis=0, ...)：axis 是第二個位置參數
+            axis = _constant(node, 1, 'axis')
+            if axis in ROW_AXES:
+                found.append((node.lineno, f".apply(..., axis={axis!r})"))
+    return found
+
+
+def module_paths():
+    """要檢查的 .py：scripts/ecommerce_analytics/ 的模組"""
+    return sorted(glob.glob(os.path.join(SCRIPTS_DIR, 'ecommerce_analytics', '*.py')))
+
+
+def main():
+    paths = module_paths()
+    problems = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        for lineno, call in rowwise_calls(source, path):
+            problems.append(f"   {os.path.relpath(path, SCRIPTS_DIR)}:{lineno}  {call}")
+
+    if problems:
+        print(f"❌ 找到 {len(problems)} 個逐行處理：")
+        print('\n'.join(problems))
+        sys.exit(1)
+    print(f"✅ {len(paths)} 個檔案都沒有逐行處理")
+
+
+if __name__ == '__main__':
+    main()
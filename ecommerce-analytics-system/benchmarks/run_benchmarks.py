@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：各階段效能測試（假資料）
+# 用法：python benchmarks/run_benchmarks.py --rows 10000 100000 --with-io
+# 說明：
+#   1. 用 synthetic.py 產生指定大小的 Shopify / Pinkoi / 成本表
+#   2. 依序執行三個程式的每個階段，記錄秒數、每秒行數、最高記憶體
+#   3. 結果加到 benchmarks/results.csv（每次執行一批，方便比較前後版本）
+# ============================================
+
+import argparse
+import csv
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'scripts'))
+
+import pandas as pd
+
+from ecommerce_analytics.allocation import allocate_order_amounts, arrange_allocation_columns, verify_allocation
+from ecommerce_analytics.channels import standardize_pinkoi, standardize_shopify
+from ecommerce_analytics.cleaning import clean_shopify_orders
+from ecommerce_analytics.costs import add_profit_columns, join_product_costs
+from ecommerce_analytics.pinkoi import pinkoi_statistics, pinkoi_stats_table
+from ecommerce_analytics.report import (
+    build_monthly_report,
+    check_pinkoi_amounts,
+    write_monthly_report,
+)
+from synthetic import make_cost_table, make_pinkoi_orders, make_shopify_export
+
+DEFAULT_RESULTS = os.path.join(BENCH_DIR, 'results.csv')
+RESULT_FIELDS = ['執行時間', '版本', '資料行數', '階段', '輸入行數', '秒數', '每秒行數', '最高記憶體(MB)']
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def measure(func, track_memory):
+    """執行一次 func，回傳 (結果, 秒數, 最高記憶體 MB)
+
+    最高記憶體用 tracemalloc（numpy / pandas 的配置也會算進去），
+    只在 track_memory 時開啟，因為 tracemalloc 本身會拖慢執行
+    """
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+        seconds = time.perf_counter() - start
+        peak_mb = tracemalloc.get_traced_memory()[1] / 1024 / 1024 if track_memory else None
+    finally:
+        if track_memory:
+            tracemalloc.stop()
+    return result, seconds, peak_mb
+
+
+def pipeline_stages(n_rows, pinkoi_rows, n_products, with_io, tmp_dir):
+    """(階段名稱, 輸入行數, 函式)，每個函式用前一個階段的結果"""
+    state = {}
+
+    def generate():
+        state['cost'] = make_cost_table(n_products)
+        state['raw'] = make_shopify_export(n_rows, state['cost'])
+        state['pinkoi'] = make_pinkoi_orders(pinkoi_rows)
+
+    def read_export():
+        path = os.path.join(tmp_dir, 'Shopify-Orders.xlsx')
+        state['raw'].to_excel(path, index=False)
+        state['raw'] = pd.read_excel(path)
+
+    def clean():
+        state['df'] = clean_shopify_orders(state['raw'])
+
+    def costs():
+        orders, _ = join_product_costs(state['df'], state['cost'])
+        state['df'] = add_profit_columns(orders)
+
+    def allocate():
+        df, _ = allocate_order_amounts(state['df'])
+        state['df'] = arrange_allocation_columns(df)
+
+    def verify():
+        verify_allocation(state['df'])
+
+    def standardize():
+        state['shopify_std'] = standardize_shopify(state['df'])
+        state['pinkoi_std'] = standardize_pinkoi(state['pinkoi'])
+
+    def pinkoi_check():
+        check_pinkoi_amounts(state['pinkoi_std'])
+
+    def monthly_report():
+        state['sheets'], _ = build_monthly_report(state['shopify_std'], state['pinkoi_std'])
+
+    def pinkoi_stats():
+        pinkoi_stats_table(pinkoi_statistics(state['pinkoi']))
+
+    def write_report():
+        write_monthly_report(state['sheets'], os.path.join(tmp_dir, 'report.xlsx'))
+
+    total_rows = n_rows + pinkoi_rows
+    stages = [('產生假資料', total_rows, generate)]
+    if with_io:
+        stages.append(('讀取 Shopify xlsx', n_rows, read_export))
+    stages += [
+        ('01 整理（改名、電話）', n_rows, clean),
+        ('01 成本（SKU、利潤）', n_rows, costs),
+        ('01 分攤', n_rows, allocate),
+        ('01 分攤驗證', n_rows, verify),
+        ('02 標準化欄位', total_rows, standardize),
+        ('02 Pinkoi 金額驗證', pinkoi_rows, pinkoi_check),
+        ('02 月度統計', total_rows, monthly_report),
+        ('03 Pinkoi 統計', pinkoi_rows, pinkoi_stats),
+    ]
+    if with_io:
+        stages.append(('02 寫出月度財務報表', total_rows, write_report))
+    return stages
+
+
+def run_size(n_rows, args):
+    pinkoi_rows = max(int(n_rows * args.pinkoi_ratio), 1)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for stage, stage_rows, func in pipeline_stages(n_rows, pinkoi_rows, args.products, args.with_io, tmp_dir):
+            _, seconds, peak_mb = measure(func, args.memory)
+            results.append({
+                '資料行數': n_rows,
+                '階段': stage,
+                '輸入行數': stage_rows,
+                '秒數': round(seconds, 4),
+                '每秒行數': round(stage_rows / seconds) if seconds > 0 else None,
+                '最高記憶體(MB)': round(peak_mb, 1) if peak_mb is not None else None,
+            })
+    return results
+
+
+def append_results(results, path):
+    """結果加到 CSV 最後（檔案不存在時先寫標題）"""
+    new_file = not os.path.exists(path)
+    with open(path, 'a', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if new_file:
+            writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='各階段效能測試（假資料）')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000], help='Shopify 明細行數')
+    parser.add_argument('--pinkoi-ratio', type=float, default=0.25, help='Pinkoi 行數 = Shopify 行數 × 比例')
+    parser.add_argument('--products', type=int, default=500, help='成本表產品數')
+    parser.add_argument('--with-io', action='store_true', help='包含讀取 Shopify xlsx 和寫出月度財務報表（很慢）')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='不記錄記憶體（計時較準）')
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help='結果 CSV 路徑')
+    args = parser.parse_args()
+
+    run_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    revision = git_revision()
+
+    print("=" * 60)
+    print(f"⏱️ 各階段效能測試（版本 {revision or '未知'}）")
+    print("=" * 60)
+
+    all_results = []
+    for n_rows in args.rows:
+        print(f"\n📦 Shopify {n_rows:,} 行 + Pinkoi {max(int(n_rows * args.pinkoi_ratio), 1):,} 行")
+        print(f"   {'階段':<20} {'秒數':>10} {'每秒行數':>14} {'記憶體(MB)':>12}")
+        for result in run_size(n_rows, args):
+            memory_text = f"{result['最高記憶體(MB)']:12.1f}" if result['最高記憶體(MB)'] is not None else f"{'-':>12}"
+            print(f"   {result['階段']:<20} {result['秒數']:10.3f} {result['每秒行數'] or 0:14,} {memory_text}")
+            all_results.append({'執行時間': run_at, '版本': revision, **result})
+
+    append_results(all_results, args.results)
+    print(f"\n✅ 結果已加到：{args.results}")
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+# ============================================
+# 模組名稱：效能測試用的假資料
+# 功能：
+#   1. 成本表（Cost_with_ID_最終版.xlsx 格式）
+#   2. Shopify 後台匯出：一筆訂單多行商品，Total / Discount / 買家資料只在第一行
+#   3. Pinkoi 後台匯出：訂單明細，小部分金額和 數量 × 單價 - 折抵 不一致
+#   4. 完整的 Shopify 後台匯出：再加上流程沒用到的幾十個欄位（地址、付款、出貨…）
+# 說明：欄位名稱和 sample_data 相同，大小由參數決定，同一個 seed 產生相同資料
+# ============================================
+
+import numpy as np
+import pandas as pd
+
+SHOPIFY_COLS = [
+    'Name', 'Email', 'Paid at', 'Accepts Marketing', 'Total', 'Discount Code', 'Discount Amount',
+    'Created at', 'Lineitem quantity', 'Lineitem name', 'Lineitem price', 'Lineitem sku',
+    'Billing Name', 'Billing Phone', 'Id', 'Source', 'Phone'
+]
+
+# Shopify 後台訂單匯出的其他欄位（整理流程不會用到）
+EXTRA_SHOPIFY_COLS = [
+    'Financial Status', 'Fulfillment Status', 'Fulfilled at', 'Currency', 'Subtotal', 'Shipping', 'Taxes',
+    'Shipping Method', 'Lineitem compare at price', 'Lineitem requires shipping', 'Lineitem taxable',
+    'Lineitem fulfillment status', 'Billing Street', 'Billing Address1', 'Billing Address2', 'Billing Company',
+    'Billing City', 'Billing Zip', 'Billing Province', 'Billing Country', 'Shipping Name', 'Shipping Street',
+    'Shipping Address1', 'Shipping Address2', 'Shipping Company', 'Shipping City', 'Shipping Zip',
+    'Shipping Province', 'Shipping Country', 'Shipping Phone', 'Notes', 'Note Attributes', 'Cancelled at',
+    'Payment Method', 'Payment Reference', 'Refunded Amount', 'Vendor', 'Outstanding Balance', 'Employee',
+    'Location', 'Device ID', 'Tags', 'Risk Level', 'Lineitem discount', 'Tax 1 Name', 'Tax 1 Value',
+    'Receipt Number', 'Duties', 'Billing Province Name', 'Shipping Province Name', 'Payment ID',
+    'Payment Terms Name', 'Next Payment Due At', 'Payment References',
+]
+
+PRODUCT_BASES = ['凍頂烏龍茶', '散水小禮', '薰衣草香氛', '手工皂', '茶包禮盒', '蛋捲', '鳳梨酥', '香氛蠟燭']
+VARIANTS = ['', '小', '大', '禮盒裝', '經典款', '限定版']
+SURNAMES = list('陳林黃張李王吳劉蔡楊許鄭謝郭洪')
+GIVEN_NAMES = ['怡婷', '雅惠', '宜臻', '志明', '家豪', '淑芬', '俊傑', '美玲', '建宏', '佳穎']
+
+
+def _names(rng, n):
+    return pd.Series(rng.choice(SURNAMES, n)) + pd.Series(rng.choice(GIVEN_NAMES, n))
+
+
+def _phones(rng, n):
+    """各種電話格式混在一起（09 開頭、'09、+886、前後空白）"""
+    digits = pd.Series(rng.integers(10_000_000, 99_999_999, size=n)).astype(str)
+    formats = np.array([
+        "09" + digits,
+        "'09" + digits,
+        "+886 9" + digits.str[:2] + "-" + digits.str[2:],
+        " 09" + digits + " ",
+    ])
+    return formats[rng.integers(0, len(formats), size=n), np.arange(n)]
+
+
+def make_cost_table(n_products=500, seed=0):
+    """成本表：Product_Name / Variant SKU / Cost"""
+    rng = np.random.default_rng(seed)
+    bases = rng.choice(PRODUCT_BASES, n_products)
+    variants = rng.choice(VARIANTS, n_products)
+    names = [
+        f"{base}{i}" + (f" - {variant}" if variant else '')
+        for i, (base, variant) in enumerate(zip(bases, variants))
+    ]
+    return pd.DataFrame({
+        'Product_Name': names,
+        'Variant SKU': [f"SKU-{i:05d}" for i in range(n_products)],
+        'Cost': rng.integers(20, 800, size=n_products) / 10,
+    })
+
+
+def make_shopify_export(n_rows, cost_table=None, month='2026-01', seed=0, unknown_rate=0.03):
+    """Shopify 後台匯出（訂單層級欄位只在每筆訂單的第一行）"""
+    rng = np.random.default_rng(seed)
+    cost_table = cost_table if cost_table is not None else make_cost_table(seed=seed)
+
+    items_per_order = rng.integers(1, 6, size=n_rows)
+    order_ids = np.repeat(np.arange(n_rows), items_per_order)[:n_rows]
+    first_row = np.r_[True, order_ids[1:] != order_ids[:-1]]
+
+    product = rng.integers(0, len(cost_table), size=n_rows)
+    names = cost_table['Product_Name'].to_numpy()[product].astype(object)
+    skus = cost_table['Variant SKU'].to_numpy()[product].astype(object)
+    unknown = rng.random(n_rows) < unknown_rate
+    names[unknown] = [f"新商品{i}" for i in rng.integers(0, 1000, size=int(unknown.sum()))]
+    skus[unknown] = np.nan
+
+    price = (cost_table['Cost'].to_numpy()[product] * rng.uniform(1.3, 2.5, size=n_rows)).round(1)
+    quantity = rng.integers(1, 5, size=n_rows)
+    goods_total = pd.Series(price * quantity).groupby(order_ids).transform('sum').to_numpy()
+    discount = (goods_total * rng.choice([0, 0, 0, 0.1, 0.15], size=n_rows)).round(2)
+
+    seconds = rng.integers(0, 28 * 86400, size=n_rows)
+    created = pd.Timestamp(f"{month}-01") + pd.to_timedelta(seconds, unit='s')
+    created_text = created.strftime('%Y-%m-%d %H:%M:%S') + ' +0800'
+
+    order_level = pd.DataFrame({
+        'Email': [f"buyer{i}@example.com" for i in order_ids],
+        'Paid at': created_text,
+        'Accepts Marketing': rng.choice(['yes', 'no'], size=n_rows),
+        'Total': (goods_total - discount).round(2),
+        'Discount Code': np.where(discount > 0, 'NEWYEAR', None),
+        'Discount Amount': discount,
+        'Billing Name': _names(rng, n_rows),
+        'Billing Phone': _phones(rng, n_rows),
+        'Phone': _phones(rng, n_rows),
+        'Source': 'web',
+    })
+    order_level['Billing Phone'] = order_level['Billing Phone'].where(rng.random(n_rows) > 0.3)
+    order_level['Phone'] = order_level['Phone'].where(rng.random(n_rows) > 0.5)
+    order_level.loc[~first_row, :] = np.nan
+
+    # 同一筆訂單的每一行 Created at / Name / Id 都相同
+    shopify = pd.DataFrame({
+        'Name': '#' + pd.Series(order_ids + 1001).astype(str),
+        'Created at': pd.Series(created_text).groupby(order_ids).transform('first'),
+        'Lineitem quantity': quantity,
+        'Lineitem name': names,
+        'Lineitem price': price,
+        'Lineitem sku': skus,
+        'Id': 5_000_000_000 + order_ids,
+    })
+    return pd.concat([shopify, order_level], axis=1)[SHOPIFY_COLS]
+
+
+def make_full_shopify_export(n_rows, cost_table=None, month='2026-01', seed=0):
+    """完整的 Shopify 後台匯出：make_shopify_export 的欄位 + EXTRA_SHOPIFY_COLS（文字 / 金額 / 空白混合）"""
+    rng = np.random.default_rng(seed + 2)
+    export = make_shopify_export(n_rows, cost_table, month=month, seed=seed)
+    extra = {}
+    for i, col in enumerate(EXTRA_SHOPIFY_COLS):
+        kind = i % 3
+        if kind == 0:
+            extra[col] = pd.Series(rng.integers(0, 50, size=n_rows)).map(lambda v, c=col: f"{c} {v}")
+        elif kind == 1:
+            extra[col] = rng.integers(0, 100_000, size=n_rows) / 100
+        else:
+            extra[col] = pd.Series(rng.choice(['', 'yes', 'no'], size=n_rows)).replace('', np.nan)
+    return pd.concat([export, pd.DataFrame(extra)], axis=1)
+
+
+def make_pinkoi_orders(n_rows, month='2026-01', seed=0, mismatch_rate=0.01):
+    """Pinkoi 後台匯出（standardize_pinkoi 和 Pinkoi 年度統計用到的欄位）"""
+    rng = np.random.default_rng(seed + 1)
+
+    items_per_order = rng.integers(1, 4, size=n_rows)
+    order_ids = np.repeat(np.arange(n_rows), items_per_order)[:n_rows]
+    quantity = rng.integers(1, 4, size=n_rows)
+    price = rng.integers(100, 3000, size=n_rows) / 10
+    subtotal = (quantity * price).round(1)
+    discount = np.where(rng.random(n_rows) < 0.2, (subtotal * 0.1).round(1), 0.0)
+    shipping = np.where(rng.random(n_rows) < 0.4, 60.0, np.nan)
+    total = (subtotal - discount).round(1)
+    mismatched = rng.random(n_rows) < mismatch_rate
+    total[mismatched] += rng.integers(5, 100, size=int(mismatched.sum()))
+
+    days = rng.integers(0, 28, size=n_rows)
+    created = pd.Timestamp(f"{month}-01") + pd.to_timedelta(days, unit='D')
+
+    return pd.DataFrame({
+        '訂單成立日期': pd.Series(created).groupby(order_ids).transform('first'),
+        '訂單類型': '已完成',
+        '訂單編號': 'PINKOI-' + pd.Series(order_ids + 1000).astype(str),
+        '買家': _names(rng, n_rows).groupby(order_ids).transform('first'),
+        '收件人姓名': _names(rng, n_rows),
+        '運送方式': '順豐速運 (貨到付運費)',
+        '運送地區': rng.choice(['香港', '台灣', '澳門'], size=n_rows),
+        '購買品項': pd.Series(rng.choice(PRODUCT_BASES, n_rows)) + pd.Series(rng.integers(0, 50, n_rows)).astype(str),
+        '數量': quantity,
+        '商品單價': price,
+        '小計': subtotal,
+        '運費': shipping,
+        '折抵': discount,
+        '總金額': total,
+    })
@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：月度財務報表單一流程
+# 檔案路徑：C:\Users\MI\Desktop\2026-月度財務報表\01
+#   - Shopify: 202601-Shopify-Orders.xlsx
+#   - 成本表:  Cost_with_ID_最終版.xlsx
+#   - Pinkoi:  202601-Pinkoi_orders.xlsx
+# 輸出：月度財務報表_202601.xlsx
+# 功能：
+#   把 01_shopify_data_cleaning.py 的三個步驟和 02_monthly_report.py
+#   串在同一個 DataFrame 上，中間檔（整理版 / 計算版 / V2 / V3）只在
+#   SAVE_CHECKPOINTS 有列出時才另外存檔
+# ============================================
+
+import os
+
+from ecommerce_analytics.cost_store import CostStore
+from ecommerce_analytics.logs import setup_logging
+from ecommerce_analytics.pipeline import CHECKPOINT_FILES, load_month_inputs, run_monthly_pipeline
+from ecommerce_analytics.report import write_monthly_report
+from ecommerce_analytics.timing import StageTimer, report_paths
+from ecommerce_analytics.warehouse import OrderWarehouse
+
+log_level = None  # None = 環境變數 ECOMMERCE_LOG_LEVEL 或 INFO；排程執行用 'WARNING'，要看欄位清單用 'DEBUG'
+log = setup_logging(log_level)
+
+log.info("=" * 60)
+log.info("📦 開始月度財務報表單一流程...")
+log.info("=" * 60)
+
+# === 1. 設定檔案路徑 ===
+folder_path = r'C:\Users\MI\Desktop\2026-月度財務報表\01'
+month = '202601'
+output_path = os.path.join(folder_path, f'月度財務報表_{month}.xlsx')
+
+# 要另外存檔的中間檔（例如 ['計算版-V3']），空白 = 全部在記憶體中完成
+SAVE_CHECKPOINTS = []
+
+# 成本表資料庫（例如 r'C:\Users\MI\Desktop\2026-月度財務報表\成本表.sqlite'）：
+# 成本表有變動才匯入，每筆訂單用訂單日期當時的成本；None = 直接讀成本表 xlsx
+COST_DB = None
+
+# 訂單倉庫（SQLite）：這個月份的標準化明細一併寫入，方便跨月份、跨年度查詢；None = 不寫入
+WAREHOUSE_DB = None
+
+# True = 另存最慢階段的 cProfile 結果（會讓整體變慢一些）
+PROFILE_SLOWEST = False
+
+timer = StageTimer(f'04_monthly_pipeline {month}', profile=PROFILE_SLOWEST)
+
+# === 2. 讀取來源檔（每個檔只讀一次）===
+log.info(f"\n📂 正在讀取：{folder_path}")
+try:
+    with timer.stage('讀取來源檔') as record:
+        inputs = load_month_inputs(folder_path, month, cost_db=COST_DB)
+        record['rows'] = sum(len(df) for df in inputs.values())
+except FileNotFoundError as e:
+    log.error(f"❌ 錯誤：{e}")
+    exit()
+
+for name, df in inputs.items():
+    if isinstance(df, CostStore):
+        log.info(f"✅ {name}：成本表資料庫 {df.db_path}（{len(df)} 個產品）")
+    else:
+        log.info(f"✅ {name}：{len(df)} 行，{len(df.columns)} 欄")
+
+# === 3. 整理 → 成本 → 分攤 → 月度報表 ===
+log.info("\n🔄 正在處理...")
+warehouse = OrderWarehouse(WAREHOUSE_DB) if WAREHOUSE_DB else None
+sheets, totals, info = run_monthly_pipeline(
+    inputs['shopify'], inputs['cost'], inputs['pinkoi'],
+    checkpoint_dir=folder_path, checkpoints=SAVE_CHECKPOINTS, month=month, timer=timer, warehouse=warehouse
+)
+if warehouse is not None:
+    warehouse.close()
+    rows = '、'.join(f"{channel} {count:,} 行" for channel, count in info['warehouse_rows'].items())
+    log.info(f"   💾 已寫入訂單倉庫：{rows}")
+
+match_stats = info['match_stats']
+log.info(f"   - 找到成本：{match_stats['found_cost']} / {len(inputs['shopify'])} 筆")
+if len(match_stats['missing_products']) > 0:
+    log.warning(f"   ⚠️ 找不到成本的產品：{len(match_stats['missing_products'])} 個")
+if info['problem_orders']:
+    log.warning(f"   ⚠️ 分攤有問題的訂單：{len(info['problem_orders'])} 筆")
+
+if len(info['amount_mismatches']) > 0:
+    log.warning(f"   ⚠️ Pinkoi 金額不一致：{len(info['amount_mismatches'])} 筆（見「Pinkoi金額不一致」工作表）")
+
+for stage in SAVE_CHECKPOINTS:
+    log.info(f"   💾 已存中間檔：{CHECKPOINT_FILES[stage].format(month=month)}")
+
+# === 4. 儲存檔案 ===
+log.info(f"\n💾 正在儲存檔案：{output_path}")
+with timer.stage('寫出月度財務報表', rows=sum(len(sheet) for sheet in sheets.values())):
+    write_monthly_report(sheets, output_path)
+log.info(f"✅ 完成！已儲存為：{output_path}")
+
+# === 5. 顯示摘要 ===
+total_orders = totals['total_orders']
+total_actual = totals['total_actual']
+
+log.info(f"\n總訂單數：{total_orders} 筆")
+log.info(f"總營業額：${total_actual:,.2f}")
+log.info(f"總折扣：${totals['total_discount']:,.2f}")
+log.info(f"總利潤：${totals['total_profit']:,.2f}")
+
+# === 6. 各階段耗時 ===
+log.info("\n⏱️ 各階段耗時：")
+for line in timer.summary_lines():
+    log.info(f"   {line}")
+
+json_path, profile_path = report_paths(output_path)
+log.info(f"\n📝 執行紀錄：{timer.write_json(json_path)}")
+if timer.dump_slowest_profile(profile_path):
+    log.info(f"📝 最慢階段（{timer.slowest_stage()['stage']}）的 profile：{profile_path}")
+
+log.info("\n" + "=" * 60)
+log.info("🎉 完成！")
+log.info("=" * 60)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+# ============================================
+# 程式名稱：全年度月度財務報表批次產生
+# 檔案路徑：C:\Users\MI\Desktop\2026-月度財務報表\01 … 12
+# 輸出：
+#   - 各月份資料夾的 月度財務報表_2026MM.xlsx
+#   - 批次執行摘要_2026.xlsx
+# 說明：每個月份由不同的 process 同時處理，8 核心電腦跑一整年
+#       大約等於跑最慢的那一個月
+# ============================================
+
+import os
+
+from ecommerce_analytics.batch import run_batch
+from ecommerce_analytics.logs import setup_logging
+
+# === 1. 設定檔案路徑 ===
+year_folder = r'C:\Users\MI\Desktop\2026-月度財務報表'
+workers = None  # None = 使用全部 CPU 核心；1 = 依序執行
+log_level = None  # None = 環境變數 ECOMMERCE_LOG_LEVEL 或 INFO；排程執行用 'WARNING'
+# 訂單倉庫（例如 r'C:\Users\MI\Desktop\訂單倉庫.sqlite'）：各月份明細一併寫入；None = 不寫入
+warehouse_db = None
+
+
+if __name__ == '__main__':  # Windows 的 process pool 需要這個保護
+    log = setup_logging(log_level)
+
+    log.info("=" * 60)
+    log.info("📦 開始批次產生月度財務報表...")
+    log.info("=" * 60)
+
+    if not os.path.exists(year_folder):
+        log.error("❌ 錯誤：找不到資料夾")
+        log.error(f"   路徑：{year_folder}")
+        exit()
+
+    # === 2. 平行產生各月份報表 ===
+    summary = run_batch(year_folder, workers=workers, warehouse_db=warehouse_db)
+
+    # === 3. 顯示摘要 ===
+    log.info("\n📋 批次結果：")
+    for row in summary.to_dict('records'):
+        if row['狀態'] == '✅ 完成':
+            log.info(f"   {row['月份']} {row['狀態']}  {row['總訂單數']:.0f} 筆  ${row['總營業額']:,.2f}  ({row['耗時(秒)']} 秒)")
+        else:
+            log.error(f"   {row['月份']} {row['狀態']}  {row['錯誤']}")
+
+    log.info(f"\n⏱️ 總耗時：{summary.attrs['total_seconds']} 秒")
+    log.info(f"✅ 摘要已儲存：{summary.attrs['summary_path']}")
+
+    log.info("\n" + "=" * 60)
+    log.info("🎉 完成！")
+    log.info("=" * 60)
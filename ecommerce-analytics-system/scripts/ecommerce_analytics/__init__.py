@@ -0,0 +1,37 @@
+# ============================================
+# 套件名稱：ecommerce_analytics
+# 功能：Shopify / Pinkoi 訂單整理與月度報表的共用函式
+# ============================================
+
+from .allocation import allocate_order_amounts, arrange_allocation_columns, largest_remainder, verify_allocation
+from .channels import register_channel, standardize_orders, standardize_pinkoi, standardize_shopify
+from .cleaning import clean_shopify_orders
+from .costs import add_profit_columns, join_product_costs
+from .pinkoi import pinkoi_statistics, pinkoi_stats_table
+from .pipeline import run_monthly_pipeline, run_shopify_stages
+from .report import (
+    build_monthly_report,
+    check_pinkoi_amounts,
+    write_monthly_report,
+)
+
+__all__ = [
+    'add_profit_columns',
+    'allocate_order_amounts',
+    'arrange_allocation_columns',
+    'build_monthly_report',
+    'check_pinkoi_amounts',
+    'clean_shopify_orders',
+    'join_product_costs',
+    'largest_remainder',
+    'pinkoi_statistics',
+    'pinkoi_stats_table',
+    'register_channel',
+    'run_monthly_pipeline',
+    'run_shopify_stages',
+    'standardize_orders',
+    'standardize_pinkoi',
+    'standardize_shopify',
+    'verify_allocation',
+    'write_monthly_report',
+]
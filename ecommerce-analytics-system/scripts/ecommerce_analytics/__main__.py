@@ -0,0 +1,6 @@
+import sys
+
+from .cli import main
+
+if __name__ == '__main__':  # batch 的 process pool 在 Windows 會重新載入這個檔
+    sys.exit(main())
@@ -0,0 +1,179 @@
+# ============================================
+# 模組名稱：Shopify 訂單 Total 和折扣分攤
+# 功能：
+#   1. 按商品金額比例分攤 Total 到每個商品
+#   2. 按相同比例分攤 Discount Amount 到每個商品
+#   3. 以「最大餘數法」分配分位，確保每筆訂單分攤後加總 = 原始金額
+# 說明：全部以 groupby-transform 向量化計算，不再逐行 df.loc 寫入；
+#       金額都換成整數分計算，輸出欄位仍為元
+# ============================================
+
+import numpy as np
+import pandas as pd
+
+from .money import from_cents, times_cents, to_cents
+
+
+def first_positive(df, group_col, value_col):
+    """每筆訂單中第一個 > 0 的值（Shopify 只在訂單第一行填 Total / Discount）"""
+    values = pd.to_numeric(df[value_col], errors='coerce')
+    return values.where(values > 0).groupby(df[group_col], sort=False).transform('first')
+
+
+def largest_remainder(amount_cents, weights, groups):
+    """把每組的整數分位按權重分到各行，餘下的分位給小數部分最大的行
+
+    amount_cents：每行所屬訂單的總分位（同組相同）
+    weights：每行的權重（商品金額）；整數（分）時用整數除法，結果完全精確
+    groups：每行的組別代碼（0..n-1 的整數）
+    """
+    amount_cents = np.asarray(amount_cents, dtype=np.int64)
+    weights = np.asarray(weights)
+    groups = np.asarray(groups, dtype=np.int64)
+
+    n_groups = groups.max() + 1 if len(groups) else 0
+    if np.issubdtype(weights.dtype, np.integer):
+        weights = weights.astype(np.int64)
+        weight_sum = _group_sum(weights, groups, n_groups)[groups]
+        # 金額 × 權重 / 權重總和 的商和餘數；同一組的分母相同，餘數可以直接比大小
+        numerator = amount_cents * weights
+        safe_sum = np.where(weight_sum > 0, weight_sum, 1)
+        base = np.where(weight_sum > 0, numerator // safe_sum, 0)
+        remainder = np.where(weight_sum > 0, numerator % safe_sum, 0)
+    else:
+        weights = weights.astype(np.float64)
+        weight_sum = np.bincount(groups, weights=weights, minlength=n_groups)[groups]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exact = np.where(weight_sum > 0, amount_cents * weights / weight_sum, 0.0)
+        base = np.floor(exact).astype(np.int64)
+        remainder = exact - base
+
+    # 每組還差多少分位沒分出去（權重總和為 0 的組不分配）
+    shortfall = np.where(weight_sum > 0, amount_cents - _group_sum(base, groups, n_groups)[groups], 0)
+
+    # 組內按餘數由大到小排名（同餘數時保留原始順序）
+    order = np.lexsort((np.arange(len(groups)), -remainder, groups))
+    rank = np.empty(len(groups), dtype=np.int64)
+    group_start = np.searchsorted(groups[order], groups[order], side='left')
+    rank[order] = np.arange(len(groups)) - group_start
+
+    return base + (rank < shortfall)
+
+
+def _group_sum(values, groups, n_groups):
+    """整數版 bincount(weights=...)（bincount 會轉成 float64，大金額會失去精度）"""
+    sums = np.zeros(n_groups, dtype=np.int64)
+    np.add.at(sums, groups, values)
+    return sums
+
+
+def allocate_order_amounts(df, order_col='Order No', price_col='Selling Price',
+                           quantity_col='Quantity', total_col='Total',
+                           discount_col='Discount Amount'):
+    """計算 商品金額 / 分攤後金額 / 分攤後折扣
+
+    回傳 (df, problem_orders)，problem_orders 格式與原本腳本相同：
+    "訂單編號 (無 Total)" 或 "訂單編號 (商品金額為0)"
+    """
+    df = df.copy()
+
+    for col in [price_col, quantity_col, total_col, discount_col]:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    goods_cents = times_cents(df[quantity_col], to_cents(df[price_col]))
+    df['商品金額'] = from_cents(goods_cents)
+
+    # 每筆訂單的 Total、Discount（分）與商品金額總和
+    order_total = first_positive(df, order_col, total_col)
+    order_discount = first_positive(df, order_col, discount_col).fillna(0)
+    goods_total = goods_cents.groupby(df[order_col], sort=False).transform('sum')
+
+    can_allocate = order_total.notna() & (goods_total > 0)
+
+    # 沒有訂單編號的行歸到同一組（該組不會被分攤）
+    codes = pd.factorize(df[order_col])[0]
+    codes = np.where(codes < 0, len(codes), codes)
+    weights = goods_cents.where(can_allocate, 0).to_numpy()
+    total_cents = to_cents(order_total.where(can_allocate, 0)).to_numpy()
+    discount_cents = to_cents(order_discount.where(can_allocate, 0)).to_numpy()
+
+    df['分攤後金額'] = from_cents(pd.Series(largest_remainder(total_cents, weights, codes), index=df.index))
+    df['分攤後折扣'] = from_cents(pd.Series(largest_remainder(discount_cents, weights, codes), index=df.index))
+
+    # === 找出有問題的訂單（沒有訂單編號的行不算一筆訂單）===
+    order_level = pd.DataFrame({
+        'order_no': df[order_col],
+        'has_total': order_total.notna(),
+        'goods_total': goods_total,
+    })
+    order_level = order_level[order_level['order_no'].notna()].drop_duplicates('order_no')
+    order_level = order_level[~order_level['has_total'] | (order_level['goods_total'] <= 0)]
+    order_level = order_level.sort_values('order_no', kind='stable')
+
+    problem_orders = [
+        f"{order_no} (商品金額為0)" if has_total else f"{order_no} (無 Total)"
+        for order_no, has_total in zip(order_level['order_no'], order_level['has_total'])
+    ]
+
+    return df, problem_orders
+
+
+def verify_allocation(df, order_col='Order No', total_col='Total',
+                      discount_col='Discount Amount', tolerance=0, failed_only=False):
+    """每筆訂單：原始 Total / Discount 和分攤後加總的比較（分攤驗證結果）
+
+    一次 groupby 彙總（以整數分加總），欄位和原本逐筆驗證的表格相同；
+    差異不超過 tolerance 元才算正確，預設 0 = 必須完全相等；
+    failed_only=True 時只回傳「正確」為 ❌ 的訂單
+    """
+    total = to_cents(df[total_col])
+    discount = to_cents(df[discount_col])
+
+    cents = pd.DataFrame({
+        '原始Total': total.where(total > 0),
+        '分攤後Total總和': to_cents(df['分攤後金額']),
+        '原始Discount': discount.where(discount > 0),
+        '分攤後Discount總和': to_cents(df['分攤後折扣']),
+    }).groupby(df[order_col]).agg({
+        '原始Total': 'first',
+        '分攤後Total總和': 'sum',
+        '原始Discount': 'first',
+        '分攤後Discount總和': 'sum',
+    }).fillna({'原始Total': 0, '原始Discount': 0}).astype('int64')
+
+    total_diff = (cents['原始Total'] - cents['分攤後Total總和']).abs()
+    discount_diff = (cents['原始Discount'] - cents['分攤後Discount總和']).abs()
+
+    verification = from_cents(cents)
+    verification.insert(2, 'Total差異', from_cents(total_diff))
+    verification['Discount差異'] = from_cents(discount_diff)
+
+    is_correct = (total_diff <= to_cents(tolerance)) & (discount_diff <= to_cents(tolerance))
+    verification['正確'] = np.where(is_correct, '✅', '❌')
+    if failed_only:
+        verification = verification[~is_correct]
+
+    return verification.rename_axis('訂單編號').reset_index()
+
+
+def arrange_allocation_columns(df):
+    """分攤後金額放在 Total 前面、分攤後折扣放在 Discount Amount 後面、商品金額放在 Selling Price 旁邊"""
+    if 'Total' not in df.columns:
+        return df
+
+    cols = [col for col in df.columns if col not in ('分攤後金額', '分攤後折扣', '商品金額')]
+
+    total_idx = cols.index('Total')
+    new_cols = cols[:total_idx] + ['分攤後金額'] + cols[total_idx:]
+
+    if 'Discount Amount' in new_cols:
+        discount_idx = new_cols.index('Discount Amount')
+        new_cols = new_cols[:discount_idx+1] + ['分攤後折扣'] + new_cols[discount_idx+1:]
+    else:
+        new_cols.append('分攤後折扣')
+
+    if 'Selling Price' in new_cols:
+        price_idx = new_cols.index('Selling Price')
+        new_cols = new_cols[:price_idx+1] + ['商品金額'] + new_cols[price_idx+1:]
+
+    return df[new_cols]
@@ -0,0 +1,132 @@
+# ============================================
+# 模組名稱：多月份批次產生月度財務報表
+# 功能：
+#   1. 找出年度資料夾下的月份資料夾（01…12）
+#   2. 用多個 process 同時產生各月份的月度財務報表
+#   3. 彙整每個月份的結果、耗時，存成批次執行摘要
+#   4. 有指定訂單倉庫時，各月份的標準化明細一併寫入
+# ============================================
+
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from .cache import read_excel_cached
+from .channels import standardize_pinkoi, standardize_shopify
+from .logs import ProgressReporter, get_logger
+from .pipeline import CHECKPOINT_FILES, input_paths, load_month_inputs, run_shopify_stages
+from .readers import read_excel
+from .report import (
+    add_mismatch_sheet,
+    build_monthly_report,
+    check_pinkoi_amounts,
+    write_monthly_report,
+)
+from .warehouse import OrderWarehouse
+
+MONTH_FOLDER = re.compile(r'^(0[1-9]|1[0-2])$')
+YEAR_PREFIX = re.compile(r'^(\d{4})')
+
+log = get_logger('batch')
+
+REPORT_NAME = '月度財務報表_{month}.xlsx'
+SUMMARY_NAME = '批次執行摘要_{year}.xlsx'
+
+
+def discover_months(year_folder, year=None):
+    """年度資料夾（例如 2026-月度財務報表）→ [(月份資料夾路徑, 'YYYYMM')]"""
+    if year is None:
+        match = YEAR_PREFIX.match(os.path.basename(os.path.normpath(year_folder)))
+        if not match:
+            raise ValueError(f"無法從資料夾名稱判斷年份：{year_folder}，請指定 year")
+        year = match.group(1)
+
+    months = []
+    for name in sorted(os.listdir(year_folder)):
+        folder_path = os.path.join(year_folder, name)
+        if os.path.isdir(folder_path) and MONTH_FOLDER.match(name):
+            months.append((folder_path, f"{year}{name}"))
+    return months
+
+
+def build_month_report(folder_path, month, warehouse_db=None):
+    """產生一個月份的月度財務報表，回傳這個月份的執行結果
+
+    月份資料夾已經有 計算版-V3 時沿用（和 02_monthly_report.py 相同），
+    否則從 Shopify 後台匯出跑完整流程；warehouse_db：訂單倉庫路徑
+    """
+    start = time.perf_counter()
+    result = {'月份': month, '資料夾': folder_path}
+    try:
+        v3_path = os.path.join(folder_path, CHECKPOINT_FILES['計算版-V3'])
+        if os.path.exists(v3_path):
+            shopify_v3 = read_excel(v3_path)
+            pinkoi = read_excel_cached(input_paths(folder_path, month)['pinkoi'])
+            result['來源'] = '計算版-V3'
+        else:
+            inputs = load_month_inputs(folder_path, month)
+            shopify_v3, _ = run_shopify_stages(inputs['shopify'], inputs['cost'])
+            pinkoi = inputs['pinkoi']
+            result['來源'] = 'Shopify 後台匯出'
+
+        shopify_std = standardize_shopify(shopify_v3)
+        pinkoi_std = standardize_pinkoi(pinkoi)
+        mismatches = check_pinkoi_amounts(pinkoi_std)
+        sheets, totals = build_monthly_report(shopify_std, pinkoi_std)
+        output_path = os.path.join(folder_path, REPORT_NAME.format(month=month))
+        write_monthly_report(add_mismatch_sheet(sheets, mismatches), output_path)
+        if warehouse_db:
+            with OrderWarehouse(warehouse_db) as warehouse:
+                warehouse.append_month(month, [shopify_std, pinkoi_std])
+
+        result.update({
+            '狀態': '✅ 完成',
+            '總訂單數': totals['total_orders'],
+            '總營業額': round(totals['total_actual'], 2),
+            '總折扣': round(totals['total_discount'], 2),
+            '總利潤': round(totals['total_profit'], 2),
+            'Pinkoi金額不一致': len(mismatches),
+            '輸出檔案': output_path,
+        })
+    except Exception as e:  # 一個月份失敗不影響其他月份
+        result.update({'狀態': '❌ 失敗', '錯誤': f"{type(e).__name__}: {e}"})
+
+    result['耗時(秒)'] = round(time.perf_counter() - start, 2)
+    return result
+
+
+def run_batch(year_folder, year=None, workers=None, summary_path=None, warehouse_db=None):
+    """全部月份平行產生報表，回傳摘要 DataFrame（依月份排序）並存檔
+
+    workers：process 數量，預設為 CPU 核心數；1 = 依序執行（方便除錯）
+    warehouse_db：訂單倉庫路徑，有給時各月份明細一併寫入（SQLite 會讓各 process 依序寫入）
+    """
+    months = discover_months(year_folder, year)
+    if not months:
+        raise FileNotFoundError(f"找不到月份資料夾（01…12）：{year_folder}")
+
+    start = time.perf_counter()
+    results = []
+    with ProgressReporter(len(months), '月份完成', unit='個', logger=log) as progress:
+        if workers == 1:
+            for folder_path, month in months:
+                results.append(build_month_report(folder_path, month, warehouse_db))
+                progress.update()
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(build_month_report, folder_path, month, warehouse_db) for folder_path, month in months]
+                for future in as_completed(futures):
+                    results.append(future.result())
+                    progress.update()
+
+    summary = pd.DataFrame(results).sort_values('月份').reset_index(drop=True)
+    summary.attrs['total_seconds'] = round(time.perf_counter() - start, 2)
+
+    year = months[0][1][:4]
+    summary_path = summary_path or os.path.join(year_folder, SUMMARY_NAME.format(year=year))
+    summary.to_excel(summary_path, index=False)
+    summary.attrs['summary_path'] = summary_path
+    return summary
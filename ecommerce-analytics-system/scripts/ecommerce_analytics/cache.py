@@ -0,0 +1,238 @@
+# ============================================
+# 模組名稱：Excel 讀取快取
+# 功能：
+#   1. 用檔案大小 + 修改時間 + 內容 SHA-256 辨識來源 xlsx
+#   2. 第一次讀取後把整理好型別的 DataFrame 存成 Parquet（沒有 pyarrow 時用 pickle）
+#   3. 之後同一個檔案直接讀快取，不再解析 xlsx（第一次用 readers.py 選的引擎讀）
+#   4. 依最後使用時間和總容量自動清除舊快取
+#   5. columns：只讀需要的欄位（見 columns.py），快取也只存這些欄位
+#   6. 每個快取有自己的記錄檔，多個 process 同時讀寫快取不會互相蓋掉記錄
+# ============================================
+
+import hashlib
+import importlib.util
+import json
+import os
+import time
+
+import pandas as pd
+
+from .readers import read_excel
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'ECOMMERCE_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.ecommerce_analytics_cache')
+)
+MAX_AGE_DAYS = 30
+MAX_TOTAL_BYTES = 2 * 1024 ** 3
+
+# 每個快取檔旁邊有自己的記錄檔（{key}.entry.json），來源檔的 SHA-256 記在 sources/；
+# 不共用一個 manifest，平行執行時不會互相蓋掉記錄
+ENTRY_SUFFIX = '.entry.json'
+SOURCES_DIR = 'sources'
+CACHE_FORMATS = ('parquet', 'pickle')
+# 沒有記錄檔的快取檔（寫到一半中斷）超過這個秒數才清掉，避免刪到正在寫的
+ORPHAN_SECONDS = 3600
+# 舊版共用的清單檔，已不使用
+LEGACY_MANIFEST = 'manifest.json'
+
+
+def _has_parquet():
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """來源檔內容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_dtypes(df):
+    """混合型別的文字欄位統一轉成字串（空值保留），讓 Parquet 可以存"""
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed'):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def _read_json(path):
+    """讀記錄檔；不存在或壞掉時回傳 None（當作沒有快取）"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """先寫暫存檔再 os.replace，其他 process 不會讀到寫一半的記錄"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:  # 另一個 process 已經刪掉
+        pass
+
+
+def _entry_path(cache_dir, key):
+    return os.path.join(cache_dir, f"{key}{ENTRY_SUFFIX}")
+
+
+def _source_path(cache_dir, path):
+    name = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, SOURCES_DIR, f"{name}.json")
+
+
+def _source_digest(path, cache_dir):
+    """大小和修改時間都沒變就沿用上次的 SHA-256，否則重新計算"""
+    stat = os.stat(path)
+    record_path = _source_path(cache_dir, path)
+    source = _read_json(record_path)
+    if source and source['size'] == stat.st_size and source['mtime_ns'] == stat.st_mtime_ns:
+        return source['digest']
+
+    digest = file_digest(path)
+    os.makedirs(os.path.dirname(record_path), exist_ok=True)
+    _write_json(record_path, {
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'digest': digest,
+    })
+    return digest
+
+
+def load_manifest(cache_dir=None):
+    """由各記錄檔組成目前的快取清單：{'sources': {來源檔: 記錄}, 'entries': {key: 記錄}}（只讀）"""
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    manifest = {'sources': {}, 'entries': {}}
+    if not os.path.isdir(cache_dir):
+        return manifest
+    for name in os.listdir(cache_dir):
+        if name.endswith(ENTRY_SUFFIX):
+            entry = _read_json(os.path.join(cache_dir, name))
+            if entry is not None:
+                manifest['entries'][name[:-len(ENTRY_SUFFIX)]] = entry
+    sources_dir = os.path.join(cache_dir, SOURCES_DIR)
+    if os.path.isdir(sources_dir):
+        for name in os.listdir(sources_dir):
+            source = _read_json(os.path.join(sources_dir, name))
+            if source is not None:
+                manifest['sources'][source['path']] = dict(source, record=name)
+    return manifest
+
+
+def _cache_key(digest, read_kwargs):
+    options = repr(sorted(read_kwargs.items()))
+    return f"{digest[:32]}-{hashlib.sha256(options.encode('utf-8')).hexdigest()[:8]}"
+
+
+def read_excel_cached(path, cache_dir=None, columns=None, engine=None, **read_kwargs):
+    """和 readers.read_excel 一樣，但同一個檔案第二次起改讀快取
+
+    columns：只讀這些欄位（來源檔沒有的略過）；不同的欄位清單各自快取
+    engine：讀取引擎（見 readers.py）；各引擎讀出的結果相同，不影響快取
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    os.makedirs(cache_dir, exist_ok=True)
+
+    key_options = {**read_kwargs, 'columns': sorted(columns)} if columns is not None else read_kwargs
+    key = _cache_key(_source_digest(path, cache_dir), key_options)
+    entry_path = _entry_path(cache_dir, key)
+    entry = _read_json(entry_path)
+
+    if entry and os.path.exists(os.path.join(cache_dir, entry['file'])):
+        cache_path = os.path.join(cache_dir, entry['file'])
+        df = pd.read_parquet(cache_path) if entry['format'] == 'parquet' else pd.read_pickle(cache_path)
+        entry['last_used'] = time.time()
+        _write_json(entry_path, entry)
+        return df
+
+    df = normalize_dtypes(read_excel(path, columns=columns, engine=engine, **read_kwargs))
+
+    fmt = 'parquet' if _has_parquet() else 'pickle'
+    file_name = f"{key}.{fmt}"
+    cache_path = os.path.join(cache_dir, file_name)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    if fmt == 'parquet':
+        df.to_parquet(tmp_path, index=False)
+    else:
+        df.to_pickle(tmp_path)
+    os.replace(tmp_path, cache_path)
+
+    # 快取檔寫好才寫記錄檔：有記錄就一定有完整的快取檔
+    _write_json(entry_path, {
+        'source': os.path.abspath(path),
+        'file': file_name,
+        'format': fmt,
+        'bytes': os.path.getsize(cache_path),
+        'last_used': time.time(),
+    })
+    evict(cache_dir)
+    return df
+
+
+def evict(cache_dir=None, max_age_days=MAX_AGE_DAYS, max_total_bytes=MAX_TOTAL_BYTES):
+    """清除超過 max_age_days 沒用過的快取，總容量超過 max_total_bytes 時從最久沒用的開始刪
+
+    回傳被刪除的快取數量
+    """
+    cache_dir = cache_dir or DEFAULT_CACHE_DIR
+    if not os.path.isdir(cache_dir):
+        return 0
+    manifest = load_manifest(cache_dir)
+
+    entries = manifest['entries']
+    now = time.time()
+    by_last_used = sorted(entries.items(), key=lambda item: item[1]['last_used'])
+    total_bytes = sum(entry['bytes'] for entry in entries.values())
+
+    removed = []
+    for key, entry in by_last_used:
+        too_old = now - entry['last_used'] > max_age_days * 86400
+        if too_old or total_bytes > max_total_bytes:
+            removed.append(key)
+            total_bytes -= entry['bytes']
+
+    # 先刪記錄檔再刪快取檔：其他 process 不會拿到指向已刪除檔案的記錄
+    for key in removed:
+        _remove(_entry_path(cache_dir, key))
+        _remove(os.path.join(cache_dir, entries[key]['file']))
+
+    # 沒有記錄檔的快取檔（寫到一半中斷）也清掉，不然總容量永遠算不到
+    recorded = {entry['file'] for key, entry in entries.items() if key not in removed}
+    for name in os.listdir(cache_dir):
+        ext = os.path.splitext(name)[1]
+        if name in recorded or not (ext.lstrip('.') in CACHE_FORMATS or ext == '.tmp'):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            is_orphan = now - os.path.getmtime(path) > ORPHAN_SECONDS
+        except FileNotFoundError:
+            continue
+        if is_orphan:
+            _remove(path)
+
+    _remove(os.path.join(cache_dir, LEGACY_MANIFEST))
+
+    # 來源檔已經不存在的記錄也一起清掉
+    for source_path, source in manifest['sources'].items():
+        if not os.path.exists(source_path):
+            _remove(os.path.join(cache_dir, SOURCES_DIR, source['record']))
+
+    return len(removed)
+
+
+def clear_cache(cache_dir=None):
+    """刪除全部快取"""
+    return evict(cache_dir, max_age_days=-1)
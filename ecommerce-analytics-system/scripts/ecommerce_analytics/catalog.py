@@ -0,0 +1,180 @@
+# ============================================
+# 模組名稱：成本表索引（Cost_with_ID_最終版.xlsx）
+# 功能：
+#   1. 產品名稱標準化：NFKC（全形→半形）、去頭尾空白、合併空白、不分大小寫
+#   2. 先用 Variant SKU 對照，找不到再用產品名稱；去掉規格後綴的名稱、近似名稱
+#      都要另外開啟（可能對到別的規格），對到的以各自的匹配方式標示
+#   3. 三字元（trigram）索引，找近似名稱時只比對有共同 trigram 的候選產品
+# ============================================
+
+import re
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Shopify 的 Lineitem name 常見「產品名稱 - 規格」
+VARIANT_SEPARATOR = re.compile(r'\s+[-/|]\s+(?!.*\s[-/|]\s)')
+
+MATCH_BY_SKU = 'SKU'
+MATCH_BY_NAME = '產品名稱'
+MATCH_BY_BASE_NAME = '去規格名稱'
+MATCH_BY_FUZZY = '近似名稱'
+# 不是完全相同的產品，要人工確認的匹配方式
+APPROXIMATE_METHODS = [MATCH_BY_BASE_NAME, MATCH_BY_FUZZY]
+
+# 找近似名稱時，出現在超過這麼多產品的 trigram 不拿來找候選
+MAX_POSTINGS = 500
+
+
+def normalize_name(name):
+    """產品名稱標準化，空值回傳 ''"""
+    if name is None or (isinstance(name, float) and name != name):
+        return ''
+    name = unicodedata.normalize('NFKC', str(name))
+    return ' '.join(name.split()).casefold()
+
+
+def split_variant(name):
+    """'產品 - 規格' → ('產品', '規格')，沒有規格時規格為 ''"""
+    parts = VARIANT_SEPARATOR.split(name, maxsplit=1)
+    if len(parts) == 2:
+        return parts[0], parts[1]
+    return name, ''
+
+
+def trigrams(name):
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def normalize_names(values):
+    """整欄標準化：相同名稱只處理一次"""
+    values = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+    codes, uniques = pd.factorize(values, sort=False)
+    normalized = np.array([normalize_name(u) for u in np.asarray(uniques, dtype=object)] + [''], dtype=object)
+    return pd.Series(normalized[codes], index=values.index)
+
+
+class CostCatalog:
+    """成本表的 SKU / 產品名稱 / trigram 索引"""
+
+    def __init__(self, product_names, skus, costs):
+        self.names = normalize_names(product_names).tolist()
+        self.skus = list(skus)
+        self.costs = list(costs)
+
+        self.by_sku = {}
+        self.by_name = {}
+        self.by_base_name = {}
+        for i, (name, sku_key) in enumerate(zip(self.names, normalize_names(self.skus))):
+            if sku_key:
+                self.by_sku.setdefault(sku_key, i)
+            if name:
+                self.by_name.setdefault(name, i)
+                self.by_base_name.setdefault(split_variant(name)[0], i)
+
+        self._trigram_index = None
+
+    @classmethod
+    def from_frame(cls, cost, product_col, sku_col='Variant SKU', cost_col='Cost'):
+        """由成本表建立索引（產品名稱為空的行略過，重複時保留第一個）"""
+        cost = cost[cost[product_col].notna()]
+        costs = pd.to_numeric(cost[cost_col], errors='coerce')
+        return cls(cost[product_col].tolist(), cost[sku_col].tolist(), costs.tolist())
+
+    def __len__(self):
+        return len(self.by_name)
+
+    @property
+    def trigram_index(self):
+        """trigram → 產品位置（第一次找近似名稱時才建立）"""
+        if self._trigram_index is None:
+            index = defaultdict(list)
+            self._name_grams = {}
+            for name, i in self.by_name.items():
+                grams = trigrams(name)
+                self._name_grams[i] = grams
+                for gram in grams:
+                    index[gram].append(i)
+            self._trigram_index = index
+        return self._trigram_index
+
+    def suggest(self, name, limit=3, min_score=0.3, max_postings=MAX_POSTINGS):
+        """近似名稱候選：[(成本表產品名稱, 相似度)]，相似度為 trigram Jaccard
+
+        只從較少見的 trigram（出現在不超過 max_postings 個產品）找候選，
+        避免每個名稱都和整個成本表比對；全部都常見時改用最少見的那個
+        """
+        name = normalize_name(name)
+        grams = trigrams(name)
+        postings = sorted((self.trigram_index[gram] for gram in grams if gram in self.trigram_index), key=len)
+        if not postings:
+            return []
+
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if len(posting) > max_postings:
+                break
+            candidates.update(posting)
+
+        scored = []
+        for i in candidates:
+            other = self._name_grams[i]
+            shared = len(grams & other)
+            score = shared / (len(grams) + len(other) - shared)
+            if score >= min_score:
+                scored.append((self.names[i], round(score, 3)))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
+
+    def lookup(self, product_names, skus=None, fuzzy_threshold=None, base_name=False):
+        """訂單的產品名稱（和 SKU）→ DataFrame[Variant SKU, 單位成本, 匹配方式, 對照名稱]
+
+        依序用 SKU、產品名稱對照；base_name=True 時再用去規格名稱
+        （「X - Large」可能對到「X - Small」的成本）；fuzzy_threshold 有設定時，
+        其餘找不到的名稱再用 trigram 相似度達到門檻的產品。
+        對照名稱為成本表中對到的產品名稱（標準化後）
+        """
+        product_names = pd.Series(product_names)
+        names = normalize_names(product_names)
+        sku_keys = normalize_names(skus if skus is not None else pd.Series('', index=product_names.index))
+        sku_keys.index = names.index
+
+        position = sku_keys.map(self.by_sku)
+        method = pd.Series(MATCH_BY_SKU, index=names.index).where(position.notna())
+
+        def fill(label, found):
+            nonlocal position, method
+            method = method.mask(position.isna() & found.notna(), label)
+            position = position.fillna(found)
+
+        fill(MATCH_BY_NAME, names.map(self.by_name))
+
+        if base_name:
+            missing_names = names[position.isna()]
+            base_names = {name: split_variant(name)[0] for name in missing_names.unique()}
+            fill(MATCH_BY_BASE_NAME, missing_names.map(base_names).map(self.by_base_name).reindex(names.index))
+
+        if fuzzy_threshold is not None:
+            missing = position.isna() & (names != '')
+            fuzzy = {}
+            for name in names[missing].unique():
+                candidates = self.suggest(name, limit=1, min_score=fuzzy_threshold)
+                if candidates:
+                    fuzzy[name] = self.by_name[candidates[0][0]]
+            fill(MATCH_BY_FUZZY, names[missing].map(fuzzy).reindex(names.index))
+
+        found = position.notna()
+        idx = position[found].astype(int)
+        result = pd.DataFrame({
+            'Variant SKU': pd.Series(None, index=names.index, dtype=object),
+            '單位成本': pd.Series(np.nan, index=names.index),
+            '匹配方式': method,
+            '對照名稱': pd.Series(None, index=names.index, dtype=object),
+        })
+        result.loc[found, 'Variant SKU'] = np.array(self.skus, dtype=object)[idx.to_numpy()]
+        result.loc[found, '對照名稱'] = np.array(self.names, dtype=object)[idx.to_numpy()]
+        result.loc[found, '單位成本'] = np.array(self.costs, dtype=float)[idx.to_numpy()]
+        return result
@@ -0,0 +1,148 @@
+# ============================================
+# 模組名稱：銷售渠道轉接器（各渠道訂單表 → 統一欄位）
+# 功能：
+#   1. register_channel：每個渠道宣告一次欄位對應（統一欄位 → 可能的原始欄名）、
+#      固定值和衍生欄位；型別一律依 schema.ORDER_SCHEMA
+#   2. match_columns：由表頭找出對應的原始欄位，同樣的表頭只比對一次（快取）
+#   3. to_numbers：多個欄位一次轉成數字，只有含文字的表才逐欄轉換
+#   4. standardize_orders：依渠道轉接器轉成統一欄位；
+#      standardize_shopify / standardize_pinkoi 為內建的兩個渠道
+# 說明：新增渠道只要呼叫 register_channel，不用再複製一段標準化程式；
+#       CHANNELS 依註冊順序列出渠道，月度統計（report.py）也依它列出各渠道
+# ============================================
+
+from functools import lru_cache
+
+import pandas as pd
+from pandas.api.types import is_numeric_dtype, pandas_dtype
+
+from .money import CENTS, prefer_positive, times_cents
+from .schema import CENTS_COLS, FINAL_COLS, ORDER_SCHEMA, apply_order_schema
+
+# 渠道名稱 → {'fields': {統一欄位: [原始欄名, ...]}, 'constants': {統一欄位: 固定值}, 'derive': 函式或 None}
+CHANNEL_ADAPTERS = {}
+# 已註冊的渠道（依註冊順序），也是標準化明細「渠道」欄的類別
+CHANNELS = []
+
+# 統一欄位中要轉成數字的欄（數量、金額、利潤率），其他的保留原值
+NUMBER_COLS = [col for col, dtype in ORDER_SCHEMA.items() if is_numeric_dtype(pandas_dtype(dtype))]
+
+
+def register_channel(name, fields, constants=None, derive=None):
+    """註冊一個渠道
+
+    fields：{統一欄位: [可能的原始欄名（依優先順序）]}，全部都要找得到
+    constants：來源沒有的欄位 → 固定值
+    derive：由其他統一欄位計算的欄位，std → std
+    """
+    if name not in CHANNELS:
+        CHANNELS.append(name)
+    CHANNEL_ADAPTERS[name] = {'fields': fields, 'constants': constants or {}, 'derive': derive}
+
+
+@lru_cache(maxsize=256)
+def _match_header(header, fields):
+    available = set(header)
+    return tuple((key, next((col for col in candidates if col in available), None)) for key, candidates in fields)
+
+
+def match_columns(columns, fields):
+    """表頭 + {欄位: [可能的原始欄名]} → {欄位: 第一個存在的原始欄名，找不到為 None}
+
+    結果依表頭（所有欄名）快取，同一種匯出格式只比對一次
+    """
+    return dict(_match_header(tuple(columns), tuple((key, tuple(candidates)) for key, candidates in fields.items())))
+
+
+def to_numbers(frame):
+    """多個欄位 → float64，無法轉換的值和空白當作 0
+
+    先整張表一次 astype；有欄位含文字（例如 '-'、'1,200'）時才逐欄 pd.to_numeric
+    """
+    try:
+        numbers = frame.astype('float64')
+    except (TypeError, ValueError):
+        numbers = frame.apply(pd.to_numeric, errors='coerce').astype('float64')
+    return numbers.fillna(0)
+
+
+def standardize_orders(raw, channel):
+    """渠道訂單表 → 統一欄位（FINAL_COLS 順序、ORDER_SCHEMA 型別）"""
+    adapter = CHANNEL_ADAPTERS.get(channel)
+    if adapter is None:
+        raise ValueError(f"未註冊的渠道：{channel}（已註冊：{' / '.join(CHANNEL_ADAPTERS)}）")
+
+    source = match_columns(raw.columns, adapter['fields'])
+    missing = [f"{col}（{' / '.join(adapter['fields'][col])}）" for col, found in source.items() if found is None]
+    if missing:
+        raise ValueError(f"{channel} 訂單表缺少欄位：{'、'.join(missing)}")
+
+    text_cols = [col for col in source if col not in NUMBER_COLS]
+    number_cols = [col for col in source if col in NUMBER_COLS]
+    cents_cols = [col for col in number_cols if col in CENTS_COLS]
+
+    # 所有數字欄一次轉換，金額欄再一次轉成整數分
+    numbers = to_numbers(raw[[source[col] for col in number_cols]].set_axis(number_cols, axis=1))
+    std = pd.concat([
+        raw[[source[col] for col in text_cols]].set_axis(text_cols, axis=1),
+        numbers.drop(columns=cents_cols),
+        (numbers[cents_cols] * CENTS).round().astype('int64'),
+    ], axis=1)
+    std = std.assign(渠道=pd.Categorical([channel] * len(std), categories=CHANNELS), **adapter['constants'])
+    if adapter['derive'] is not None:
+        std = adapter['derive'](std)
+    return apply_order_schema(std[FINAL_COLS])
+
+
+def _derive_shopify(std):
+    # 實際金額優先使用分攤後金額
+    original = times_cents(std['數量'], std['單價'])
+    return std.assign(商品原始金額=original, 實際金額=prefer_positive(std['分攤後金額'], original))
+
+
+def _derive_pinkoi(std):
+    # 沒有分攤後金額，實際金額 = 商品原始金額；沒有成本，利潤 = 實際金額，利潤率 100%
+    original = times_cents(std['數量'], std['單價'])
+    return std.assign(商品原始金額=original, 實際金額=original, 總利潤=original, 利潤率=100.0)
+
+
+# Shopify 計算版-V3（01_shopify_data_cleaning.py 的輸出）
+register_channel('Shopify', {
+    '訂單編號': ['Order No'],
+    '訂單日期': ['Created at'],
+    '客戶名稱': ['Customer Name'],
+    '商品名稱': ['Product Name'],
+    '數量': ['Quantity'],
+    '單價': ['Selling Price'],
+    '總金額': ['Total'],
+    '折扣': ['Discount Amount'],
+    '分攤後金額': ['分攤後金額'],
+    '分攤後折扣': ['分攤後折扣'],
+    '成本': ['Cost  (unit)'],
+    '單件利潤': ['Profit (unit)'],
+    '總成本': ['Total Cost'],
+    '總利潤': ['Total Profit'],
+    '利潤率': [' Gross Profit Margin'],
+}, derive=_derive_shopify)
+
+# Pinkoi 後台匯出：沒有分攤、成本和利潤資料
+register_channel('Pinkoi', {
+    '訂單編號': ['訂單編號'],
+    '訂單日期': ['訂單成立日期'],
+    '客戶名稱': ['買家'],
+    '商品名稱': ['購買品項'],
+    '數量': ['數量'],
+    '單價': ['商品單價'],
+    '總金額': ['總金額'],
+    '折扣': ['折抵'],
+}, constants=dict.fromkeys(['分攤後金額', '分攤後折扣', '成本', '單件利潤', '總成本'], 0), derive=_derive_pinkoi)
+
+
+def standardize_shopify(shopify):
+    """Shopify 計算版-V3 → 統一欄位（ORDER_SCHEMA 型別）"""
+    return standardize_orders(shopify, 'Shopify')
+
+
+def standardize_pinkoi(pinkoi):
+    """Pinkoi 後台匯出 → 統一欄位（ORDER_SCHEMA 型別）"""
+    return standardize_orders(pinkoi, 'Pinkoi')
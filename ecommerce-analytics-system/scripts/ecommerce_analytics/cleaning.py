@@ -0,0 +1,82 @@
+# ============================================
+# 模組名稱：整理 Shopify 訂單表
+# 功能：
+#   1. 欄位改名
+#   2. 合併電話欄位
+#   3. 加入 Index
+#   4. 數值欄位轉成數字
+# ============================================
+
+import pandas as pd
+
+# 欄位改名對照表
+RENAME_MAP = {
+    'Name': 'Order No',
+    'Lineitem quantity': 'Quantity',
+    'Lineitem name': 'Product Name',
+    'Lineitem price': 'Cost',
+    'Lineitem sku': 'SKU',
+    'Billing Name': 'Customer Name',
+    'Id': 'Order Id'
+}
+
+NUMERIC_COLS = ['Quantity', 'Cost', 'Total']
+
+
+# 電話格式：去掉前面的 '、空白、-、括號，Excel 數字欄位的 .0，+886 / 00886 改成 0 開頭
+PHONE_JUNK = r"\.0$|[\s'\-()]"
+PHONE_COUNTRY_CODE = r'^(?:\+|00)8860?'
+
+
+def _is_blank_phone(series):
+    """空值、空字串、只有空白或 ' 的電話"""
+    return series.isna() | series.astype('string').str.strip(" '\t").isin(['', 'nan', 'None'])
+
+
+def normalize_phone(series):
+    """統一電話格式，空值回傳 ''"""
+    phone = series.astype('string')
+    phone = phone.str.replace(PHONE_JUNK, '', regex=True)
+    phone = phone.str.replace(PHONE_COUNTRY_CODE, '0', regex=True)
+    return phone.mask(phone.isin(['nan', 'None']), '').fillna('')
+
+
+def merge_phone_columns(df):
+    """合併電話：優先使用 Billing Phone，如果沒有則用 Phone
+
+    先逐欄挑出要用的值（不用 df.apply 逐行判斷），再只對合併後的一欄做格式整理
+    """
+    has_billing_phone = 'Billing Phone' in df.columns
+    has_phone = 'Phone' in df.columns
+
+    if not has_billing_phone and not has_phone:
+        df['Phone'] = ''
+        return df
+
+    if has_billing_phone and has_phone:
+        billing = df['Billing Phone']
+        phone = billing.astype(object).where(~_is_blank_phone(billing), df['Phone'].astype(object))
+        df = df.drop(columns=['Billing Phone'])
+    elif has_billing_phone:
+        phone = df['Billing Phone']
+        df = df.rename(columns={'Billing Phone': 'Phone'})
+    else:
+        phone = df['Phone']
+
+    df['Phone'] = normalize_phone(phone)
+    return df
+
+
+def clean_shopify_orders(df):
+    """Shopify 後台匯出 → 整理版（回傳新的 DataFrame）"""
+    df = df.rename(columns=RENAME_MAP)
+    df = merge_phone_columns(df)
+
+    # 加入 Index 欄（放在第一欄，從1開始）
+    df.insert(0, 'Index', range(1, len(df) + 1))
+
+    for col in NUMERIC_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    return df
@@ -0,0 +1,254 @@
+# ============================================
+# 模組名稱：命令列介面
+# 用法（在 scripts 資料夾下）：
+#   python -m ecommerce_analytics clean   202601-Shopify-Orders.xlsx 整理版.xlsx
+#   python -m ecommerce_analytics costs   整理版.xlsx Cost_with_ID_最終版.xlsx 計算版-V2.xlsx
+#   python -m ecommerce_analytics allocate 計算版-V2.xlsx 計算版-V3.xlsx
+#   python -m ecommerce_analytics report  計算版-V3.xlsx 202601-Pinkoi_orders.xlsx 月度財務報表_202601.xlsx
+#   python -m ecommerce_analytics month   C:\...\2026-月度財務報表\01 202601 --cost-db 成本表.sqlite
+#   python -m ecommerce_analytics batch   C:\...\2026-月度財務報表
+#   python -m ecommerce_analytics pinkoi-stats C:\...\Pinkoi_2025統計.xlsx 2025
+#   python -m ecommerce_analytics ingest-csv orders_export.csv 分區資料夾
+#   python -m ecommerce_analytics import-costs Cost_with_ID_最終版.xlsx --effective-from 2026-02-01
+#   python -m ecommerce_analytics warehouse --by year --customers 20   （訂單倉庫的跨年度統計）
+#   python -m ecommerce_analytics -q batch C:\...\2026-月度財務報表   （排程：只輸出警告和錯誤）
+# 說明：每個指令在同一個 process 中完成，不再每一步存檔再讀回
+# ============================================
+
+import argparse
+import os
+
+import pandas as pd
+
+from .allocation import allocate_order_amounts, arrange_allocation_columns
+from .batch import run_batch
+from .cache import read_excel_cached
+from .cleaning import clean_shopify_orders
+from .columns import shopify_columns
+from .cost_store import DEFAULT_COST_DB, CostStore
+from .costs import add_profit_columns, join_product_costs
+from .ingest import CHUNK_SIZE, stream_shopify_csv
+from .loading import load_channels
+from .logs import get_logger, setup_logging
+from .pipeline import load_month_inputs, run_monthly_pipeline
+from .pinkoi import pinkoi_statistics, pinkoi_stats_table, read_pinkoi_orders, write_stats_sheet
+from .readers import read_excel
+from .report import (
+    add_mismatch_sheet,
+    build_monthly_report,
+    check_pinkoi_amounts,
+    write_monthly_report,
+)
+from .warehouse import DEFAULT_WAREHOUSE_DB, OrderWarehouse
+
+log = get_logger('cli')
+
+
+def _clean(args):
+    df = clean_shopify_orders(read_excel_cached(args.input, columns=shopify_columns()))
+    df.to_excel(args.output, index=False)
+    log.info(f"✅ 整理版：{len(df)} 行 → {args.output}")
+
+
+def _costs(args):
+    cost = CostStore(args.cost) if args.cost.endswith(('.sqlite', '.db')) else read_excel_cached(args.cost)
+    orders, match_stats = join_product_costs(read_excel_cached(args.input), cost, fuzzy_threshold=args.fuzzy,
+                                             base_name=args.base_name)
+    orders = add_profit_columns(orders)
+    orders.to_excel(args.output, index=False)
+    log.info(f"✅ 計算版-V2：找到成本 {match_stats['found_cost']} / {len(orders)} 筆 → {args.output}")
+    for product, (method, matched_name) in match_stats['approximate_matches'].items():
+        log.warning(f"   ⚠️ 用{method}對到（請確認成本）：{product} → {matched_name}")
+    if len(match_stats['missing_products']) > 0:
+        log.warning(f"   ⚠️ 找不到成本的產品：{len(match_stats['missing_products'])} 個")
+
+
+def _allocate(args):
+    df, problem_orders = allocate_order_amounts(read_excel(args.input))
+    df = arrange_allocation_columns(df)
+    df.to_excel(args.output, index=False)
+    log.info(f"✅ 計算版-V3：{len(df)} 行 → {args.output}")
+    if problem_orders:
+        log.warning(f"   ⚠️ 分攤有問題的訂單：{len(problem_orders)} 筆")
+
+
+def _log_totals(totals):
+    log.info(f"   總訂單數：{totals['total_orders']} 筆")
+    log.info(f"   總營業額：${totals['total_actual']:,.2f}")
+    log.info(f"   總利潤：${totals['total_profit']:,.2f}")
+
+
+def _report(args):
+    std = load_channels({'Shopify': args.shopify, 'Pinkoi': args.pinkoi})
+    pinkoi_std = std['Pinkoi']
+    mismatches = check_pinkoi_amounts(pinkoi_std)
+    sheets, totals = build_monthly_report(std['Shopify'], pinkoi_std)
+    write_monthly_report(add_mismatch_sheet(sheets, mismatches), args.output, engine=args.engine)
+    log.info(f"✅ 月度財務報表 → {args.output}")
+    _log_totals(totals)
+
+
+def _month(args):
+    inputs = load_month_inputs(args.folder, args.month, cost_db=args.cost_db)
+    warehouse = OrderWarehouse(args.warehouse) if args.warehouse else None
+    sheets, totals, info = run_monthly_pipeline(
+        inputs['shopify'], inputs['cost'], inputs['pinkoi'],
+        checkpoint_dir=args.folder, checkpoints=args.checkpoint, month=args.month, warehouse=warehouse
+    )
+    output_path = args.output or os.path.join(args.folder, f'月度財務報表_{args.month}.xlsx')
+    write_monthly_report(sheets, output_path, engine=args.engine)
+    log.info(f"✅ 月度財務報表 → {output_path}")
+    if warehouse is not None:
+        warehouse.close()
+        log.info(f"✅ 訂單倉庫 → {args.warehouse}")
+    _log_totals(totals)
+
+
+def _import_costs(args):
+    with CostStore(args.db) as store:
+        counts = store.import_spreadsheet(args.file, valid_from=args.effective_from, force=args.force)
+        log.info(f"✅ 成本表 → {args.db}（目前 {len(store)} 個產品）")
+    if not any(counts.values()):
+        log.info("   成本表和上次匯入的內容相同，沒有變動")
+
+
+def _batch(args):
+    summary = run_batch(args.year_folder, year=args.year, workers=args.workers, warehouse_db=args.warehouse)
+    failed = summary[summary['狀態'] != '✅ 完成']
+    log.info(f"✅ {len(summary) - len(failed)} / {len(summary)} 個月份完成（{summary.attrs['total_seconds']} 秒）")
+    for row in failed.to_dict('records'):
+        log.error(f"   ❌ {row['月份']}：{row['錯誤']}")
+    log.info(f"   摘要：{summary.attrs['summary_path']}")
+
+
+def _warehouse(args):
+    with OrderWarehouse(args.db) as warehouse:
+        summary = warehouse.channel_summary(by=args.by, start_month=args.start, end_month=args.end)
+        customers = warehouse.customer_summary(start_month=args.start, end_month=args.end, limit=args.customers)
+    if summary.empty:
+        log.warning(f"⚠️ 訂單倉庫沒有資料：{args.db}")
+        return
+    log.info(summary.to_string(index=False))
+    if args.customers:
+        log.info('')
+        log.info(customers.to_string(index=False))
+    if args.output:
+        with pd.ExcelWriter(args.output) as writer:
+            summary.to_excel(writer, sheet_name='渠道統計', index=False)
+            customers.to_excel(writer, sheet_name='客戶統計', index=False)
+        log.info(f"✅ 訂單倉庫統計 → {args.output}")
+
+
+def _pinkoi_stats(args):
+    stats = pinkoi_statistics(read_pinkoi_orders(args.file, args.year))
+    write_stats_sheet(args.file, pinkoi_stats_table(stats), args.year)
+    log.info(f"✅ Pinkoi {args.year}統計 → {args.file}")
+    log.info(f"   總訂單數：{stats['total_orders']:,} 筆，總金額：${stats['total_amount']:,.2f}")
+
+
+def _ingest_csv(args):
+    row_counts = stream_shopify_csv(args.csv, args.output_dir, chunksize=args.chunksize or CHUNK_SIZE)
+    for month, rows in sorted(row_counts.items()):
+        log.info(f"   {month}：{rows:,} 行")
+    log.info(f"✅ 分區檔 → {args.output_dir}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m ecommerce_analytics',
+                                     description='Shopify / Pinkoi 訂單整理與月度財務報表')
+    parser.add_argument('--log-level', default=None,
+                        help='DEBUG / INFO / WARNING / ERROR，預設為環境變數 ECOMMERCE_LOG_LEVEL 或 INFO')
+    parser.add_argument('-q', '--quiet', dest='log_level', action='store_const', const='WARNING',
+                        help='只輸出警告和錯誤（排程執行用）')
+    parser.add_argument('--log-file', default=None, help='另外把訊息（含時間、等級）寫到這個檔案')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    cmd = commands.add_parser('clean', help='Shopify 後台匯出 → 整理版')
+    cmd.add_argument('input')
+    cmd.add_argument('output')
+    cmd.set_defaults(func=_clean)
+
+    cmd = commands.add_parser('costs', help='整理版 + 成本表 → 計算版-V2（成本、利潤）')
+    cmd.add_argument('input')
+    cmd.add_argument('cost', help='成本表 xlsx，或成本表資料庫（.sqlite / .db，依訂單日期取當時的成本）')
+    cmd.add_argument('output')
+    cmd.add_argument('--fuzzy', type=float, default=None, help='近似名稱門檻（例如 0.8），預設不用')
+    cmd.add_argument('--base-name', action='store_true', help='找不到的產品改用去掉規格的名稱對照，預設不用')
+    cmd.set_defaults(func=_costs)
+
+    cmd = commands.add_parser('allocate', help='計算版-V2 → 計算版-V3（分攤 Total / Discount）')
+    cmd.add_argument('input')
+    cmd.add_argument('output')
+    cmd.set_defaults(func=_allocate)
+
+    cmd = commands.add_parser('report', help='計算版-V3 + Pinkoi 訂單 → 月度財務報表')
+    cmd.add_argument('shopify')
+    cmd.add_argument('pinkoi')
+    cmd.add_argument('output')
+    cmd.add_argument('--engine', choices=['xlsxwriter', 'openpyxl'], default=None)
+    cmd.set_defaults(func=_report)
+
+    cmd = commands.add_parser('month', help='月份資料夾從 Shopify 後台匯出一次跑到月度財務報表')
+    cmd.add_argument('folder')
+    cmd.add_argument('month', help='YYYYMM')
+    cmd.add_argument('--output', default=None)
+    cmd.add_argument('--checkpoint', action='append', default=[],
+                     help='另外存檔的中間檔（整理版 / 計算版 / 計算版-V2 / 計算版-V3），可重複')
+    cmd.add_argument('--engine', choices=['xlsxwriter', 'openpyxl'], default=None)
+    cmd.add_argument('--cost-db', default=None,
+                     help='成本表資料庫；成本表有變動才匯入，依訂單日期取當時的成本')
+    cmd.add_argument('--warehouse', default=None, help='訂單倉庫路徑，標準化明細一併寫入')
+    cmd.set_defaults(func=_month)
+
+    cmd = commands.add_parser('batch', help='年度資料夾的全部月份平行產生報表')
+    cmd.add_argument('year_folder')
+    cmd.add_argument('--year', default=None)
+    cmd.add_argument('--workers', type=int, default=None)
+    cmd.add_argument('--warehouse', default=None, help='訂單倉庫路徑，各月份的標準化明細一併寫入')
+    cmd.set_defaults(func=_batch)
+
+    cmd = commands.add_parser('warehouse', help='訂單倉庫的各期間渠道統計和客戶統計')
+    cmd.add_argument('--db', default=DEFAULT_WAREHOUSE_DB,
+                     help=f'預設為環境變數 ECOMMERCE_WAREHOUSE_DB 或 {DEFAULT_WAREHOUSE_DB}')
+    cmd.add_argument('--by', choices=['month', 'year'], default='month')
+    cmd.add_argument('--start', default=None, help='起始月份 YYYYMM')
+    cmd.add_argument('--end', default=None, help='結束月份 YYYYMM')
+    cmd.add_argument('--customers', type=int, default=None, help='另外列出營業額最高的 N 個客戶')
+    cmd.add_argument('--output', default=None, help='統計結果另存 xlsx')
+    cmd.set_defaults(func=_warehouse)
+
+    cmd = commands.add_parser('pinkoi-stats', help='更新 Pinkoi 年度統計檔的統計工作表')
+    cmd.add_argument('file')
+    cmd.add_argument('year')
+    cmd.set_defaults(func=_pinkoi_stats)
+
+    cmd = commands.add_parser('ingest-csv', help='Shopify CSV 匯出分批讀取，依月份寫出分區檔')
+    cmd.add_argument('csv')
+    cmd.add_argument('output_dir')
+    cmd.add_argument('--chunksize', type=int, default=None)
+    cmd.set_defaults(func=_ingest_csv)
+
+    cmd = commands.add_parser('import-costs', help='成本表 xlsx 匯入成本表資料庫（只寫入有變動的產品）')
+    cmd.add_argument('file')
+    cmd.add_argument('--db', default=DEFAULT_COST_DB, help=f'預設為環境變數 ECOMMERCE_COST_DB 或 {DEFAULT_COST_DB}')
+    cmd.add_argument('--effective-from', default=None,
+                     help='新成本的生效日 YYYY-MM-DD，預設今天（第一次匯入時為所有日期）')
+    cmd.add_argument('--force', action='store_true', help='檔案內容和上次相同時也重新比對')
+    cmd.set_defaults(func=_import_costs)
+
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        setup_logging(args.log_level, log_file=args.log_file)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        args.func(args)
+    except (FileNotFoundError, ValueError) as e:
+        log.error(f"❌ 錯誤：{e}")
+        return 1
+    return 0
@@ -0,0 +1,71 @@
+# ============================================
+# 模組名稱：各階段需要的 Shopify 後台匯出欄位
+# 功能：
+#   1. STAGE_COLUMNS：每個階段實際用到的原始欄位（改名前的欄名）
+#   2. shopify_columns：要讀的欄位 = 各階段聯集 + 整理版保留的欄位
+#   3. shopify_read_options：給 read_excel / read_csv 的 usecols（和 CSV 的 dtype），
+#      其他幾十個欄位讀檔時就略過，不會變成 DataFrame 的欄
+# 說明：整理版保留的欄位和 01_shopify_data_cleaning.py 說明中
+#       「請保留以下欄位」相同，中間檔內容不變
+# ============================================
+
+# 改名、合併電話、加入 Index（cleaning.py）
+CLEAN_COLUMNS = [
+    'Name', 'Lineitem quantity', 'Lineitem name', 'Lineitem price', 'Lineitem sku',
+    'Billing Name', 'Billing Phone', 'Phone', 'Id', 'Total',
+]
+
+STAGE_COLUMNS = {
+    '整理版': CLEAN_COLUMNS,
+    # 成本和利潤：產品名稱、SKU、數量、單價，依 Created at 取當時的成本（costs.py）
+    '計算版': ['Lineitem name', 'Lineitem sku', 'Lineitem quantity', 'Lineitem price', 'Created at'],
+    # 分攤 Total 和 Discount Amount（allocation.py）
+    '計算版-V3': ['Name', 'Lineitem price', 'Lineitem quantity', 'Total', 'Discount Amount'],
+    # 標準化欄位（report.py）
+    '月度財務報表': [
+        'Name', 'Created at', 'Billing Name', 'Lineitem name', 'Lineitem quantity', 'Lineitem price',
+        'Total', 'Discount Amount',
+    ],
+}
+
+# 沒有階段用到、但整理版照原本說明保留的欄位
+KEEP_COLUMNS = ['Email', 'Paid at', 'Accepts Marketing', 'Discount Code', 'Source']
+
+# CSV 讀成文字以外型別的欄位，其他一律讀成文字（電話、SKU 不會被轉成數字）
+CSV_NUMERIC_COLUMNS = ['Lineitem quantity', 'Lineitem price', 'Total', 'Discount Amount']
+
+
+def shopify_columns(stages=None, keep=True):
+    """要讀的原始欄位（依第一次出現的順序）；stages 預設為全部階段"""
+    stages = list(STAGE_COLUMNS) if stages is None else stages
+    unknown = set(stages) - set(STAGE_COLUMNS)
+    if unknown:
+        raise ValueError(f"未知的階段：{sorted(unknown)}")
+
+    columns = []
+    for stage in stages:
+        columns.extend(STAGE_COLUMNS[stage])
+    if keep:
+        columns.extend(KEEP_COLUMNS)
+    return list(dict.fromkeys(columns))
+
+
+def usecols(columns):
+    """欄位清單 → read_excel / read_csv 的 usecols；來源檔沒有的欄位直接略過，不會報錯"""
+    wanted = frozenset(columns)
+    return lambda col: col in wanted
+
+
+def shopify_read_options(fmt, columns=None):
+    """'xlsx' / 'csv' → 讀 Shopify 後台匯出時的 pd.read_excel / pd.read_csv 參數
+
+    xlsx 的型別由儲存格決定，只做欄位篩選；CSV 另外指定每個欄位的 dtype，
+    不用逐欄推斷型別
+    """
+    columns = shopify_columns() if columns is None else columns
+    if fmt == 'xlsx':
+        return {'usecols': usecols(columns)}
+    if fmt == 'csv':
+        dtype = {col: (float if col in CSV_NUMERIC_COLUMNS else str) for col in columns}
+        return {'usecols': usecols(columns), 'dtype': dtype}
+    raise ValueError(f"不支援的格式：{fmt}（xlsx / csv）")
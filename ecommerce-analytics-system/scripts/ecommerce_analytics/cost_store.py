@@ -0,0 +1,285 @@
+# ============================================
+# 模組名稱：成本表資料庫（SQLite）
+# 功能：
+#   1. 成本表存成本機 SQLite，產品名稱（標準化後）和 Variant SKU 都有索引
+#   2. 每個產品的成本有生效期間（valid_from ~ valid_to），改價時新增一個版本，
+#      舊月份的訂單用訂單日期當時有效的成本
+#   3. 匯入 Cost_with_ID_最終版.xlsx 時只寫入有變動的行；
+#      檔案內容和上次匯入相同時完全不讀 xlsx
+# 說明：同一個標準化名稱只保留成本表中的第一行（和 CostCatalog 相同）
+# ============================================
+
+import hashlib
+import os
+import sqlite3
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .cache import file_digest, read_excel_cached
+from .catalog import CostCatalog, normalize_name, normalize_names, split_variant
+from .costs import COST_PRODUCT_COLS, find_column
+from .logs import get_logger
+from .money import from_cents, to_cents
+
+log = get_logger('cost_store')
+
+DEFAULT_COST_DB = os.environ.get(
+    'ECOMMERCE_COST_DB',
+    os.path.join(os.path.expanduser('~'), '.ecommerce_analytics', 'cost_catalog.sqlite')
+)
+
+# 第一次匯入的成本視為一直以來都有效，舊月份也用得到
+BEGINNING = '1900-01-01'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cost_versions (
+    id            INTEGER PRIMARY KEY,
+    name_key      TEXT NOT NULL,
+    base_name_key TEXT NOT NULL,
+    product_name  TEXT NOT NULL,
+    sku           TEXT,
+    sku_key       TEXT,
+    cost_cents    INTEGER,
+    source_row    INTEGER NOT NULL,
+    row_hash      TEXT NOT NULL,
+    valid_from    TEXT NOT NULL,
+    valid_to      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cost_name ON cost_versions (name_key, valid_from);
+CREATE INDEX IF NOT EXISTS idx_cost_sku ON cost_versions (sku_key, valid_from);
+CREATE INDEX IF NOT EXISTS idx_cost_current ON cost_versions (valid_to, name_key);
+
+CREATE TABLE IF NOT EXISTS imports (
+    id          INTEGER PRIMARY KEY,
+    source_path TEXT NOT NULL,
+    digest      TEXT NOT NULL,
+    imported_at TEXT NOT NULL,
+    valid_from  TEXT NOT NULL,
+    added       INTEGER NOT NULL,
+    changed     INTEGER NOT NULL,
+    removed     INTEGER NOT NULL,
+    unchanged   INTEGER NOT NULL
+);
+"""
+
+
+def _row_hash(product_name, sku, cost_cents):
+    text = f"{product_name}\x1f{sku if sku is not None else ''}\x1f{cost_cents if cost_cents is not None else ''}"
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def _text(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return str(value)
+
+
+def cost_rows(cost, product_col=None, sku_col='Variant SKU', cost_col='Cost'):
+    """成本表 DataFrame → 每個標準化名稱一行（第一次出現的行），含雜湊"""
+    product_col = product_col or find_column(cost, COST_PRODUCT_COLS)
+    if not product_col:
+        raise ValueError(f"成本表找不到產品名稱欄位，需要以下欄位之一：{COST_PRODUCT_COLS}")
+    for col in [sku_col, cost_col]:
+        if col not in cost.columns:
+            raise ValueError(f"成本表沒有『{col}』欄位")
+
+    cost = cost[cost[product_col].notna()]
+    rows = pd.DataFrame({
+        'name_key': normalize_names(cost[product_col]).to_numpy(),
+        'product_name': cost[product_col].astype('str').to_numpy(),
+        'sku': [_text(sku) for sku in cost[sku_col]],
+        'source_row': np.arange(len(cost)),
+    })
+    costs = pd.to_numeric(cost[cost_col], errors='coerce')
+    rows['cost_cents'] = [None if pd.isna(value) else to_cents(value) for value in costs]
+    rows = rows[rows['name_key'] != ''].drop_duplicates('name_key')
+    rows['base_name_key'] = [split_variant(name)[0] for name in rows['name_key']]
+    rows['sku_key'] = [normalize_name(sku) or None for sku in rows['sku']]
+    rows['row_hash'] = [
+        _row_hash(name, sku, cents) for name, sku, cents in zip(rows['product_name'], rows['sku'], rows['cost_cents'])
+    ]
+    return rows
+
+
+class CostStore:
+    """成本表資料庫；catalog(as_of) 回傳當天有效成本的 CostCatalog"""
+
+    def __init__(self, db_path=DEFAULT_COST_DB):
+        self.db_path = db_path
+        folder = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(folder, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+        # 每個 as_of 的 CostCatalog（含 trigram 索引）只建立一次，匯入新成本時清掉
+        self._catalog = lru_cache(maxsize=16)(self._build_catalog)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM cost_versions WHERE valid_to IS NULL").fetchone()[0]
+
+    # === 匯入 ===
+
+    def last_digest(self):
+        """最近一次匯入的成本表內容（SHA-256），不管檔案放在哪個資料夾"""
+        row = self.conn.execute("SELECT digest FROM imports ORDER BY id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def import_spreadsheet(self, source_path, valid_from=None, force=False):
+        """匯入成本表 xlsx，回傳 {'新增', '修改', '移除', '未變動'} 筆數
+
+        檔案內容（SHA-256）和上次匯入相同時不讀檔，全部回傳 0（force=True 時照樣比對）；
+        valid_from：新成本的生效日（YYYY-MM-DD），預設今天，資料庫是空的時候為 BEGINNING
+        """
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(f"找不到成本表：{source_path}")
+        digest = file_digest(source_path)
+        if not force and digest == self.last_digest():
+            return {'新增': 0, '修改': 0, '移除': 0, '未變動': 0}
+
+        counts = self.import_frame(read_excel_cached(source_path), valid_from=valid_from)
+        log.info(f"   成本表匯入（{counts['valid_from']} 起生效）：新增 {counts['新增']}、修改 {counts['修改']}、"
+                 f"移除 {counts['移除']}、未變動 {counts['未變動']}")
+        self.conn.execute(
+            "INSERT INTO imports (source_path, digest, imported_at, valid_from, added, changed, removed, unchanged)"
+            " VALUES (?, ?, datetime('now', 'localtime'), ?, ?, ?, ?, ?)",
+            (os.path.abspath(source_path), digest, counts['valid_from'],
+             counts['新增'], counts['修改'], counts['移除'], counts['未變動'])
+        )
+        self.conn.commit()
+        return {key: counts[key] for key in ['新增', '修改', '移除', '未變動']}
+
+    def import_frame(self, cost, valid_from=None, product_col=None):
+        """成本表 DataFrame → 只寫入新增 / 有變動的產品，成本表沒有的產品結束生效"""
+        if valid_from is None:
+            valid_from = date.today().isoformat() if len(self) else BEGINNING
+        valid_from = pd.Timestamp(valid_from).date().isoformat()
+
+        rows = cost_rows(cost, product_col)
+        current = pd.read_sql_query(
+            "SELECT id, name_key, row_hash, source_row FROM cost_versions WHERE valid_to IS NULL", self.conn
+        )
+        merged = rows.merge(current, on='name_key', how='outer', suffixes=('', '_current'), indicator=True)
+
+        is_new = merged['_merge'] == 'left_only'
+        is_removed = merged['_merge'] == 'right_only'
+        both = merged['_merge'] == 'both'
+        is_changed = both & (merged['row_hash'] != merged['row_hash_current'])
+        # 內容沒變、只是在成本表裡換了位置（例如上面插入一行）：直接更新行號，不新增版本
+        is_moved = both & ~is_changed & (merged['source_row'] != merged['source_row_current'])
+
+        # 同一天重複匯入時直接改寫當天的版本，不留下長度為 0 的期間
+        closing = merged.loc[is_changed | is_removed, 'id'].astype('int64').tolist()
+        with self.conn:
+            self.conn.executemany(
+                "DELETE FROM cost_versions WHERE id = ? AND valid_from = ?", [(i, valid_from) for i in closing]
+            )
+            self.conn.executemany(
+                "UPDATE cost_versions SET valid_to = ? WHERE id = ?", [(valid_from, i) for i in closing]
+            )
+            moved = merged[is_moved]
+            self.conn.executemany(
+                "UPDATE cost_versions SET source_row = ? WHERE id = ?",
+                zip(moved['source_row'].astype('int64').tolist(), moved['id'].astype('int64').tolist())
+            )
+            inserts = merged[is_new | is_changed]
+            self.conn.executemany(
+                "INSERT INTO cost_versions (name_key, base_name_key, product_name, sku, sku_key, cost_cents,"
+                " source_row, row_hash, valid_from) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (row.name_key, row.base_name_key, row.product_name, _text(row.sku), _text(row.sku_key),
+                     None if pd.isna(row.cost_cents) else int(row.cost_cents), int(row.source_row), row.row_hash,
+                     valid_from)
+                    for row in inserts.itertuples(index=False)
+                ]
+            )
+        self._catalog.cache_clear()
+        return {
+            '新增': int(is_new.sum()),
+            '修改': int(is_changed.sum()),
+            '移除': int(is_removed.sum()),
+            '未變動': int((both & ~is_changed).sum()),
+            'valid_from': valid_from,
+        }
+
+    # === 查詢 ===
+
+    def version_starts(self):
+        """所有版本的生效日和結束日（排序），訂單日期依此分段；只有移除產品的匯入也會開始新的一段"""
+        rows = self.conn.execute(
+            "SELECT valid_from FROM cost_versions UNION"
+            " SELECT valid_to FROM cost_versions WHERE valid_to IS NOT NULL ORDER BY 1"
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def _build_catalog(self, as_of):
+        if as_of is None:
+            where, params = "valid_to IS NULL", ()
+        else:
+            where, params = "valid_from <= ? AND (valid_to IS NULL OR valid_to > ?)", (as_of, as_of)
+        versions = pd.read_sql_query(
+            f"SELECT product_name, sku, cost_cents FROM cost_versions WHERE {where} ORDER BY source_row",
+            self.conn, params=params
+        )
+        costs = from_cents(versions['cost_cents'].astype('float64'))
+        return CostCatalog(versions['product_name'].tolist(), versions['sku'].tolist(), costs.tolist())
+
+    def history(self, name_or_sku):
+        """一個產品（名稱或 Variant SKU）的所有成本版本"""
+        key = normalize_name(name_or_sku)
+        versions = pd.read_sql_query(
+            "SELECT product_name, sku, cost_cents, valid_from, valid_to FROM cost_versions"
+            " WHERE name_key = ? OR sku_key = ? ORDER BY valid_from",
+            self.conn, params=(key, key)
+        )
+        versions['cost'] = from_cents(versions.pop('cost_cents').astype('float64'))
+        return versions
+
+    def catalog(self, as_of=None):
+        """as_of（YYYY-MM-DD）當天有效的成本；None = 目前的成本"""
+        if as_of is not None:
+            as_of = pd.Timestamp(as_of).date().isoformat()
+        return self._catalog(as_of)
+
+    def lookup(self, product_names, skus=None, order_dates=None, fuzzy_threshold=None, base_name=False):
+        """和 CostCatalog.lookup 相同，但每一行用訂單日期當時有效的成本
+
+        order_dates 為 None 或日期無法判斷的行用目前的成本；
+        product_names、skus、order_dates 依位置對應（index 可以重複），結果的 index 和 product_names 相同
+        """
+        product_names = pd.Series(product_names)
+        if order_dates is None:
+            return self.catalog().lookup(product_names, skus=skus, fuzzy_threshold=fuzzy_threshold, base_name=base_name)
+
+        index = product_names.index
+        product_names = product_names.reset_index(drop=True)
+        days = pd.Series(order_dates).reset_index(drop=True).dt.strftime('%Y-%m-%d')
+        sku_series = pd.Series(skus).reset_index(drop=True) if skus is not None else None
+        starts = self.version_starts()
+        # 每一行屬於哪一個生效期間（期間內的成本都相同），同一期間只查一次；
+        # 沒有日期的行用最新的期間，和目前的成本相同，共用同一個 CostCatalog
+        period = pd.Series(np.searchsorted(starts, days.fillna('9999-12-31'), side='right') - 1)
+
+        parts = []
+        for position, rows in period.groupby(period, sort=False).groups.items():
+            as_of = starts[position] if position >= 0 else None
+            parts.append(self.catalog(as_of).lookup(
+                product_names.loc[rows],
+                skus=sku_series.loc[rows] if sku_series is not None else None,
+                fuzzy_threshold=fuzzy_threshold,
+                base_name=base_name,
+            ))
+        result = pd.concat(parts).sort_index()
+        result.index = index
+        return result
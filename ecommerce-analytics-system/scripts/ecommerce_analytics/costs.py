@@ -0,0 +1,147 @@
+# ============================================
+# 模組名稱：用產品名稱加入成本和 SKU
+# 功能：
+#   1. 用 Product Name 連接訂單表和成本表（Cost_with_ID_最終版.xlsx）
+#   2. 計算總成本、總售價、利潤、毛利率（計算版）
+#   3. 改成月度報表需要的 Profit 欄位（計算版-V2）
+#   4. 成本也可以來自成本表資料庫（cost_store.CostStore），依訂單日期取當時的成本
+# 說明：成本、售價、利潤都先換成整數分計算，輸出欄位仍為元
+# ============================================
+
+import pandas as pd
+
+from .catalog import APPROXIMATE_METHODS, CostCatalog
+from .money import from_cents, times_cents, to_cents
+from .schema import to_datetime
+
+ORDER_PRODUCT_COLS = ['Product Name', '產品名稱', 'Lineitem name', '商品名稱']
+COST_PRODUCT_COLS = ['Product_Name', '產品名稱', 'Product Name', '商品名稱']
+
+# 新欄位放在產品名稱旁邊
+COST_COLS = ['Variant SKU', '單位成本', '總成本', '總售價', '利潤', '毛利率']
+
+
+def find_column(df, candidates):
+    """回傳第一個存在於 df 的欄位名稱，都找不到就回傳 None"""
+    for col in candidates:
+        if col in df.columns:
+            return col
+    return None
+
+
+def join_product_costs(orders, cost, order_product_col=None, cost_product_col=None,
+                       fuzzy_threshold=None, order_date_col='Created at', base_name=False):
+    """把成本表的 Variant SKU 和 Cost 加到訂單表，並計算成本和利潤
+
+    cost：成本表 DataFrame，或 CostStore（用 order_date_col 的訂單日期取當時有效的成本）
+    fuzzy_threshold：設定時（例如 0.8），找不到的產品改用相似度達門檻的近似名稱
+    base_name：True 時找不到的產品改用去掉規格後綴的名稱（可能對到別的規格的成本）
+    回傳 (orders, match_stats)，match_stats 含 found_sku / found_cost / match_methods /
+    approximate_matches / missing_products / suggestions；
+    approximate_matches 為 {訂單產品名稱: (匹配方式, 成本表產品名稱)}，用去規格名稱或
+    近似名稱對到的產品，需要人工確認
+    """
+    order_product_col = order_product_col or find_column(orders, ORDER_PRODUCT_COLS)
+    if not order_product_col:
+        raise ValueError(f"訂單表找不到產品名稱欄位，需要以下欄位之一：{ORDER_PRODUCT_COLS}")
+
+    order_skus = orders['SKU'] if 'SKU' in orders.columns else None
+    if isinstance(cost, pd.DataFrame):
+        cost_product_col = cost_product_col or find_column(cost, COST_PRODUCT_COLS)
+        if not cost_product_col:
+            raise ValueError(f"成本表找不到產品名稱欄位，需要以下欄位之一：{COST_PRODUCT_COLS}")
+
+        for col in ['Variant SKU', 'Cost']:
+            if col not in cost.columns:
+                raise ValueError(f"成本表沒有『{col}』欄位")
+
+        # === 建立成本表索引：先用 SKU，再用標準化後的產品名稱 / 去規格名稱 ===
+        catalog = CostCatalog.from_frame(cost, cost_product_col)
+        matched = catalog.lookup(orders[order_product_col], skus=order_skus, fuzzy_threshold=fuzzy_threshold,
+                                 base_name=base_name)
+    else:
+        # === 成本表資料庫：每筆訂單用訂單日期當時有效的成本，建議名稱用目前的成本表 ===
+        order_dates = to_datetime(orders[order_date_col]) if order_date_col in orders.columns else None
+        catalog = cost.catalog()
+        matched = cost.lookup(orders[order_product_col], skus=order_skus, order_dates=order_dates,
+                              fuzzy_threshold=fuzzy_threshold, base_name=base_name)
+
+    orders = orders.copy()
+    orders['Variant SKU'] = matched['Variant SKU']
+    orders['單位成本'] = matched['單位成本']
+
+    missing_products = orders.loc[orders['單位成本'].isna(), order_product_col].dropna().unique()
+    approximate = pd.DataFrame({
+        'product': orders[order_product_col],
+        'method': matched['匹配方式'],
+        'matched_name': matched['對照名稱'],
+    })[matched['匹配方式'].isin(APPROXIMATE_METHODS)].drop_duplicates('product')
+    match_stats = {
+        'found_sku': int(orders['Variant SKU'].notna().sum()),
+        'found_cost': int(orders['單位成本'].notna().sum()),
+        'match_methods': matched['匹配方式'].value_counts().to_dict(),
+        'approximate_matches': dict(zip(approximate['product'], zip(approximate['method'], approximate['matched_name']))),
+        'missing_products': missing_products,
+        # 找不到成本的產品列出最接近的成本表名稱，方便人工確認
+        'suggestions': {product: catalog.suggest(product) for product in missing_products},
+    }
+
+    # 如果找不到，補空值
+    orders['Variant SKU'] = orders['Variant SKU'].fillna('')
+    orders['單位成本'] = orders['單位成本'].fillna(0)
+
+    # === 計算成本和利潤（Cost 欄位是商品單價）===
+    if 'Quantity' in orders.columns:
+        orders['Quantity'] = pd.to_numeric(orders['Quantity'], errors='coerce').fillna(0)
+    else:
+        orders['Quantity'] = 1
+
+    if 'Cost' in orders.columns:
+        orders['Cost'] = pd.to_numeric(orders['Cost'], errors='coerce').fillna(0)
+    else:
+        orders['Cost'] = 0
+
+    total_cost = times_cents(orders['Quantity'], to_cents(orders['單位成本']))
+    total_sales = times_cents(orders['Quantity'], to_cents(orders['Cost']))
+    profit = total_sales - total_cost
+    orders['總成本'] = from_cents(total_cost)
+    orders['總售價'] = from_cents(total_sales)
+    orders['利潤'] = from_cents(profit)
+    orders['毛利率'] = (profit / total_sales.where(total_sales != 0) * 100).round(1).fillna(0)
+
+    # === 調整欄位順序：把新欄位放在產品名稱旁邊 ===
+    new_order = []
+    for col in orders.columns:
+        if col in COST_COLS:
+            continue
+        new_order.append(col)
+        if col == order_product_col:
+            new_order.extend(COST_COLS)
+    orders = orders[new_order]
+
+    return orders, match_stats
+
+
+def add_profit_columns(orders):
+    """計算版 → 計算版-V2：改成月度報表使用的單價、成本、利潤欄位
+
+    Selling Price = 商品單價、Cost  (unit) = 單位成本、
+    Profit (unit) = 單件利潤、Total Cost / Total Profit = 總成本 / 總利潤、
+     Gross Profit Margin = 總利潤 / 總售價（小數）
+    """
+    orders = orders.rename(columns={
+        'Cost': 'Selling Price',
+        '單位成本': 'Cost  (unit)',
+        '總成本': 'Total Cost',
+        '利潤': 'Total Profit',
+    })
+
+    orders['Profit (unit)'] = from_cents(to_cents(orders['Selling Price']) - to_cents(orders['Cost  (unit)']))
+    total_sales = to_cents(orders['總售價'])
+    orders[' Gross Profit Margin'] = (to_cents(orders['Total Profit']) / total_sales).where(total_sales != 0, 0)
+
+    # Profit (unit) 放在 Cost  (unit) 旁邊，總售價 / 毛利率 已由新欄位取代
+    cols = [col for col in orders.columns if col not in ('Profit (unit)', '總售價', '毛利率')]
+    cost_idx = cols.index('Cost  (unit)')
+    cols = cols[:cost_idx + 1] + ['Profit (unit)'] + cols[cost_idx + 1:]
+    return orders[cols]
@@ -0,0 +1,176 @@
+# ============================================
+# 模組名稱：月度財務報表增量更新
+# 功能：
+#   1. 保存上次的明細、每筆訂單的彙總（訂單數、實際金額、折扣、總利潤）和每個工作表的雜湊
+#   2. 用 (渠道, 訂單編號) + 明細內容的雜湊找出新增 / 修改 / 刪除的訂單
+#   3. 只替換有變動的訂單，再由訂單彙總重算統計（不用重新彙總全部明細）
+#   4. 寫出報表時只換掉內容有變動的工作表（沒有變動的訂單明細原封不動）
+#   5. report_is_current：來源檔和設定（例如 amount_tolerance）都和上次相同時，不用讀檔
+# ============================================
+
+import hashlib
+import os
+
+import pandas as pd
+
+from .cache import file_digest
+from .channels import CHANNELS
+from .report import (
+    DETAIL_SORT,
+    ORDER_KEYS,
+    add_mismatch_sheet,
+    concat_orders,
+    order_aggregates,
+    replace_report_sheets,
+    report_sheets,
+    write_monthly_report,
+)
+from .schema import FINAL_COLS
+
+STATE_VERSION = 3  # 3：加上來源檔和設定的雜湊、每個工作表的雜湊
+LOW_32_BITS = 0xFFFFFFFF
+
+
+def order_digests(detail):
+    """每筆訂單的內容雜湊（明細行順序不影響結果）"""
+    row_hash = pd.util.hash_pandas_object(detail[FINAL_COLS], index=False).to_numpy()
+    keys = [detail[key] for key in ORDER_KEYS]
+    return pd.DataFrame({
+        '雜湊_低': (row_hash & LOW_32_BITS).astype('int64'),
+        '雜湊_高': (row_hash >> 32).astype('int64'),
+    }, index=detail.index).groupby(keys, sort=False, dropna=False, observed=True).sum()
+
+
+def inputs_digest(paths, settings=None):
+    """來源檔內容 + 影響報表內容的設定 → 雜湊；任何一個改變，報表就可能不同"""
+    digest = hashlib.sha256(repr(sorted((settings or {}).items())).encode('utf-8'))
+    for path in paths:
+        digest.update(file_digest(path).encode('ascii'))
+    return digest.hexdigest()
+
+
+def sheet_digest(sheet):
+    """工作表內容（欄名、index、值和順序）的雜湊"""
+    digest = hashlib.sha256(repr(list(sheet.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(sheet).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def load_state(state_path):
+    if not os.path.exists(state_path):
+        return None
+    state = pd.read_pickle(state_path)
+    if state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+
+def save_state(state_path, detail, orders, sheets=None, inputs=None):
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
+    pd.to_pickle({
+        'version': STATE_VERSION,
+        'detail': detail,
+        'orders': orders,
+        'sheets': sheets or {},
+        'inputs': inputs,
+    }, tmp_path)
+    os.replace(tmp_path, state_path)
+
+
+def report_is_current(state_path, output_path, paths, settings=None):
+    """報表還在，且來源檔和設定都和上次寫出報表時相同 → 可以直接沿用，不用讀檔和標準化"""
+    if not os.path.exists(output_path):
+        return False
+    state = load_state(state_path)
+    return state is not None and state['inputs'] == inputs_digest(paths, settings)
+
+
+def _split_channels(detail):
+    shopify_final = detail[detail['渠道'] == 'Shopify'].sort_values(DETAIL_SORT)
+    pinkoi_final = detail[detail['渠道'] == 'Pinkoi'].sort_values(DETAIL_SORT)
+    return shopify_final, pinkoi_final
+
+
+def _write_report(sheets, output_path, changed):
+    """只換掉 changed 這幾個工作表，不能只換時整本重寫；回傳寫出的工作表"""
+    if not changed:
+        return []
+    if len(changed) < len(sheets) and replace_report_sheets(sheets, output_path, changed):
+        return changed
+    write_monthly_report(sheets, output_path)
+    return list(sheets)
+
+
+def update_monthly_report(shopify_std, pinkoi_std, state_path, output_path=None, mismatches=None,
+                          inputs=None, settings=None):
+    """和 build_monthly_report 結果相同，但只處理和上次相比有變動的訂單
+
+    output_path：有設定時一併寫出報表，只換掉內容有變動的工作表，都沒變動就不寫；
+        寫完才更新 state，寫檔失敗時下次執行仍會重寫
+    mismatches：check_pinkoi_amounts 的結果，有不一致時加成最後一個工作表
+    inputs / settings：來源檔路徑和影響報表內容的設定，記在 state 給 report_is_current 比對
+    回傳 (sheets, totals, delta)，delta = {'新增': n, '修改': n, '刪除': n, '寫出': [工作表]}；
+    沒有 state 檔時等於全部重建
+    """
+    detail = concat_orders([shopify_std[FINAL_COLS], pinkoi_std[FINAL_COLS]])
+    digests = order_digests(detail)
+
+    state = load_state(state_path)
+    if state is None:
+        new_detail = detail
+        new_orders = order_aggregates(detail).join(digests, on=ORDER_KEYS)
+        delta = {'新增': len(new_orders), '修改': 0, '刪除': 0}
+        changed_channels = CHANNELS
+    else:
+        old_orders = state['orders'].set_index(ORDER_KEYS)
+        old_digests = old_orders[['雜湊_低', '雜湊_高']]
+
+        # === 比對新舊訂單 ===
+        compared = digests.join(old_digests, rsuffix='_舊', how='left')
+        is_new = compared['雜湊_低_舊'].isna()
+        is_changed = ~is_new & (
+            (compared['雜湊_低'] != compared['雜湊_低_舊']) | (compared['雜湊_高'] != compared['雜湊_高_舊'])
+        )
+        removed = old_digests.index.difference(digests.index)
+        touched = compared.index[is_new | is_changed]
+        stale = touched.union(removed)
+
+        delta = {'新增': int(is_new.sum()), '修改': int(is_changed.sum()), '刪除': len(removed)}
+        changed_channels = list(stale.get_level_values('渠道').unique())
+        new_detail, new_orders = state['detail'], state['orders']
+
+        # === 只替換有變動的訂單 ===
+        if len(stale) > 0:
+            keep_rows = ~pd.MultiIndex.from_frame(new_detail[ORDER_KEYS]).isin(stale)
+            changed_detail = detail[pd.MultiIndex.from_frame(detail[ORDER_KEYS]).isin(touched)]
+            new_detail = concat_orders([new_detail[keep_rows], changed_detail])
+            new_orders = pd.concat([
+                new_orders[~old_orders.index.isin(stale)],
+                order_aggregates(changed_detail).join(digests, on=ORDER_KEYS),
+            ], ignore_index=True, sort=False)
+
+    sheets, totals = report_sheets(new_orders, *_split_channels(new_detail))
+    if mismatches is not None:
+        add_mismatch_sheet(sheets, mismatches)
+
+    # 明細工作表依訂單比對結果判斷，其他（統計、金額不一致）都很小，直接比內容雜湊
+    detail_sheets = {f"{channel}訂單明細": channel for channel in CHANNELS}
+    sheet_digests = {name: sheet_digest(sheet) for name, sheet in sheets.items() if name not in detail_sheets}
+    old_sheets = state['sheets'] if state is not None else {}
+    changed = [
+        name for name in sheets
+        if (detail_sheets[name] in changed_channels if name in detail_sheets else sheet_digests[name] != old_sheets.get(name))
+    ]
+
+    written_inputs = None
+    delta['寫出'] = []
+    if output_path is not None:
+        # 報表不在、或多了 / 少了工作表（例如金額不一致的明細）時整本重寫
+        if not os.path.exists(output_path) or list(old_sheets) != list(sheet_digests):
+            changed = list(sheets)
+        delta['寫出'] = _write_report(sheets, output_path, changed)
+        written_inputs = inputs_digest(inputs, settings) if inputs else None
+
+    if state is None or changed or written_inputs != state['inputs']:
+        save_state(state_path, new_detail, new_orders, sheet_digests, written_inputs)
+    return sheets, totals, delta
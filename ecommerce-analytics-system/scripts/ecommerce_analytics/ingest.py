@@ -0,0 +1,80 @@
+# ============================================
+# 模組名稱：Shopify 後台 CSV 分批讀取
+# 功能：
+#   1. 多年份的 Shopify CSV 匯出分批（chunk）讀取，記憶體用量固定
+#   2. 每批套用欄位改名、電話合併、數值欄位轉換
+#   3. 依 Created at 月份寫到 {YYYYMM}-Shopify-Orders.csv（每月一個分區）
+#   4. 只讀各階段用到的欄位（columns.py），其他欄位不會讀進記憶體
+# ============================================
+
+import os
+
+import pandas as pd
+
+from .cleaning import RENAME_MAP, merge_phone_columns
+from .columns import shopify_read_options
+from .logs import ProgressReporter, get_logger
+
+log = get_logger('ingest')
+
+CHUNK_SIZE = 100_000
+
+# 改名後要轉成數字的欄位，其他欄位一律讀成文字（避免每批推斷出不同型別）
+CSV_NUMERIC_COLS = ['Quantity', 'Cost', 'Total', 'Discount Amount', 'Subtotal', 'Shipping', 'Taxes']
+
+PARTITION_NAME = '{month}-Shopify-Orders.csv'
+UNKNOWN_MONTH = 'unknown'
+
+
+def order_months(created_at):
+    """Created at（例如 2026-01-30 18:40:52 +0800）→ 'YYYYMM'，無法解析時為 'unknown'"""
+    # 直接取字串前 7 碼，避免時區字串讓 to_datetime 逐行解析
+    text = created_at.astype('string').str.strip().str[:7]
+    valid = text.str.fullmatch(r'\d{4}-\d{2}', na=False)
+    return text.str.replace('-', '', regex=False).where(valid, UNKNOWN_MONTH)
+
+
+def clean_chunk(chunk):
+    """一批原始 CSV → 改名、合併電話、數值欄位轉換"""
+    chunk = chunk.rename(columns=RENAME_MAP)
+    chunk = merge_phone_columns(chunk)
+    for col in CSV_NUMERIC_COLS:
+        if col in chunk.columns:
+            chunk[col] = pd.to_numeric(chunk[col], errors='coerce').fillna(0)
+    return chunk
+
+
+def stream_shopify_csv(csv_path, output_dir, chunksize=CHUNK_SIZE, columns=None):
+    """分批讀取 Shopify CSV，依月份寫出分區檔
+
+    columns：要讀的原始欄位，預設為 shopify_columns()（各階段用到的欄位 + 整理版保留的欄位）
+    回傳 {月份: 行數}；本次有寫到的月份會覆蓋舊的分區檔
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    row_counts = {}
+
+    reader = pd.read_csv(csv_path, chunksize=chunksize, keep_default_na=True, encoding='utf-8-sig',
+                         **shopify_read_options('csv', columns))
+    progress = ProgressReporter(label='讀取 CSV', unit='行', logger=log)
+    for chunk in reader:
+        chunk = clean_chunk(chunk)
+        months = order_months(chunk['Created at']) if 'Created at' in chunk.columns \
+            else pd.Series(UNKNOWN_MONTH, index=chunk.index)
+
+        for month, part in chunk.groupby(months, sort=False):
+            partition_path = os.path.join(output_dir, PARTITION_NAME.format(month=month))
+            first_write = month not in row_counts
+            part.to_csv(partition_path, index=False, mode='w' if first_write else 'a',
+                        header=first_write, encoding='utf-8')
+            row_counts[month] = row_counts.get(month, 0) + len(part)
+        progress.update(len(chunk))
+
+    progress.close()
+    return row_counts
+
+
+def read_shopify_partition(path):
+    """讀回一個月份的分區檔（文字欄位保持文字，電話不會掉開頭的 0）"""
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {col: (float if col in CSV_NUMERIC_COLS else str) for col in header}
+    return pd.read_csv(path, dtype=dtypes, encoding='utf-8')
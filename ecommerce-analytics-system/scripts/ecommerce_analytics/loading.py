@@ -0,0 +1,59 @@
+# ============================================
+# 模組名稱：Shopify / Pinkoi 同時讀取和標準化
+# 功能：
+#   1. load_channel：一個渠道讀檔（cache.read_excel_cached，同一個檔案第二次起讀快取）
+#      + 標準化，記錄兩個階段的耗時
+#   2. load_channels：各渠道在自己的 process 中同時執行，全部完成才回傳，
+#      月度報表的等待時間接近較慢的那個渠道，而不是兩者相加
+# 說明：讀 xlsx 和標準化都是 CPU 密集，用 process 而不是 thread；
+#       在 Windows 上呼叫的腳本需要 if __name__ == '__main__' 保護
+# ============================================
+
+from concurrent.futures import ProcessPoolExecutor
+
+from .cache import read_excel_cached
+from .channels import standardize_pinkoi, standardize_shopify
+from .logs import get_logger
+from .timing import StageTimer
+
+log = get_logger('loading')
+
+# 渠道 → (標準化, 讀檔階段名稱, 標準化階段名稱)；階段名稱和 02_monthly_report.py 相同
+CHANNEL_STEPS = {
+    'Shopify': (standardize_shopify, '3. 讀取 Shopify 訂單表', '4. 標準化 Shopify 欄位'),
+    'Pinkoi': (standardize_pinkoi, '3. 讀取 Pinkoi 訂單表', '5. 標準化 Pinkoi 欄位'),
+}
+
+
+def load_channel(channel, path):
+    """讀取並標準化一個渠道，回傳 (標準化明細, 原始檔 (行數, 欄數), 各階段紀錄)"""
+    standardize, read_stage, standardize_stage = CHANNEL_STEPS[channel]
+    timer = StageTimer(channel)
+    with timer.stage(read_stage) as record:
+        raw = read_excel_cached(path)
+        record['rows'] = len(raw)
+    with timer.stage(standardize_stage, rows=len(raw)):
+        std = standardize(raw)
+    return std, raw.shape, timer.stages
+
+
+def load_channels(paths, workers=None, timer=None):
+    """{渠道: 檔案路徑} → {渠道: 標準化明細}
+
+    workers：process 數量，預設為渠道數；1 = 依序執行（方便除錯）
+    timer：StageTimer，各渠道的階段紀錄（在子 process 中量的）依渠道順序加進去
+    """
+    if workers == 1:
+        results = {channel: load_channel(channel, path) for channel, path in paths.items()}
+    else:
+        with ProcessPoolExecutor(max_workers=workers or len(paths)) as pool:
+            futures = {channel: pool.submit(load_channel, channel, path) for channel, path in paths.items()}
+            results = {channel: future.result() for channel, future in futures.items()}
+
+    frames = {}
+    for channel, (std, (n_rows, n_cols), stages) in results.items():
+        log.info(f"✅ {channel}：{n_rows} 行，{n_cols} 欄")
+        if timer is not None:
+            timer.stages.extend(stages)
+        frames[channel] = std
+    return frames
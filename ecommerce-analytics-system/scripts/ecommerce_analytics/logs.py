@@ -0,0 +1,123 @@
+# ============================================
+# 模組名稱：訊息輸出（logging）和進度顯示
+# 功能：
+#   1. setup_logging：設定輸出等級，取代程式裡直接 print
+#      DEBUG   = 另外列出每一步的欄位清單和前幾筆資料
+#      INFO    = 平常手動執行看到的步驟訊息（預設）
+#      WARNING = 排程 / 批次執行，只輸出警告和錯誤
+#   2. log_columns：欄位清單只在 DEBUG 時組字串、輸出
+#   3. ProgressReporter：迴圈進度依時間節流，最多每 interval 秒輸出一次
+# 說明：等級可用環境變數 ECOMMERCE_LOG_LEVEL 設定，不用改程式
+# ============================================
+
+import logging
+import os
+import sys
+import time
+
+LOGGER_NAME = 'ecommerce_analytics'
+LEVEL_ENV = 'ECOMMERCE_LOG_LEVEL'
+DEFAULT_LEVEL = 'INFO'
+LEVEL_ALIASES = {'QUIET': 'WARNING', 'VERBOSE': 'DEBUG'}
+FILE_FORMAT = '%(asctime)s %(levelname)-7s %(name)s  %(message)s'
+
+
+def resolve_level(level=None):
+    """'info' / 'QUIET' / logging.INFO / None（環境變數或預設）→ logging 的等級數字"""
+    if level is None:
+        level = os.environ.get(LEVEL_ENV) or DEFAULT_LEVEL
+    if isinstance(level, int):
+        return level
+    name = LEVEL_ALIASES.get(str(level).upper(), str(level).upper())
+    value = logging.getLevelName(name)
+    if not isinstance(value, int):
+        raise ValueError(f"不支援的訊息等級：{level}（可用 DEBUG / INFO / WARNING / ERROR / QUIET）")
+    return value
+
+
+def setup_logging(level=None, log_file=None, name=LOGGER_NAME):
+    """設定並回傳 logger；Jupyter 重複執行同一格時會先移除舊的 handler
+
+    螢幕只印訊息本身（和原本 print 的樣子一樣）；log_file 另外記錄時間和等級
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(resolve_level(level))
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    # 一般訊息到 stdout，錯誤到 stderr（Jupyter 會用紅色顯示）
+    console = logging.StreamHandler(sys.stdout)
+    console.addFilter(lambda record: record.levelno < logging.ERROR)
+    errors = logging.StreamHandler(sys.stderr)
+    errors.setLevel(logging.ERROR)
+    for handler in (console, errors):
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter(FILE_FORMAT))
+        logger.addHandler(file_handler)
+    return logger
+
+
+def get_logger(name=None):
+    """套件內模組用的 logger（ecommerce_analytics.xxx），沿用 setup_logging 的設定"""
+    return logging.getLogger(f"{LOGGER_NAME}.{name}" if name else LOGGER_NAME)
+
+
+def log_columns(logger, title, columns, level=logging.DEBUG):
+    """欄位清單（  1. 'Order No'）一次輸出；等級沒開時不組字串"""
+    if not logger.isEnabledFor(level):
+        return
+    lines = [title] + [f"  {i + 1:2d}. '{col}'" for i, col in enumerate(columns)]
+    logger.log(level, '\n'.join(lines))
+
+
+class ProgressReporter:
+    """迴圈進度：update() 只累加數字，距離上次輸出超過 interval 秒才輸出一行
+
+    with ProgressReporter(total, '分攤訂單', logger=log) as progress:
+        for ...:
+            progress.update()
+    """
+
+    def __init__(self, total=None, label='處理中', unit='筆', interval=1.0, logger=None, level=logging.INFO):
+        self.total = total
+        self.label = label
+        self.unit = unit
+        self.interval = interval
+        self.logger = logger or get_logger()
+        self.level = level
+        self.count = 0
+        self._start = time.monotonic()
+        self._last = self._start
+        self._enabled = self.logger.isEnabledFor(level)
+
+    def update(self, n=1):
+        self.count += n
+        if not self._enabled:
+            return
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            self.logger.log(self.level, self._message(now))
+
+    def close(self):
+        if self._enabled:
+            self.logger.log(self.level, self._message(time.monotonic()) + ' ✅')
+
+    def _message(self, now):
+        done = f"{self.count:,}/{self.total:,}" if self.total else f"{self.count:,}"
+        percent = f" ({self.count / self.total:.0%})" if self.total else ''
+        return f"   {self.label}：{done} {self.unit}{percent}，{now - self._start:.1f} 秒"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
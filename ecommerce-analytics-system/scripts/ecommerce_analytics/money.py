@@ -0,0 +1,42 @@
+# ============================================
+# 模組名稱：金額以整數「分」計算
+# 功能：
+#   1. to_cents：文字 / 小數金額 → int64 分（四捨五入到分）
+#   2. from_cents：分 → 元（寫檔、顯示時才轉回小數）
+#   3. times_cents：數量 × 單價分，結果四捨五入成整數分
+#   4. prefer_positive：逐欄選金額（大於 0 用第一個，否則用第二個），取代逐行 apply
+# 說明：加總、分攤、比對都用整數，不會有 0.1 + 0.2 ≠ 0.3 的誤差
+# ============================================
+
+import numpy as np
+import pandas as pd
+
+CENTS = 100
+
+
+def to_cents(values):
+    """金額 → 整數分；Series 無法轉成數字的值當作 0"""
+    if isinstance(values, pd.Series):
+        amounts = pd.to_numeric(values, errors='coerce').fillna(0)
+        return (amounts * CENTS).round().astype('int64')
+    return int(np.round(float(values) * CENTS))
+
+
+def from_cents(cents):
+    """整數分 → 元（float）"""
+    if isinstance(cents, pd.Series):
+        return cents.astype('float64') / CENTS
+    return cents / CENTS
+
+
+def times_cents(quantity, cents):
+    """數量（可能是小數）× 整數分 → 整數分"""
+    result = np.rint(np.asarray(quantity, dtype=np.float64) * np.asarray(cents, dtype=np.int64)).astype(np.int64)
+    if isinstance(cents, pd.Series):
+        return pd.Series(result, index=cents.index)
+    return result
+
+
+def prefer_positive(preferred, fallback):
+    """preferred 大於 0 的行用 preferred，其他用 fallback（兩欄 index 相同）"""
+    return preferred.where(preferred > 0, fallback)
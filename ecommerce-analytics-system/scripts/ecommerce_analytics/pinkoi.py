@@ -0,0 +1,181 @@
+# ============================================
+# 模組名稱：Pinkoi 年度訂單統計（Pinkoi_2025統計.xlsx）
+# 功能：
+#   1. 讀取「{年份}訂單明細」工作表，找出買家、總金額、小計、折抵、運費欄位
+#   2. 計算訂單概況、金額、佔比、極值、折抵、運費統計；
+#      統計表可用買家人次（預設）或不重複買家人數（一次性 / 重複購買買家）列出訂單概況
+#   3. 只替換「{年份}統計」工作表，其他工作表保留（不重寫訂單明細，見 workbook.py）
+# 說明：買家數量 = 總訂單數（人次），不重複買家人數僅供參考
+# ============================================
+
+import pandas as pd
+
+from .channels import match_columns, to_numbers
+from .readers import read_excel
+from .workbook import sheet_names, write_sheet
+
+DETAIL_SHEET = '{year}訂單明細'
+STATS_SHEET = '{year}統計'
+
+BUYER_COLS = ['買家', '買家名字', '買家姓名', '客戶名稱', '客戶姓名', '姓名', 'Billing Name', '收件人']
+TOTAL_COLS = ['總金額', '訂單總額', '總計', 'Total', '訂單金額']
+SUBTOTAL_COLS = ['小計', '商品金額', 'Subtotal', '商品總額']
+DISCOUNT_COLS = ['折抵', '折扣', '優惠', 'Discount', '折抵金額']
+SHIPPING_COLS = ['運費', 'Shipping', '運費金額']
+
+PINKOI_FIELDS = {
+    'buyer': BUYER_COLS,
+    'total': TOTAL_COLS,
+    'subtotal': SUBTOTAL_COLS,
+    'discount': DISCOUNT_COLS,
+    'shipping': SHIPPING_COLS,
+}
+AMOUNT_KEYS = ['total', 'subtotal', 'discount', 'shipping']
+
+
+def find_pinkoi_columns(df):
+    """{'buyer', 'total', 'subtotal', 'discount', 'shipping'} → 欄位名稱，找不到為 None"""
+    return match_columns(df.columns, PINKOI_FIELDS)
+
+
+def read_pinkoi_orders(file_path, year):
+    """讀取年度統計檔的訂單明細工作表
+
+    工作表清單直接由 workbook.xml 取得，只有訂單明細工作表會被解析（一次）
+    """
+    sheet_name = DETAIL_SHEET.format(year=year)
+    names = sheet_names(file_path)
+    if sheet_name not in names:
+        raise ValueError(f"找不到『{sheet_name}』工作表，現有工作表：{names}")
+    return read_excel(file_path, sheet_name=sheet_name)
+
+
+def pinkoi_statistics(df, columns=None):
+    """訂單明細 → 統計數值 dict（columns 預設由 find_pinkoi_columns 找）"""
+    columns = columns or find_pinkoi_columns(df)
+
+    # 找得到的金額欄一次轉成數字，找不到的為 None
+    found = [key for key in AMOUNT_KEYS if columns[key] is not None]
+    numbers = to_numbers(df[[columns[key] for key in found]].set_axis(found, axis=1))
+    total, subtotal, discount, shipping = (numbers[key] if key in found else None for key in AMOUNT_KEYS)
+
+    total_orders = len(df)
+    unique_buyers = df[columns['buyer']].dropna().nunique() if columns['buyer'] else total_orders
+
+    total_amount = total.sum() if total is not None else 0
+    total_subtotal = subtotal.sum() if subtotal is not None else 0
+    total_discount = discount.sum() if discount is not None else 0
+    total_shipping = shipping.sum() if shipping is not None else 0
+
+    def share(value):
+        return (value / total_amount * 100) if total_amount > 0 else 0
+
+    def order_share(count):
+        return (count / total_orders * 100) if total_orders > 0 else 0
+
+    discount_orders = int((discount > 0).sum()) if discount is not None else 0
+    shipping_orders = int((shipping > 0).sum()) if shipping is not None else 0
+
+    if columns['buyer'] and unique_buyers > 0:
+        repeat_rate = (total_orders - unique_buyers) / total_orders * 100 if total_orders > 0 else 0
+        avg_orders_per_buyer = total_orders / unique_buyers
+    else:
+        repeat_rate = 0
+        avg_orders_per_buyer = 1
+
+    # 下單超過一次的買家人數
+    buyer_orders = df[columns['buyer']].value_counts() if columns['buyer'] else pd.Series(dtype='int64')
+    repeat_buyers = int((buyer_orders > 1).sum())
+
+    return {
+        'total_orders': total_orders,
+        'buyer_count': total_orders,  # 每一筆訂單算一個買家（人次）
+        'unique_buyers': unique_buyers,
+        'avg_orders_per_buyer': avg_orders_per_buyer,
+        'repeat_rate': repeat_rate,
+        'one_time_buyers': unique_buyers - repeat_buyers,
+        'repeat_buyers': repeat_buyers,
+        'repeat_buyer_rate': repeat_buyers / unique_buyers * 100 if unique_buyers > 0 else 0,
+        'avg_order_value': total_amount / total_orders if total_orders > 0 else 0,
+        'avg_per_unique_buyer': total_amount / unique_buyers if unique_buyers > 0 else 0,
+        'total_amount': total_amount,
+        'total_subtotal': total_subtotal,
+        'total_discount': total_discount,
+        'total_shipping': total_shipping,
+        'subtotal_percentage': share(total_subtotal),
+        'discount_percentage': share(total_discount),
+        'shipping_percentage': share(total_shipping),
+        'max_amount': total.max() if total is not None else 0,
+        'min_amount': total.min() if total is not None else 0,
+        'discount_orders': discount_orders,
+        'discount_order_percentage': order_share(discount_orders),
+        'shipping_orders': shipping_orders,
+        'shipping_order_percentage': order_share(shipping_orders),
+    }
+
+
+def pinkoi_stats_table(stats, unique_buyers=False):
+    """統計數值 → 統計工作表（統計項目 / 數值）
+
+    unique_buyers=True 時訂單概況用不重複買家人數，另外列出一次性 / 重複購買買家，
+    重複購買率 = 重複購買買家 / 不重複買家
+    """
+    if unique_buyers:
+        overview = [
+            ('總訂單數 (筆)', f"{stats['total_orders']:,} 筆"),
+            ('買家數量 (不重複人數)', f"{stats['unique_buyers']:,} 人"),
+            ('一次性買家人數', f"{stats['one_time_buyers']:,} 人"),
+            ('重複購買買家人數', f"{stats['repeat_buyers']:,} 人"),
+            ('重複購買率', f"{stats['repeat_buyer_rate']:.2f}%"),
+            ('平均每人下單次數', f"{stats['avg_orders_per_buyer']:.2f} 次"),
+            ('平均客單價', f"${stats['avg_order_value']:,.2f}"),
+            ('平均每買家貢獻', f"${stats['avg_per_unique_buyer']:,.2f}"),
+        ]
+    else:
+        overview = [
+            ('總訂單數 (筆)', f"{stats['total_orders']:,} 筆"),
+            ('買家數量 (人次)', f"{stats['buyer_count']:,} 人次"),
+            ('不重複買家人數', f"{stats['unique_buyers']:,} 人"),
+            ('平均每人下單次數', f"{stats['avg_orders_per_buyer']:.2f} 次"),
+            ('重複購買率', f"{stats['repeat_rate']:.2f}%"),
+            ('平均客單價', f"${stats['avg_order_value']:,.2f}"),
+            ('平均每不重複買家貢獻', f"${stats['avg_per_unique_buyer']:,.2f}"),
+        ]
+
+    sections = [
+        ('📦 訂單概況', overview),
+        ('💰 金額分析', [
+            ('總金額', f"${stats['total_amount']:,.2f}"),
+            ('總小計 (商品金額)', f"${stats['total_subtotal']:,.2f}"),
+            ('總折抵 (折扣/優惠)', f"${stats['total_discount']:,.2f}"),
+            ('總運費', f"${stats['total_shipping']:,.2f}"),
+        ]),
+        ('📊 佔比分析', [
+            ('小計佔總金額比例', f"{stats['subtotal_percentage']:.2f}%"),
+            ('折抵佔總金額比例', f"{stats['discount_percentage']:.2f}%"),
+            ('運費佔總金額比例', f"{stats['shipping_percentage']:.2f}%"),
+        ]),
+        ('📈 極值分析', [
+            ('最高單筆金額', f"${stats['max_amount']:,.2f}"),
+            ('最低單筆金額', f"${stats['min_amount']:,.2f}"),
+        ]),
+        ('🏷️ 折抵分析', [
+            ('有折抵的訂單數', f"{stats['discount_orders']:,} 筆"),
+            ('折抵訂單佔比', f"{stats['discount_order_percentage']:.2f}%"),
+        ]),
+        ('🚚 運費分析', [
+            ('有運費的訂單數', f"{stats['shipping_orders']:,} 筆"),
+            ('運費訂單佔比', f"{stats['shipping_order_percentage']:.2f}%"),
+        ]),
+    ]
+
+    # 每個區塊：標題行 + 各項目，區塊之間空一行
+    rows = []
+    for title, items in sections:
+        rows += ([('', '')] if rows else []) + [(title, '')] + items
+    return pd.DataFrame(rows, columns=['統計項目', '數值'])
+
+
+def write_stats_sheet(file_path, stats_df, year):
+    """只替換統計工作表，訂單明細等其他工作表原樣保留（不重新解析、不重寫）"""
+    write_sheet(file_path, STATS_SHEET.format(year=year), stats_df)
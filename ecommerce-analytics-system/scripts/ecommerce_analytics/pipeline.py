@@ -0,0 +1,146 @@
+# ============================================
+# 模組名稱：月度報表單一流程（全部在記憶體中完成）
+# 流程：
+#   1. 整理版    - 欄位改名、合併電話、加入 Index
+#   2. 計算版    - 用產品名稱加入成本和 SKU
+#   3. 計算版-V2 - Profit (unit) / Total Cost / Total Profit
+#   4. 計算版-V3 - 分攤 Total 和 Discount Amount
+#   5. 月度財務報表
+# 說明：中間的 xlsx 只在指定 checkpoints 時才寫出，不再每一步存檔再讀回
+# ============================================
+
+import os
+
+from .allocation import allocate_order_amounts, arrange_allocation_columns
+from .cache import read_excel_cached
+from .channels import standardize_pinkoi, standardize_shopify
+from .cleaning import clean_shopify_orders
+from .columns import shopify_columns
+from .cost_store import CostStore
+from .costs import add_profit_columns, join_product_costs
+from .ingest import PARTITION_NAME, read_shopify_partition
+from .report import add_mismatch_sheet, build_monthly_report, check_pinkoi_amounts
+from .timing import StageTimer
+
+# 各階段對應原本的中間檔名
+CHECKPOINT_FILES = {
+    '整理版': '{month}-Shopify-Orders_整理版.xlsx',
+    '計算版': 'Shopify-Orders_計算版.xlsx',
+    '計算版-V2': 'Shopify-Orders_計算版-V2.xlsx',
+    '計算版-V3': 'Shopify-Orders_計算版-V3.xlsx',
+}
+
+
+def input_paths(folder_path, month):
+    """原本各腳本讀取的三個來源檔"""
+    return {
+        'shopify': os.path.join(folder_path, f'{month}-Shopify-Orders.xlsx'),
+        'cost': os.path.join(folder_path, 'Cost_with_ID_最終版.xlsx'),
+        'pinkoi': os.path.join(folder_path, f'{month}-Pinkoi_orders.xlsx'),
+    }
+
+
+def load_month_inputs(folder_path, month, cost_db=None):
+    """讀取一個月份資料夾的 Shopify、成本表、Pinkoi 來源檔（各讀一次）
+
+    沒有 Shopify xlsx 時，改讀 stream_shopify_csv 產生的 {month}-Shopify-Orders.csv 分區；
+    Shopify xlsx 只讀 shopify_columns() 列出的欄位
+    cost_db：成本表資料庫路徑；有給時成本表 xlsx 有變動才匯入，inputs['cost'] 為 CostStore，
+    資料夾沒有成本表時直接用資料庫裡的成本
+    """
+    paths = input_paths(folder_path, month)
+    partition_path = os.path.join(folder_path, PARTITION_NAME.format(month=month))
+    if not os.path.exists(paths['shopify']) and os.path.exists(partition_path):
+        paths['shopify'] = partition_path
+
+    store = None
+    if cost_db:
+        store = CostStore(cost_db)
+        cost_path = paths.pop('cost')
+        if os.path.exists(cost_path):
+            store.import_spreadsheet(cost_path)
+        elif not len(store):
+            paths['cost'] = cost_path
+
+    missing = [path for path in paths.values() if not os.path.exists(path)]
+    if missing:
+        raise FileNotFoundError(f"找不到檔案：{missing}")
+    inputs = {}
+    for name, path in paths.items():
+        if path.endswith('.csv'):
+            inputs[name] = read_shopify_partition(path)
+        else:
+            inputs[name] = read_excel_cached(path, columns=shopify_columns() if name == 'shopify' else None)
+    if store is not None:
+        inputs['cost'] = store
+    return inputs
+
+
+def run_shopify_stages(shopify, cost, checkpoint_dir=None, checkpoints=(), month='', timer=None):
+    """Shopify 後台匯出 → 計算版-V3，回傳 (df, info)
+
+    checkpoints：要另外存檔的階段名稱（見 CHECKPOINT_FILES），預設都不存
+    info：match_stats（成本對照結果）和 problem_orders（分攤有問題的訂單）
+    timer：StageTimer，有給時記錄每個階段的耗時
+    """
+    unknown = set(checkpoints) - set(CHECKPOINT_FILES)
+    if unknown:
+        raise ValueError(f"未知的 checkpoint：{sorted(unknown)}")
+    if checkpoints and not checkpoint_dir:
+        raise ValueError("指定 checkpoints 時需要 checkpoint_dir")
+
+    timer = timer or StageTimer()
+
+    def checkpoint(stage, df):
+        if stage in checkpoints:
+            with timer.stage(f'存中間檔 {stage}', rows=len(df)):
+                df.to_excel(os.path.join(checkpoint_dir, CHECKPOINT_FILES[stage].format(month=month)), index=False)
+
+    with timer.stage('整理版（改名、電話、Index）', rows=len(shopify)):
+        df = clean_shopify_orders(shopify)
+    checkpoint('整理版', df)
+
+    with timer.stage('計算版（成本、SKU）', rows=len(df)):
+        df, match_stats = join_product_costs(df, cost)
+    checkpoint('計算版', df)
+
+    with timer.stage('計算版-V2（利潤）', rows=len(df)):
+        df = add_profit_columns(df)
+    checkpoint('計算版-V2', df)
+
+    with timer.stage('計算版-V3（分攤）', rows=len(df)):
+        df, problem_orders = allocate_order_amounts(df)
+        df = arrange_allocation_columns(df)
+    checkpoint('計算版-V3', df)
+
+    return df, {'match_stats': match_stats, 'problem_orders': problem_orders}
+
+
+def run_monthly_pipeline(shopify, cost, pinkoi, checkpoint_dir=None, checkpoints=(), month='', timer=None,
+                         warehouse=None):
+    """Shopify 後台匯出 + 成本表 + Pinkoi 後台匯出 → 月度財務報表工作表
+
+    回傳 (sheets, totals, info)，sheets 可直接交給 write_monthly_report；
+    Pinkoi 金額不一致的明細在 info['amount_mismatches']（同時加到 sheets）
+    warehouse：OrderWarehouse，有給時把這個月份的標準化明細寫入（需要 month）
+    """
+    if warehouse is not None and not month:
+        raise ValueError("寫入訂單倉庫時需要 month（YYYYMM）")
+    timer = timer or StageTimer()
+    shopify_v3, info = run_shopify_stages(
+        shopify, cost, checkpoint_dir=checkpoint_dir, checkpoints=checkpoints, month=month, timer=timer
+    )
+    with timer.stage('標準化欄位', rows=len(shopify_v3) + len(pinkoi)):
+        shopify_std = standardize_shopify(shopify_v3)
+        pinkoi_std = standardize_pinkoi(pinkoi)
+
+    with timer.stage('Pinkoi 金額驗證', rows=len(pinkoi_std)):
+        info['amount_mismatches'] = check_pinkoi_amounts(pinkoi_std)
+
+    with timer.stage('月度統計', rows=len(shopify_std) + len(pinkoi_std)):
+        sheets, totals = build_monthly_report(shopify_std, pinkoi_std)
+
+    if warehouse is not None:
+        with timer.stage('寫入訂單倉庫', rows=len(shopify_std) + len(pinkoi_std)):
+            info['warehouse_rows'] = warehouse.append_month(month, [shopify_std, pinkoi_std])
+    return add_mismatch_sheet(sheets, info['amount_mismatches']), totals, info
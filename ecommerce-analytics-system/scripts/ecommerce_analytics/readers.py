@@ -0,0 +1,69 @@
+# ============================================
+# 模組名稱：xlsx 讀取引擎
+# 功能：
+#   1. ENGINES：可用的讀取引擎，依速度排序
+#      - calamine：Rust 寫的解析器（需要 python-calamine 和 pandas 2.2 以上）
+#      - openpyxl：pandas 預設的讀法
+#   2. select_engine：指定的引擎，或環境變數 ECOMMERCE_EXCEL_ENGINE，
+#      都沒有時有安裝 calamine 就用，否則用 openpyxl
+#   3. read_excel：和 pd.read_excel 相同的參數和結果（值、dtype），換引擎不影響後面的流程
+# ============================================
+
+import importlib.util
+import os
+
+import pandas as pd
+
+from .columns import usecols
+from .logs import get_logger
+from .workbook import sheet_names
+
+log = get_logger('readers')
+
+ENGINE_ENV = 'ECOMMERCE_EXCEL_ENGINE'
+ENGINES = ['calamine', 'openpyxl']
+
+
+def _has_calamine():
+    if importlib.util.find_spec('python_calamine') is None:
+        return False
+    major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+    return (major, minor) >= (2, 2)
+
+
+def available_engines():
+    """已安裝的引擎（依速度排序）"""
+    return [engine for engine in ENGINES if engine != 'calamine' or _has_calamine()]
+
+
+def select_engine(engine=None):
+    """engine → 環境變數 ECOMMERCE_EXCEL_ENGINE → calamine（有安裝時）→ openpyxl"""
+    engine = engine or os.environ.get(ENGINE_ENV)
+    available = available_engines()
+    if engine is None:
+        return available[0]
+    if engine not in ENGINES:
+        raise ValueError(f"不支援的讀取引擎：{engine}（{' / '.join(ENGINES)}）")
+    if engine not in available:
+        raise ValueError(f"讀取引擎 {engine} 無法使用：需要安裝 python-calamine，且 pandas 2.2 以上")
+    return engine
+
+
+def read_excel(path, sheet_name=0, columns=None, engine=None, **read_kwargs):
+    """和 pd.read_excel 一樣，但用 select_engine 選到的引擎讀
+
+    columns：只讀這些欄位（來源檔沒有的略過）
+    sheet_name 為 None 或 list 時回傳 {工作表名稱: DataFrame}
+    """
+    engine = select_engine(engine)
+    if sheet_name is None or isinstance(sheet_name, list):
+        names = sheet_names(path) if sheet_name is None else sheet_name
+        return {
+            name: read_excel(path, sheet_name=name, columns=columns, engine=engine, **read_kwargs)
+            for name in names
+        }
+
+    log.debug(f"讀取 {os.path.basename(path)}（{engine}）")
+    if columns is not None:
+        read_kwargs = {**read_kwargs, 'usecols': usecols(columns)}
+    return pd.read_excel(path, sheet_name=sheet_name, engine=engine, **read_kwargs)
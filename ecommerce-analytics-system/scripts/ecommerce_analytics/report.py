@@ -0,0 +1,316 @@
+# ============================================
+# 模組名稱：合併 Shopify 和 Pinkoi 訂單表為月度財務報表
+# 工作表：
+#   - 月度統計
+#   - 渠道對比
+#   - Shopify訂單明細
+#   - Pinkoi訂單明細
+# 說明：標準化後的明細用 schema.ORDER_SCHEMA 的型別（金額為整數分），
+#       寫成工作表時才把金額轉回元；月度統計依 channels 註冊的渠道（CHANNELS）列出各渠道
+# ============================================
+
+import importlib.util
+import os
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .channels import CHANNELS
+from .money import from_cents, to_cents
+from .schema import CATEGORY_COLS, CENTS_COLS, FINAL_COLS, MONEY_COLS
+from .workbook import cell_style, format_styles, replace_sheet_parts, sheet_names, sheet_xml
+
+ORDER_KEYS = ['渠道', '訂單編號']
+DETAIL_SORT = ['訂單日期', '訂單編號']
+
+# Pinkoi 商品原價 - 折扣 和總金額相差超過這個金額才算不一致
+AMOUNT_TOLERANCE = 1
+MISMATCH_SHEET = 'Pinkoi金額不一致'
+MISMATCH_COLS = ['訂單編號', '訂單日期', '商品名稱', '商品原始金額', '折扣', '總金額']
+
+# 寫檔時套用的 Excel 數字格式（值保持數字，不再先轉成 "$1,234.00" 字串）
+NUMBER_FORMATS = {
+    'currency': '"$"#,##0.00',
+    'money': '#,##0.00',
+    'percent': '0.0%',
+    'count': '#,##0" 筆"',
+}
+CHANNEL_FORMATS = {
+    '營業額': 'currency', '折扣總額': 'currency', '總利潤': 'currency', '佔比': 'percent', '利潤率': 'percent'
+}
+DATE_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+# 月度統計每個渠道的行：(項目名稱, 渠道對比的欄位, 格式)
+CHANNEL_STAT_ROWS = [
+    ('訂單數', '訂單數', 'count'),
+    ('營業額', '營業額', 'currency'),
+    ('佔比', '佔比', 'percent'),
+    ('利潤', '總利潤', 'currency'),
+    ('利潤率', '利潤率', 'percent'),
+]
+
+def concat_orders(frames):
+    """合併標準化明細，category 欄先統一類別，合併後不會退回成文字"""
+    frames = [frame for frame in frames if frame is not None]
+    for col in CATEGORY_COLS:
+        if all(col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames):
+            categories = union_categoricals([frame[col] for frame in frames]).categories
+            frames = [frame.assign(**{col: frame[col].cat.set_categories(categories)}) for frame in frames]
+    return pd.concat(frames, ignore_index=True, sort=False)
+
+
+def detail_sheet(detail):
+    """標準化明細 → 工作表（金額由分轉回元）"""
+    return detail.assign(**{col: from_cents(detail[col]) for col in CENTS_COLS if col in detail.columns})
+
+
+def check_pinkoi_amounts(pinkoi_std, tolerance=AMOUNT_TOLERANCE):
+    """驗證 Pinkoi 的總金額是否等於商品原始金額（考慮折扣）
+
+    回傳不一致的明細（MISMATCH_COLS + 差額，金額為元），差額 = 商品原價 - 折扣 - 總金額
+    """
+    diff = pinkoi_std['商品原始金額'] - pinkoi_std['折扣'] - pinkoi_std['總金額']
+    mismatched = diff.abs() > to_cents(tolerance)
+    mismatches = pinkoi_std.loc[mismatched, MISMATCH_COLS].assign(差額=diff[mismatched])
+    return detail_sheet(mismatches).assign(差額=from_cents(mismatches['差額'])).reset_index(drop=True)
+
+
+def add_mismatch_sheet(sheets, mismatches):
+    """有金額不一致的明細時，加到報表的最後一個工作表"""
+    if len(mismatches) > 0:
+        sheets[MISMATCH_SHEET] = mismatches
+    return sheets
+
+
+def order_aggregates(combined):
+    """每個 (渠道, 訂單編號) 一行：明細行數、營業額、折扣、利潤
+
+    月度統計和渠道對比都由這張表計算（增量更新時只需要改動有變的訂單）
+    """
+    combined = combined.assign(正總金額=combined['總金額'].where(combined['總金額'] > 0, 0))
+    return combined.groupby(ORDER_KEYS, sort=False, dropna=False, observed=True).agg(
+        明細行數=('訂單編號', 'size'),
+        正總金額=('正總金額', 'sum'),
+        實際金額=('實際金額', 'sum'),
+        折扣=('折扣', 'sum'),
+        總利潤=('總利潤', 'sum'),
+    ).reset_index()
+
+
+def monthly_totals(orders):
+    """整體統計（orders 為 order_aggregates 的結果，金額加總後才轉成元）"""
+    return {
+        'total_orders': orders['訂單編號'].nunique(),
+        'total_items': int(orders['明細行數'].sum()),
+        'total_sales': from_cents(orders['正總金額'].sum()),
+        'total_actual': from_cents(orders['實際金額'].sum()),
+        'total_discount': from_cents(orders['折扣'].sum()),
+        'total_profit': from_cents(orders['總利潤'].sum()),
+    }
+
+
+def channel_statistics(orders, total_actual):
+    """渠道統計（orders 為 order_aggregates 的結果；佔比、利潤率為比例，寫檔時套百分比格式）"""
+    channel_stats = orders.groupby('渠道', observed=True).agg({
+        '訂單編號': 'count',
+        '實際金額': 'sum',
+        '折扣': 'sum',
+        '總利潤': 'sum'
+    })
+    channel_stats.columns = ['訂單數', '營業額', '折扣總額', '總利潤']
+    channel_stats.index = channel_stats.index.astype('str')
+    channel_stats = channel_stats.sort_index()
+    for col in ['營業額', '折扣總額', '總利潤']:
+        channel_stats[col] = from_cents(channel_stats[col]).round(2)
+    channel_stats['佔比'] = (channel_stats['營業額'] / total_actual).round(3) if total_actual else 0.0
+    channel_stats['利潤率'] = (channel_stats['總利潤'] / channel_stats['營業額'].where(channel_stats['營業額'] != 0)).round(3)
+    return channel_stats
+
+
+def monthly_stats_table(totals, channel_stats):
+    """建立月度統計工作表，渠道分析依 CHANNELS 的順序每個渠道五行
+
+    數值欄保留數字，每一行的顯示格式（NUMBER_FORMATS 的鍵）放在 attrs['formats']
+    """
+    total_orders = totals['total_orders']
+    total_actual = totals['total_actual']
+    total_profit = totals['total_profit']
+
+    def channel_value(channel, col):
+        return channel_stats.loc[channel, col] if channel in channel_stats.index else 0
+
+    stats_data = {
+        '統計項目': [
+            '📊 整體概覽',
+            '總訂單數',
+            '總商品明細數',
+            '總營業額',
+            '總折扣金額',
+            '總利潤',
+            '平均利潤率',
+            '平均客單價',
+            '',
+            '📈 渠道分析',
+            *[f"{channel} {label}" for channel in CHANNELS for label, _, _ in CHANNEL_STAT_ROWS]
+        ],
+        '數值': [
+            None,
+            total_orders,
+            totals['total_items'],
+            total_actual,
+            totals['total_discount'],
+            total_profit,
+            total_profit / total_actual if total_actual > 0 else 0,
+            total_actual / total_orders if total_orders > 0 else 0,
+            None,
+            None,
+            *[channel_value(channel, col) for channel in CHANNELS for _, col, _ in CHANNEL_STAT_ROWS]
+        ]
+    }
+    stats = pd.DataFrame(stats_data)
+    stats.attrs['formats'] = [
+        None, 'count', 'count', 'currency', 'currency', 'currency', 'percent', 'currency', None,
+        None, *[kind for _ in CHANNELS for _, _, kind in CHANNEL_STAT_ROWS],
+    ]
+    return stats
+
+
+def report_sheets(orders, shopify_final, pinkoi_final):
+    """每筆訂單的彙總 + 兩個渠道的明細 → (四個工作表, 整體統計)"""
+    totals = monthly_totals(orders)
+    channel_stats = channel_statistics(orders, totals['total_actual'])
+
+    sheets = {
+        '月度統計': monthly_stats_table(totals, channel_stats),
+        '渠道對比': channel_stats,
+        'Shopify訂單明細': detail_sheet(shopify_final),
+        'Pinkoi訂單明細': detail_sheet(pinkoi_final),
+    }
+    return sheets, totals
+
+
+def build_monthly_report(shopify_std, pinkoi_std):
+    """統一欄位的兩個渠道 → (四個工作表, 整體統計)"""
+    shopify_final = shopify_std[FINAL_COLS].sort_values(DETAIL_SORT)
+    pinkoi_final = pinkoi_std[FINAL_COLS].sort_values(DETAIL_SORT)
+
+    # 合併用於統計（不輸出）
+    combined = concat_orders([shopify_final, pinkoi_final])
+
+    return report_sheets(order_aggregates(combined), shopify_final, pinkoi_final)
+
+
+def default_writer_engine():
+    """有安裝 xlsxwriter 就用（逐行寫出、記憶體固定），否則用 openpyxl"""
+    return 'xlsxwriter' if importlib.util.find_spec('xlsxwriter') else 'openpyxl'
+
+
+def sheet_frames(sheets):
+    """要寫出的工作表（渠道對比的渠道 index 變成第一欄）"""
+    for sheet_name, sheet in sheets.items():
+        if sheet_name == '渠道對比':
+            sheet = sheet.reset_index()
+        yield sheet_name, sheet
+
+
+def cell_formats(sheet_name, sheet):
+    """(每欄格式, 每行格式)：月度統計依行，其他工作表依欄"""
+    if sheet_name == '月度統計':
+        return [None] * len(sheet.columns), sheet.attrs.get('formats', [None] * len(sheet))
+    column_formats = CHANNEL_FORMATS if sheet_name == '渠道對比' else dict.fromkeys(MONEY_COLS, 'money')
+    return [column_formats.get(col) for col in sheet.columns], None
+
+
+def _write_openpyxl(sheets, output_path):
+    with pd.ExcelWriter(output_path, engine='openpyxl', datetime_format=DATE_FORMAT) as writer:
+        for sheet_name, sheet in sheet_frames(sheets):
+            sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+
+            worksheet = writer.sheets[sheet_name]
+            column_formats, row_formats = cell_formats(sheet_name, sheet)
+            for col, kind in enumerate(column_formats, start=1):
+                if kind:
+                    for (cell,) in worksheet.iter_rows(min_row=2, min_col=col, max_col=col):
+                        cell.number_format = NUMBER_FORMATS[kind]
+            for row, kind in enumerate(row_formats or [], start=2):
+                if kind:
+                    worksheet.cell(row=row, column=2).number_format = NUMBER_FORMATS[kind]
+
+
+def _write_xlsxwriter(sheets, output_path, constant_memory):
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(output_path, {
+        'constant_memory': constant_memory,
+        'default_date_format': DATE_FORMAT,
+    })
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    formats = {kind: workbook.add_format({'num_format': code}) for kind, code in NUMBER_FORMATS.items()}
+    formats[None] = None
+
+    try:
+        for sheet_name, sheet in sheet_frames(sheets):
+            worksheet = workbook.add_worksheet(sheet_name)
+            worksheet.write_row(0, 0, [str(col) for col in sheet.columns], header_format)
+
+            # constant_memory 模式只能由上往下逐行寫，不能用 to_excel（它是逐欄寫）
+            column_formats, row_formats = cell_formats(sheet_name, sheet)
+            column_formats = [formats[kind] for kind in column_formats]
+            # 數字欄直接用 write_number，省掉 write() 逐格判斷型別
+            column_writers = [
+                worksheet.write_number if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                else worksheet.write
+                for dtype in sheet.dtypes
+            ]
+            for row, values in enumerate(sheet.itertuples(index=False, name=None), start=1):
+                row_format = formats[row_formats[row - 1]] if row_formats else None
+                for col, value in enumerate(values):
+                    if value is None or value is pd.NaT or value is pd.NA or value != value:
+                        continue
+                    column_writers[col](row, col, value, row_format or column_formats[col])
+    finally:
+        workbook.close()
+
+
+def write_monthly_report(sheets, output_path, engine=None, constant_memory=True):
+    """儲存月度財務報表（渠道對比保留渠道 index）
+
+    engine：'xlsxwriter' 或 'openpyxl'，預設有 xlsxwriter 就用；
+    金額、百分比、筆數都以 Excel 數字格式顯示，儲存格內仍是數字
+    """
+    engine = engine or default_writer_engine()
+    if engine == 'xlsxwriter':
+        _write_xlsxwriter(sheets, output_path, constant_memory)
+    elif engine == 'openpyxl':
+        _write_openpyxl(sheets, output_path)
+    else:
+        raise ValueError(f"不支援的 engine：{engine}（xlsxwriter / openpyxl）")
+
+
+def replace_report_sheets(sheets, output_path, names):
+    """只換掉已存在的報表中 names 這幾個工作表（格式和 write_monthly_report 相同），成功回傳 True
+
+    其他工作表（例如沒有變動的訂單明細）原封不動；報表不存在、工作表清單和 sheets 不同、
+    或活頁簿裡找不到需要的儲存格格式時回傳 False，由呼叫端改用 write_monthly_report 全部重寫
+    """
+    if not os.path.exists(output_path) or sheet_names(output_path) != list(sheets):
+        return False
+    styles = format_styles(output_path)
+    header_style = cell_style(output_path, names[0]) if names else 0
+
+    parts = {}
+    for sheet_name, sheet in sheet_frames({name: sheets[name] for name in names}):
+        column_formats, row_formats = cell_formats(sheet_name, sheet)
+        column_codes = [
+            DATE_FORMAT if pd.api.types.is_datetime64_dtype(dtype) else NUMBER_FORMATS.get(kind)
+            for kind, dtype in zip(column_formats, sheet.dtypes)
+        ]
+        row_codes = [NUMBER_FORMATS.get(kind) for kind in row_formats or []]
+        if any(code is not None and code not in styles for code in column_codes + row_codes):
+            return False
+        parts[sheet_name] = sheet_xml(
+            sheet,
+            header_style=header_style,
+            column_styles=[styles.get(code) for code in column_codes],
+            row_styles=[styles.get(code) for code in row_codes],
+        )
+    return replace_sheet_parts(output_path, parts)
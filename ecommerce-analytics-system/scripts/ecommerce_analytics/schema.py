@@ -0,0 +1,59 @@
+# ============================================
+# 模組名稱：標準化訂單明細的欄位和型別
+# 功能：
+#   1. FINAL_COLS：統一的欄位順序；MONEY_COLS：金額欄
+#   2. ORDER_SCHEMA：每個統一欄位的型別（金額為整數分）
+#   3. apply_order_schema：統一欄位 → ORDER_SCHEMA 的型別
+# 說明：channels.py（各渠道轉成統一欄位）和 report.py（月度報表）都依這裡的定義，
+#       兩者不用互相匯入
+# ============================================
+
+import pandas as pd
+
+# 統一的欄位順序
+FINAL_COLS = [
+    '渠道', '訂單編號', '訂單日期', '客戶名稱', '商品名稱',
+    '數量', '單價', '商品原始金額', '折扣', '分攤後金額', '分攤後折扣',
+    '實際金額', '總金額', '成本', '總成本', '單件利潤', '總利潤', '利潤率'
+]
+
+# 金額欄（寫檔時套用金額格式）
+MONEY_COLS = [
+    '單價', '商品原始金額', '折扣', '分攤後金額', '分攤後折扣', '實際金額',
+    '總金額', '成本', '總成本', '單件利潤', '總利潤', '差額'
+]
+
+# 標準化明細的欄位型別：重複很多的文字用 category，金額為整數分（MONEY_COLS 除了差額）；
+# 數量可能有小數（例如以重量計價的商品），用 float64；訂單編號用 'string'，缺值保持缺值，不會變成 'nan'；
+# 渠道的類別（已註冊的渠道）由 channels.standardize_orders 設定
+ORDER_SCHEMA = {
+    '渠道': 'category',
+    '訂單編號': 'string',
+    '訂單日期': 'datetime64[ns]',
+    '客戶名稱': 'category',
+    '商品名稱': 'category',
+    '數量': 'float64',
+    **dict.fromkeys([col for col in MONEY_COLS if col in FINAL_COLS], 'int64'),
+    '利潤率': 'float64',
+}
+CATEGORY_COLS = [col for col, dtype in ORDER_SCHEMA.items() if isinstance(dtype, pd.CategoricalDtype) or dtype == 'category']
+CENTS_COLS = [col for col, dtype in ORDER_SCHEMA.items() if dtype == 'int64']
+
+# Shopify 的 Created at 可能帶時區（2026-01-03 10:00:00 +0800），保留當地時間
+TZ_SUFFIX = r'\s*[+-]\d{2}:?\d{2}$'
+
+
+def to_datetime(series):
+    """日期文字或日期 → 不帶時區的日期，無法轉換的為 NaT"""
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        text = series.astype('str').str.replace(TZ_SUFFIX, '', regex=True)
+        series = pd.to_datetime(text, errors='coerce')
+    if series.dt.tz is not None:
+        series = series.dt.tz_localize(None)
+    return series
+
+
+def apply_order_schema(std):
+    """統一欄位 → ORDER_SCHEMA 的型別（金額欄需已是整數分）"""
+    std = std.assign(訂單日期=to_datetime(std['訂單日期']))
+    return std.astype({col: dtype for col, dtype in ORDER_SCHEMA.items() if col in std.columns})
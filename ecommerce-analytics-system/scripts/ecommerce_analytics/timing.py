@@ -0,0 +1,128 @@
+# ============================================
+# 模組名稱：各階段耗時和記憶體紀錄
+# 功能：
+#   1. with timer.stage('3. 讀取檔案') 或 @timer.timed('...') 包住每個步驟
+#   2. 記錄 wall time、CPU time、行數、最高記憶體（peak RSS）增加多少
+#   3. 輸出 JSON 執行紀錄；profile=True 時另存最慢階段的 cProfile 結果
+# ============================================
+
+import cProfile
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+
+def peak_rss_mb():
+    """這個 process 到目前為止的最高記憶體用量（MB），無法取得時回傳 None"""
+    try:
+        import resource
+    except ImportError:  # Windows 沒有 resource，有 psutil 就用
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 1024 / 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+class StageTimer:
+    """一次執行的各階段紀錄
+
+    peak RSS 是整個 process 的最高值，所以每個階段記的是「這個階段讓最高值增加多少」，
+    前面階段已經用過的記憶體不會重複算
+    """
+
+    def __init__(self, run_name='', profile=False):
+        self.run_name = run_name
+        self.profile = profile
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.stages = []
+        self._start = time.perf_counter()
+        self._slowest_profile = None
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """記錄一個階段；行數可以在 with 區塊中設定 record['rows']"""
+        record = {'stage': name, 'rows': rows}
+        rss_before = peak_rss_mb()
+        profiler = cProfile.Profile() if self.profile else None
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        if profiler:
+            profiler.enable()
+        try:
+            yield record
+        finally:
+            if profiler:
+                profiler.disable()
+            record['wall_seconds'] = round(time.perf_counter() - wall_start, 4)
+            record['cpu_seconds'] = round(time.process_time() - cpu_start, 4)
+            rss_after = peak_rss_mb()
+            record['peak_rss_mb'] = round(rss_after, 1) if rss_after is not None else None
+            record['peak_rss_delta_mb'] = round(rss_after - rss_before, 1) if rss_after is not None else None
+            self.stages.append(record)
+
+            # 只保留目前最慢階段的 profile
+            slowest = self.slowest_stage()
+            if profiler and slowest is record:
+                self._slowest_profile = profiler
+
+    def timed(self, name=None, rows=None):
+        """函式版本：@timer.timed('01 分攤', rows=len)，rows 為由回傳值算行數的函式"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__) as record:
+                    result = func(*args, **kwargs)
+                    if rows is not None:
+                        record['rows'] = rows(result)
+                return result
+            return wrapper
+        return decorator
+
+    def slowest_stage(self):
+        return max(self.stages, key=lambda record: record['wall_seconds'], default=None)
+
+    def report(self):
+        """JSON 執行紀錄的內容"""
+        slowest = self.slowest_stage()
+        return {
+            'run': self.run_name,
+            'started_at': self.started_at,
+            'total_wall_seconds': round(time.perf_counter() - self._start, 4),
+            'peak_rss_mb': max((r['peak_rss_mb'] for r in self.stages if r['peak_rss_mb'] is not None), default=None),
+            'slowest_stage': slowest['stage'] if slowest else None,
+            'stages': self.stages,
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+        return path
+
+    def dump_slowest_profile(self, path):
+        """最慢階段的 cProfile 結果（可用 python -m pstats 或 snakeviz 開啟），沒有 profile 時回傳 None"""
+        if self._slowest_profile is None:
+            return None
+        self._slowest_profile.dump_stats(path)
+        return path
+
+    def summary_lines(self):
+        """每個階段一行，給腳本最後印出"""
+        lines = []
+        for record in self.stages:
+            rows = f"{record['rows']:>10,} 行" if record['rows'] is not None else ' ' * 12
+            rss = f"+{record['peak_rss_delta_mb']:,.0f} MB" if record['peak_rss_delta_mb'] is not None else ''
+            lines.append(f"{record['wall_seconds']:8.2f} 秒  CPU {record['cpu_seconds']:8.2f} 秒  {rows}  {rss:>9}  {record['stage']}")
+        return lines
+
+
+def report_paths(output_path):
+    """月度財務報表_202601.xlsx → (執行紀錄 JSON, 最慢階段 .prof) 的路徑"""
+    base = os.path.splitext(output_path)[0]
+    return f"{base}_執行紀錄.json", f"{base}_最慢階段.prof"
@@ -0,0 +1,233 @@
+# ============================================
+# 模組名稱：訂單倉庫（SQLite）
+# 功能：
+#   1. 每次產生月度報表時，把標準化明細（FINAL_COLS）寫入本機 SQLite，
+#      依 (月份, 渠道) 分區；同一個月份重跑時整個月份換掉，不會重複
+#   2. 訂單編號、客戶名稱、訂單日期有索引，跨年度的查詢不用再打開各月份的 xlsx
+#   3. channel_summary / customer_summary：渠道、客戶的跨月份統計
+# 說明：金額存整數分（和標準化明細相同），查詢結果的統計才轉成元；
+#       寫入時同時算好每個分區、每個客戶每月的小計，跨年度統計只加總小計，
+#       不用掃過全部明細
+# ============================================
+
+import os
+import sqlite3
+
+import pandas as pd
+
+from .logs import get_logger
+from .money import from_cents
+from .channels import CHANNELS
+from .report import concat_orders
+from .schema import CENTS_COLS, FINAL_COLS, apply_order_schema
+
+DEFAULT_WAREHOUSE_DB = os.environ.get(
+    'ECOMMERCE_WAREHOUSE_DB',
+    os.path.join(os.path.expanduser('~'), '.ecommerce_analytics', 'orders.sqlite')
+)
+
+# 批次執行時多個 process 同時寫入，等前一個寫完（秒）
+BUSY_TIMEOUT = 60
+
+SQL_TYPES = {col: 'INTEGER' for col in CENTS_COLS}
+SQL_TYPES.update({'數量': 'REAL', '利潤率': 'REAL'})
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS orders (
+    "月份" TEXT NOT NULL,
+    {', '.join(f'"{col}" {SQL_TYPES.get(col, "TEXT")}' for col in FINAL_COLS)}
+);
+CREATE INDEX IF NOT EXISTS idx_orders_partition ON orders ("月份", "渠道");
+CREATE INDEX IF NOT EXISTS idx_orders_order_no ON orders ("訂單編號");
+CREATE INDEX IF NOT EXISTS idx_orders_customer ON orders ("客戶名稱");
+CREATE INDEX IF NOT EXISTS idx_orders_date ON orders ("訂單日期");
+
+CREATE TABLE IF NOT EXISTS partitions (
+    "月份"     TEXT NOT NULL,
+    "渠道"     TEXT NOT NULL,
+    "行數"     INTEGER NOT NULL,
+    "訂單數"   INTEGER NOT NULL,
+    "營業額"   INTEGER NOT NULL,
+    "折扣總額" INTEGER NOT NULL,
+    "總利潤"   INTEGER NOT NULL,
+    "寫入時間" TEXT NOT NULL,
+    PRIMARY KEY ("月份", "渠道")
+);
+
+CREATE TABLE IF NOT EXISTS customer_months (
+    "月份"       TEXT NOT NULL,
+    "渠道"       TEXT NOT NULL,
+    "客戶名稱"   TEXT,
+    "訂單數"     INTEGER NOT NULL,
+    "營業額"     INTEGER NOT NULL,
+    "總利潤"     INTEGER NOT NULL,
+    "第一次購買" TEXT,
+    "最近購買"   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_customer_months_month ON customer_months ("月份", "渠道");
+-- 客戶統計只需要讀索引（covering index），不用回到表格
+CREATE INDEX IF NOT EXISTS idx_customer_months_customer ON customer_months (
+    "客戶名稱", "月份", "渠道", "訂單數", "營業額", "總利潤", "第一次購買", "最近購買"
+);
+"""
+
+log = get_logger('warehouse')
+
+
+def _quote(col):
+    return f'"{col}"'
+
+
+def _partition_totals(part):
+    """一個分區的小計：行數、訂單數、營業額、折扣總額、總利潤（分）"""
+    return (
+        len(part), int(part['訂單編號'].nunique()), int(part['實際金額'].sum()),
+        int(part['折扣'].sum()), int(part['總利潤'].sum()),
+    )
+
+
+def _customer_rows(part, month, channel):
+    """一個分區每個客戶的小計（客戶名稱空白的訂單也算一組）"""
+    customers = part.groupby('客戶名稱', dropna=False, observed=True, sort=False).agg(
+        訂單數=('訂單編號', 'nunique'),
+        營業額=('實際金額', 'sum'),
+        總利潤=('總利潤', 'sum'),
+        第一次購買=('訂單日期', 'min'),
+        最近購買=('訂單日期', 'max'),
+    ).reset_index()
+    for col in ['第一次購買', '最近購買']:
+        customers[col] = customers[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+    customers = customers.astype(object)
+    customers = customers.where(customers.notna(), None)
+    customers.insert(0, '渠道', channel)
+    customers.insert(0, '月份', month)
+    return customers.itertuples(index=False, name=None)
+
+
+def _sql_rows(std, month):
+    """標準化明細 → executemany 用的 tuple（日期轉成文字，空值轉成 None）"""
+    values = std.reindex(columns=FINAL_COLS).assign(
+        訂單日期=std['訂單日期'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    ).astype(object)
+    values = values.where(values.notna(), None)
+    values.insert(0, '月份', month)
+    return values.itertuples(index=False, name=None)
+
+
+class OrderWarehouse:
+    """跨月份的訂單明細資料庫
+
+    with OrderWarehouse(path) as warehouse:
+        warehouse.append_month('202601', [shopify_std, pinkoi_std])
+        warehouse.channel_summary(by='year')
+    """
+
+    def __init__(self, db_path=DEFAULT_WAREHOUSE_DB):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    # === 寫入 ===
+
+    def append_month(self, month, frames):
+        """一個月份的標準化明細（可以是多個渠道）寫入倉庫，回傳 {渠道: 行數}
+
+        這個月份原有的資料（所有渠道）先刪除，同一個月份重跑結果不會重複
+        """
+        frames = [frame for frame in frames if frame is not None and len(frame)] or [pd.DataFrame(columns=FINAL_COLS)]
+        placeholders = ', '.join('?' * (len(FINAL_COLS) + 1))
+        insert = f"INSERT INTO orders ({_quote('月份')}, {', '.join(map(_quote, FINAL_COLS))}) VALUES ({placeholders})"
+
+        counts = {}
+        with self.conn:
+            for table in ['orders', 'partitions', 'customer_months']:
+                self.conn.execute(f'DELETE FROM {table} WHERE "月份" = ?', (month,))
+            for channel, part in concat_orders(frames).groupby('渠道', observed=True, sort=False):
+                channel = str(channel)
+                self.conn.executemany(insert, _sql_rows(part, month))
+                self.conn.execute(
+                    "INSERT INTO partitions VALUES (?, ?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))",
+                    (month, channel) + _partition_totals(part)
+                )
+                self.conn.executemany(
+                    'INSERT INTO customer_months VALUES (?, ?, ?, ?, ?, ?, ?, ?)', _customer_rows(part, month, channel)
+                )
+                counts[channel] = len(part)
+        log.debug(f"   訂單倉庫 {month}：" + '、'.join(f"{channel} {rows:,} 行" for channel, rows in counts.items()))
+        return counts
+
+    # === 查詢 ===
+
+    def query(self, sql, params=()):
+        """任意 SQL → DataFrame（表格：orders、partitions、customer_months）"""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def partitions(self):
+        """每個 (月份, 渠道) 分區的行數和小計（金額為分）"""
+        return self.query('SELECT * FROM partitions ORDER BY "月份", "渠道"')
+
+    def _where(self, start_month=None, end_month=None, channel=None, customer=None, order_no=None):
+        conditions, params = [], []
+        for col, op, value in [
+            ('月份', '>=', start_month), ('月份', '<=', end_month), ('渠道', '=', channel),
+            ('客戶名稱', '=', customer), ('訂單編號', '=', order_no),
+        ]:
+            if value is not None:
+                conditions.append(f'{_quote(col)} {op} ?')
+                params.append(str(value))
+        return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+    def orders(self, start_month=None, end_month=None, channel=None, customer=None, order_no=None):
+        """標準化明細（ORDER_SCHEMA 型別，金額為分），可依月份 YYYYMM、渠道、客戶、訂單編號篩選"""
+        where, params = self._where(start_month, end_month, channel, customer, order_no)
+        orders = self.query(
+            f'SELECT {", ".join(map(_quote, FINAL_COLS))} FROM orders{where} ORDER BY "訂單日期", "訂單編號"',
+            params
+        )
+        return apply_order_schema(orders).astype({'渠道': pd.CategoricalDtype(CHANNELS)})
+
+    def channel_summary(self, by='month', start_month=None, end_month=None):
+        """每個期間（by='month' / 'year'）× 渠道：訂單數、營業額、折扣總額、總利潤（元）
+
+        由分區小計加總；一筆訂單只屬於一個月份，所以年度訂單數等於各月份相加
+        """
+        if by not in ('month', 'year'):
+            raise ValueError(f"by 只能是 'month' 或 'year'：{by}")
+        period = '"月份"' if by == 'month' else 'substr("月份", 1, 4)'
+        where, params = self._where(start_month, end_month)
+        summary = self.query(
+            f'SELECT {period} AS "期間", "渠道", SUM("訂單數") AS "訂單數",'
+            ' SUM("營業額") AS "營業額", SUM("折扣總額") AS "折扣總額", SUM("總利潤") AS "總利潤"'
+            f' FROM partitions{where} GROUP BY 1, 2 ORDER BY 1, 2',
+            params
+        )
+        return self._to_dollars(summary, ['營業額', '折扣總額', '總利潤'])
+
+    def customer_summary(self, channel=None, start_month=None, end_month=None, limit=None):
+        """每個客戶：訂單數、營業額、總利潤（元）、第一次 / 最近一次購買，依營業額排序"""
+        where, params = self._where(start_month, end_month, channel)
+        sql = (
+            'SELECT "客戶名稱", SUM("訂單數") AS "訂單數", SUM("營業額") AS "營業額", SUM("總利潤") AS "總利潤",'
+            ' MIN("第一次購買") AS "第一次購買", MAX("最近購買") AS "最近購買"'
+            f' FROM customer_months{where} GROUP BY "客戶名稱" ORDER BY "營業額" DESC'
+        )
+        if limit:
+            sql += f' LIMIT {int(limit)}'
+        return self._to_dollars(self.query(sql, params), ['營業額', '總利潤'])
+
+    @staticmethod
+    def _to_dollars(summary, cols):
+        for col in cols:
+            summary[col] = from_cents(summary[col].fillna(0).astype('int64')).round(2)
+        return summary
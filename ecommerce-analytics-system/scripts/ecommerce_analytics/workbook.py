@@ -0,0 +1,200 @@
+# ============================================
+# 模組名稱：xlsx 工作表存取（直接讀寫 zip 裡的 XML）
+# 功能：
+#   1. sheet_names：直接讀 xlsx 裡的 workbook.xml 取得工作表清單，不載入任何儲存格
+#   2. write_sheet：只換掉一個工作表的 XML，其他工作表（例如很大的訂單明細）
+#      原封不動複製，不再像 openpyxl append 模式整本讀進來再寫回；
+#      replace_sheet_parts 一次換掉多個工作表，可沿用活頁簿既有的儲存格格式（format_styles）
+# 說明：xlsx 是 zip 檔，每個工作表是一個 xl/worksheets/sheetN.xml；
+#       write_sheet 替換後的工作表只有值（數字 / 文字），不帶儲存格格式；
+#       原本的工作表有欄寬、合併儲存格、圖片、表格等設定時不替換，改用 openpyxl
+# ============================================
+
+import math
+import os
+import re
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
+
+import pandas as pd
+from openpyxl.styles.numbers import BUILTIN_FORMATS
+from openpyxl.utils.datetime import WINDOWS_EPOCH
+
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+WORKBOOK_PART = 'xl/workbook.xml'
+WORKBOOK_RELS_PART = 'xl/_rels/workbook.xml.rels'
+# 有公式計算鏈時，換掉工作表可能讓 Excel 要求修復，改用 openpyxl
+CALC_CHAIN_PART = 'xl/calcChain.xml'
+STYLES_PART = 'xl/styles.xml'
+# 工作表 XML 裡的這些設定（欄寬、合併儲存格、超連結、篩選、圖片、表格…）替換後會遺失，
+# 有的話不替換工作表
+SHEET_EXTRAS = re.compile(
+    rb'<(?:\w+:)?(?:cols|mergeCells|hyperlinks|conditionalFormatting|dataValidations|autoFilter'
+    rb'|drawing|legacyDrawing|legacyDrawingHF|picture|oleObjects|controls|tableParts)\b'
+)
+
+
+def _sheet_parts(archive):
+    """{工作表名稱: zip 內的 XML 路徑}，依活頁簿中的順序"""
+    workbook = ElementTree.fromstring(archive.read(WORKBOOK_PART))
+    rels = ElementTree.fromstring(archive.read(WORKBOOK_RELS_PART))
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{{{PACKAGE_REL_NS}}}Relationship')}
+
+    parts = {}
+    for sheet in workbook.iter(f'{{{MAIN_NS}}}sheet'):
+        target = targets.get(sheet.get(f'{{{REL_NS}}}id'), '')
+        # Target 可能是絕對路徑（/xl/worksheets/sheet1.xml）或相對於 xl/ 的路徑
+        parts[sheet.get('name')] = target.lstrip('/') if target.startswith('/') else f'xl/{target}'
+    return parts
+
+
+def _read_part(archive, name):
+    try:
+        return archive.read(name)
+    except KeyError:
+        return None
+
+
+def sheet_names(path):
+    """工作表清單（只讀 workbook.xml，不解析任何儲存格）"""
+    with zipfile.ZipFile(path) as archive:
+        return list(_sheet_parts(archive))
+
+
+def _column_letter(index):
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def _cell(ref, value, style=''):
+    if value is None or (pd.isna(value) if not isinstance(value, str) else not value):
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # inf / -inf 不是合法的數字儲存格，和 NaN 一樣寫成空白
+        return f'<c r="{ref}"{style}><v>{value!r}</v></c>' if math.isfinite(value) else ''
+    return f'<c r="{ref}"{style} t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>'
+
+
+def _style_attr(style):
+    return f' s="{style}"' if style else ''
+
+
+def _excel_values(df):
+    """日期欄 → Excel 日期序號（1900 日期系統），其他欄轉成 Python 物件"""
+    dates = {
+        col: (df[col] - pd.Timestamp(WINDOWS_EPOCH)) / pd.Timedelta(days=1)
+        for col in df.columns[[pd.api.types.is_datetime64_dtype(dtype) for dtype in df.dtypes]]
+    }
+    return df.assign(**dates).astype(object).values.tolist() if dates else df.astype(object).values.tolist()
+
+
+def sheet_xml(df, header_style=0, column_styles=None, row_styles=None):
+    """DataFrame（含標題列）→ 工作表 XML；文字用 inline string，不需要改 sharedStrings
+
+    header_style / column_styles / row_styles：標題列、每欄、每行（不含標題列）的 style 編號
+    （styles.xml 裡 cellXfs 的索引，0 或 None 為不套格式）；同一格兩者都有時以每行的為準。
+    日期欄寫成 Excel 日期序號，要搭配日期格式的 style 才會顯示成日期
+    """
+    letters = [_column_letter(i) for i in range(len(df.columns))]
+    header_attrs = [_style_attr(header_style)] * len(letters)
+    column_attrs = [_style_attr(style) for style in column_styles or [None] * len(letters)]
+    row_attrs = [_style_attr(style) for style in row_styles or []]
+
+    body = []
+    for r, values in enumerate([list(df.columns)] + _excel_values(df), start=1):
+        if r == 1:
+            attrs = header_attrs
+        elif row_attrs and row_attrs[r - 2]:
+            attrs = [row_attrs[r - 2]] * len(letters)
+        else:
+            attrs = column_attrs
+        cells = ''.join(_cell(f'{letter}{r}', value, attr) for letter, value, attr in zip(letters, values, attrs))
+        body.append(f'<row r="{r}">{cells}</row>')
+    dimension = f'A1:{letters[-1]}{len(body)}' if letters else 'A1'
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<worksheet xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">'
+        f'<dimension ref="{dimension}"/><sheetData>{"".join(body)}</sheetData></worksheet>'
+    ).encode('utf-8')
+
+
+def format_styles(path):
+    """{數字格式代碼: 第一個使用它的 style 編號}（含內建格式，例如 4 = '#,##0.00'）"""
+    with zipfile.ZipFile(path) as archive:
+        data = _read_part(archive, STYLES_PART)
+    if data is None:
+        return {}
+    styles = ElementTree.fromstring(data)
+    custom = {int(fmt.get('numFmtId')): fmt.get('formatCode') for fmt in styles.iter(f'{{{MAIN_NS}}}numFmt')}
+    cell_xfs = styles.find(f'{{{MAIN_NS}}}cellXfs')
+    found = {}
+    for idx, xf in enumerate([] if cell_xfs is None else cell_xfs.iter(f'{{{MAIN_NS}}}xf')):
+        num_fmt_id = int(xf.get('numFmtId', 0))
+        found.setdefault(custom.get(num_fmt_id, BUILTIN_FORMATS.get(num_fmt_id)), idx)
+    return found
+
+
+def cell_style(path, sheet_name, ref='A1'):
+    """工作表中一個儲存格的 style 編號（沒有這個儲存格或沒有格式為 0）"""
+    with zipfile.ZipFile(path) as archive:
+        xml = archive.read(_sheet_parts(archive)[sheet_name])
+    cell = re.search(rb'<(?:\w+:)?c\b[^>]*?\br="%s"[^>]*>' % ref.encode('ascii'), xml)
+    style = re.search(rb'\bs="(\d+)"', cell.group(0)) if cell else None
+    return int(style.group(1)) if style else 0
+
+
+def replace_sheet_parts(path, parts):
+    """只換掉 {工作表名稱: XML} 這幾個工作表，其他檔案照原樣複製到新的 zip；成功回傳 True
+
+    有工作表不存在、工作表有替換後會遺失的設定（SHEET_EXTRAS）或活頁簿有公式計算鏈時
+    不處理，回傳 False
+    先寫到同資料夾的暫存檔再取代原檔，中途失敗原檔不受影響
+    """
+    with zipfile.ZipFile(path) as archive:
+        sheet_parts = _sheet_parts(archive)
+        names = set(archive.namelist())
+        if CALC_CHAIN_PART in names or any(sheet_parts.get(sheet) not in names for sheet in parts):
+            return False
+        if any(SHEET_EXTRAS.search(archive.read(sheet_parts[sheet])) for sheet in parts):
+            return False
+        replaced = {sheet_parts[sheet]: xml for sheet, xml in parts.items()}
+
+        folder = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(suffix='.xlsx', dir=folder)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(temp_path, 'w') as output:
+                for info in archive.infolist():
+                    output.writestr(info, replaced.get(info.filename) or archive.read(info))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    os.replace(temp_path, path)
+    return True
+
+
+def replace_sheet_part(path, sheet_name, df):
+    """只換掉 sheet_name 的 XML（只有值，不帶儲存格格式）；工作表不存在或不能替換時回傳 False"""
+    return replace_sheet_parts(path, {sheet_name: sheet_xml(df)})
+
+
+def write_sheet(path, sheet_name, df):
+    """替換（或新增）一個工作表，其他工作表保留
+
+    已有這個工作表時只改它的 XML；第一次新增工作表時用 openpyxl append 模式
+    """
+    if replace_sheet_part(path, sheet_name, df):
+        return
+    with pd.ExcelWriter(path, engine='openpyxl', mode='a', if_sheet_exists='replace') as writer:
+        df.to_excel(writer, sheet_name=sheet_name, index=False)
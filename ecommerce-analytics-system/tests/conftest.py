@@ -0,0 +1,11 @@
+# ============================================
+# 測試共用設定：scripts/ 和 benchmarks/ 加到 sys.path
+# （ecommerce_analytics 沒有安裝成套件，腳本也是這樣匯入）
+# ============================================
+
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ecommerce_analytics.allocation import allocate_order_amounts, largest_remainder, verify_allocation
+
+
+def test_largest_remainder_gives_leftover_cents_to_largest_remainders():
+    # 100 分三等分：33.33 → 第一行多拿 1 分（餘數相同時依原始順序）
+    assert largest_remainder([100, 100, 100], [1, 1, 1], [0, 0, 0]).tolist() == [34, 33, 33]
+    # 1000 分依 1:2:3：166.67 / 333.33 / 500 → 167 / 333 / 500
+    assert largest_remainder([1000] * 3, [1, 2, 3], [0, 0, 0]).tolist() == [167, 333, 500]
+
+
+@pytest.mark.parametrize('weights', [
+    np.array([333, 333, 334, 1, 999]),
+    np.array([3.33, 3.33, 3.34, 0.01, 9.99]),
+])
+def test_largest_remainder_group_sums_are_exact(weights):
+    amounts = np.array([999, 999, 999, 12345, 12345])
+    groups = np.array([0, 0, 0, 1, 1])
+    result = largest_remainder(amounts, weights, groups)
+    assert result[:3].sum() == 999
+    assert result[3:].sum() == 12345
+
+
+def test_largest_remainder_zero_weights_and_empty():
+    assert largest_remainder([500, 500], [0, 0], [0, 0]).tolist() == [0, 0]
+    assert largest_remainder([], np.array([], dtype=np.int64), []).tolist() == []
+
+
+def make_orders():
+    return pd.DataFrame({
+        'Order No': ['#1001', '#1001', '#1001', '#1002', '#1002', '#1003', '#1004', np.nan],
+        'Selling Price': [10, 10, 10, 3.33, 6.67, 0, 5, 5],
+        'Quantity': [1, 1, 1, 1.5, 1, 2, 1, 1],
+        'Total': [10, np.nan, np.nan, 'abc', np.nan, 5, -4, 7],
+        'Discount Amount': [1, 0, 0, np.nan, 0, 0, 0, 0],
+    })
+
+
+def test_allocation_sums_match_totals_to_the_cent():
+    df = pd.DataFrame({
+        'Order No': ['#1', '#1', '#1', '#2', '#2'],
+        'Selling Price': [10, 10, 10, 3.33, 6.67],
+        'Quantity': [1, 1, 1, 1.5, 1],
+        'Total': [10, np.nan, np.nan, 11.66, np.nan],
+        'Discount Amount': [1, 0, 0, 0.01, 0],
+    })
+    allocated, problems = allocate_order_amounts(df)
+
+    assert problems == []
+    assert allocated['分攤後金額'].tolist() == [3.34, 3.33, 3.33, 5.0, 6.66]
+    assert allocated['分攤後折扣'].tolist() == [0.34, 0.33, 0.33, 0.0, 0.01]
+
+    verification = verify_allocation(allocated)
+    assert (verification['正確'] == '✅').all()
+    assert (verification['Total差異'] == 0).all()
+    assert (verification['Discount差異'] == 0).all()
+
+
+def test_allocation_zero_negative_nan_and_missing_order_numbers():
+    allocated, problems = allocate_order_amounts(make_orders())
+
+    # 無 Total（文字、負數）和商品金額為 0 的訂單不分攤；沒有訂單編號的行不算一筆訂單
+    assert problems == ['#1002 (無 Total)', '#1003 (商品金額為0)', '#1004 (無 Total)']
+    assert allocated.loc[3:, '分攤後金額'].tolist() == [0.0] * 5
+    assert allocated['分攤後金額'].iloc[:3].sum() == pytest.approx(10)
+
+    verification = verify_allocation(allocated, failed_only=True)
+    assert verification['訂單編號'].tolist() == ['#1003']
+    assert verification['Total差異'].tolist() == [5.0]
@@ -0,0 +1,56 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from ecommerce_analytics.cache import clear_cache, evict, load_manifest, read_excel_cached
+
+
+def write_sources(folder, n_files):
+    paths = []
+    for i in range(n_files):
+        path = os.path.join(folder, f"orders_{i}.xlsx")
+        pd.DataFrame({'Order No': [f"#{i}-{j}" for j in range(5)], 'Total': range(5)}).to_excel(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def test_second_read_uses_cache(tmp_path):
+    source, = write_sources(str(tmp_path), 1)
+    cache_dir = str(tmp_path / 'cache')
+    first = read_excel_cached(source, cache_dir=cache_dir)
+    second = read_excel_cached(source, cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(first, second)
+    assert len(load_manifest(cache_dir)['entries']) == 1
+
+    # 來源檔內容改了就重新讀
+    pd.DataFrame({'Order No': ['#0-0'], 'Total': [0]}).to_excel(source, index=False)
+    assert len(read_excel_cached(source, cache_dir=cache_dir)) == 1
+    assert len(load_manifest(cache_dir)['entries']) == 2
+
+
+def test_parallel_workers_do_not_lose_entries(tmp_path):
+    sources = write_sources(str(tmp_path), 8)
+    cache_dir = str(tmp_path / 'cache')
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        frames = list(pool.map(read_excel_cached, sources, [cache_dir] * len(sources)))
+    assert [len(df) for df in frames] == [5] * 8
+
+    manifest = load_manifest(cache_dir)
+    assert len(manifest['entries']) == 8
+    assert len(manifest['sources']) == 8
+    recorded = {entry['file'] for entry in manifest['entries'].values()}
+    cached_files = {name for name in os.listdir(cache_dir) if name.endswith(('.parquet', '.pickle'))}
+    assert cached_files == recorded
+
+
+def test_evict_counts_every_entry(tmp_path):
+    sources = write_sources(str(tmp_path), 3)
+    cache_dir = str(tmp_path / 'cache')
+    for source in sources:
+        read_excel_cached(source, cache_dir=cache_dir)
+
+    assert evict(cache_dir, max_total_bytes=0) == 3
+    assert load_manifest(cache_dir)['entries'] == {}
+    assert not [name for name in os.listdir(cache_dir) if name.endswith(('.parquet', '.pickle'))]
+    assert clear_cache(cache_dir) == 0
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from bench_actual_amount import make_v3_orders
+from ecommerce_analytics.channels import CHANNEL_ADAPTERS, CHANNELS, register_channel, standardize_orders, standardize_shopify
+from ecommerce_analytics.report import channel_statistics, concat_orders, monthly_stats_table, monthly_totals, order_aggregates
+
+
+def test_fractional_quantity():
+    # 以重量計價的商品：數量 1.5，金額 = 1.5 × 單價
+    raw = make_v3_orders(3).assign(Quantity=[1.5, 2, 0.25], **{'Selling Price': [100.0, 10.0, 40.0]})
+    std = standardize_shopify(raw)
+    assert std['數量'].tolist() == [1.5, 2.0, 0.25]
+    assert std['商品原始金額'].tolist() == [15000, 2000, 1000]
+
+
+def test_missing_order_number_stays_missing():
+    raw = make_v3_orders(2).assign(**{'Order No': ['#1001', None]})
+    std = standardize_shopify(raw)
+    assert std['訂單編號'].iloc[0] == '#1001'
+    assert pd.isna(std['訂單編號'].iloc[1])
+
+
+def test_registered_channel_is_listed_in_monthly_stats():
+    register_channel('Momo', {
+        '訂單編號': ['order_id'],
+        '訂單日期': ['date'],
+        '客戶名稱': ['buyer'],
+        '商品名稱': ['item'],
+        '數量': ['qty'],
+        '單價': ['price'],
+        '商品原始金額': ['total'],
+        '實際金額': ['total'],
+        '總金額': ['total'],
+    }, constants=dict.fromkeys(['折扣', '分攤後金額', '分攤後折扣', '成本', '單件利潤', '總成本', '總利潤', '利潤率'], 0))
+    try:
+        raw = pd.DataFrame({'order_id': ['M1'], 'date': ['2026-01-05'], 'buyer': ['Amy'], 'item': ['杯子'],
+                            'qty': [1], 'price': [100.0], 'total': [100.0]})
+        orders = order_aggregates(concat_orders([standardize_shopify(make_v3_orders(2)), standardize_orders(raw, 'Momo')]))
+        totals = monthly_totals(orders)
+        stats = monthly_stats_table(totals, channel_statistics(orders, totals['total_actual']))
+
+        # 新渠道排在已註冊的渠道後面，每個渠道五行；沒有訂單的渠道為 0
+        assert stats['統計項目'].tolist()[-15:] == [
+            f"{channel} {label}" for channel in ['Shopify', 'Pinkoi', 'Momo'] for label in ['訂單數', '營業額', '佔比', '利潤', '利潤率']
+        ]
+        values = dict(zip(stats['統計項目'], stats['數值']))
+        assert (values['Momo 訂單數'], values['Momo 營業額'], values['Pinkoi 訂單數']) == (1, 100.0, 0)
+        assert len(stats.attrs['formats']) == len(stats)
+    finally:
+        CHANNELS.remove('Momo')
+        del CHANNEL_ADAPTERS['Momo']
@@ -0,0 +1,83 @@
+import pandas as pd
+
+from ecommerce_analytics.catalog import MATCH_BY_BASE_NAME, MATCH_BY_NAME, MATCH_BY_SKU, CostCatalog
+from ecommerce_analytics import cost_store
+from ecommerce_analytics.cost_store import CostStore
+from ecommerce_analytics.costs import join_product_costs
+
+
+def make_cost_table():
+    return pd.DataFrame({
+        'Product_Name': ['香氛蠟燭 - Small', '手工皂', '擴香瓶'],
+        'Variant SKU': ['CANDLE-S', 'SOAP', 'DIFF'],
+        'Cost': [100, 50, 200],
+    })
+
+
+def make_orders():
+    return pd.DataFrame({
+        'Product Name': ['香氛蠟燭 - Large', '  手工皂 ', '不知名商品', '擴香瓶'],
+        'SKU': ['', '', '', 'DIFF'],
+        'Quantity': [1, 2, 1, 1],
+        'Cost': [300, 120, 80, 450],
+    })
+
+
+def test_lookup_does_not_use_base_name_by_default():
+    catalog = CostCatalog.from_frame(make_cost_table(), 'Product_Name')
+    matched = catalog.lookup(make_orders()['Product Name'], skus=make_orders()['SKU'])
+    assert matched['匹配方式'].fillna('').tolist() == ['', MATCH_BY_NAME, '', MATCH_BY_SKU]
+    assert matched['單位成本'].isna().tolist() == [True, False, True, False]
+
+
+def test_base_name_matches_are_opt_in_and_reported():
+    orders, match_stats = join_product_costs(make_orders(), make_cost_table())
+    assert match_stats['approximate_matches'] == {}
+    assert list(match_stats['missing_products']) == ['香氛蠟燭 - Large', '不知名商品']
+
+    orders, match_stats = join_product_costs(make_orders(), make_cost_table(), base_name=True)
+    assert orders['單位成本'].tolist() == [100, 50, 0, 200]
+    assert match_stats['match_methods'][MATCH_BY_BASE_NAME] == 1
+    assert match_stats['approximate_matches'] == {'香氛蠟燭 - Large': (MATCH_BY_BASE_NAME, '香氛蠟燭 - small')}
+    assert list(match_stats['missing_products']) == ['不知名商品']
+
+
+def test_inserted_row_does_not_change_later_products(tmp_path):
+    cost = pd.DataFrame({
+        'Product_Name': [f"商品 {i}" for i in range(1000)],
+        'Variant SKU': [f"SKU-{i}" for i in range(1000)],
+        'Cost': range(1000),
+    })
+    with CostStore(str(tmp_path / 'cost.sqlite')) as store:
+        store.import_frame(cost, valid_from='2026-01-01')
+
+        # 在最上面插入一行：只有一個新增，其他產品只更新行號
+        inserted = pd.concat([pd.DataFrame({'Product_Name': ['新商品'], 'Variant SKU': ['NEW'], 'Cost': [5]}), cost])
+        counts = store.import_frame(inserted, valid_from='2026-02-01')
+        assert (counts['新增'], counts['修改'], counts['未變動']) == (1, 0, 1000)
+        assert store.conn.execute("SELECT COUNT(*) FROM cost_versions").fetchone()[0] == 1001
+        assert store.catalog().lookup(pd.Series(['新商品', '商品 999']))['單位成本'].tolist() == [5, 999]
+
+
+def test_store_lookup_by_order_date(tmp_path, monkeypatch):
+    with CostStore(str(tmp_path / 'cost.sqlite')) as store:
+        store.import_frame(make_cost_table(), valid_from='2026-01-01')
+        changed = make_cost_table().assign(Cost=[110, 50, 200])
+        store.import_frame(changed, valid_from='2026-02-01')
+        # 只移除產品的匯入：3 月起查不到手工皂
+        store.import_frame(changed[changed['Variant SKU'] != 'SOAP'], valid_from='2026-03-01')
+
+        builds = []
+        catalog_class = cost_store.CostCatalog
+        monkeypatch.setattr(cost_store, 'CostCatalog', lambda *args: builds.append(args) or catalog_class(*args))
+
+        # index 重複也依位置對應，結果沿用原本的 index
+        names = pd.Series(['香氛蠟燭 - Small', '香氛蠟燭 - Small', '手工皂', '手工皂', '擴香瓶'], index=[7, 7, 3, 3, 7])
+        dates = pd.Series(pd.to_datetime(['2026-01-15', '2026-02-15', '2026-02-15', '2026-03-15', None]))
+        for _ in range(2):
+            matched = store.lookup(names, order_dates=dates)
+            assert matched.index.tolist() == [7, 7, 3, 3, 7]
+            assert matched['單位成本'].fillna(0).tolist() == [100, 110, 50, 0, 200]
+
+        # 每個期間的成本表只建立一次；沒有日期的行和 3 月共用目前的成本
+        assert len(builds) == 3
@@ -0,0 +1,87 @@
+import pandas as pd
+
+from bench_actual_amount import make_v3_orders
+from ecommerce_analytics.channels import standardize_pinkoi, standardize_shopify
+from ecommerce_analytics.incremental import report_is_current, update_monthly_report
+from ecommerce_analytics.report import add_mismatch_sheet, build_monthly_report, check_pinkoi_amounts, write_monthly_report
+
+
+def pinkoi_orders():
+    return pd.DataFrame({
+        '訂單編號': ['P1', 'P1', 'P2'],
+        '訂單成立日期': pd.to_datetime(['2026-01-03', '2026-01-03', '2026-01-05']),
+        '買家': ['Amy', 'Amy', 'Ben'],
+        '購買品項': ['杯子', '盤子', '杯子'],
+        '數量': [1, 2, 1],
+        '商品單價': [300.0, 150.0, 300.0],
+        '總金額': [300.0, 299.5, 300.0],
+        '折抵': [0.0, 0.0, 0.0],
+    })
+
+
+def run(tmp_path, shopify, pinkoi, tolerance=1):
+    mismatches = check_pinkoi_amounts(pinkoi, tolerance=tolerance)
+    return update_monthly_report(
+        shopify, pinkoi, str(tmp_path / 'state.pkl'), output_path=str(tmp_path / 'report.xlsx'),
+        mismatches=mismatches, settings={'amount_tolerance': tolerance},
+    )
+
+
+def assert_report_matches(tmp_path, shopify, pinkoi, tolerance=1):
+    # 部分替換後的報表要和整本重寫的內容相同
+    expected, _ = build_monthly_report(shopify, pinkoi)
+    add_mismatch_sheet(expected, check_pinkoi_amounts(pinkoi, tolerance=tolerance))
+    write_monthly_report(expected, str(tmp_path / 'expected.xlsx'))
+    written = pd.read_excel(tmp_path / 'report.xlsx', sheet_name=None)
+    expected = pd.read_excel(tmp_path / 'expected.xlsx', sheet_name=None)
+    assert list(written) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(written[name], expected[name])
+
+
+def test_only_changed_sheets_are_rewritten(tmp_path):
+    shopify = standardize_shopify(make_v3_orders(30))
+    pinkoi = standardize_pinkoi(pinkoi_orders())
+
+    _, _, delta = run(tmp_path, shopify, pinkoi)
+    assert len(delta['寫出']) == 4
+
+    _, _, delta = run(tmp_path, shopify, pinkoi)
+    assert delta['寫出'] == []
+
+    # 改一筆 Shopify 訂單：Pinkoi 明細不用重寫
+    shopify.loc[0, '實際金額'] += 100
+    _, _, delta = run(tmp_path, shopify, pinkoi)
+    assert (delta['修改'], delta['寫出']) == (1, ['月度統計', '渠道對比', 'Shopify訂單明細'])
+    assert_report_matches(tmp_path, shopify, pinkoi)
+
+
+def test_settings_change_rewrites_report(tmp_path):
+    shopify = standardize_shopify(make_v3_orders(30))
+    pinkoi = standardize_pinkoi(pinkoi_orders())
+    run(tmp_path, shopify, pinkoi, tolerance=1)
+
+    # 訂單沒變，但容許誤差改小後多了金額不一致的工作表
+    _, _, delta = run(tmp_path, shopify, pinkoi, tolerance=0.1)
+    assert (delta['新增'], delta['修改'], delta['刪除']) == (0, 0, 0)
+    assert 'Pinkoi金額不一致' in delta['寫出']
+    assert_report_matches(tmp_path, shopify, pinkoi, tolerance=0.1)
+
+    # 改回來後這個工作表要從報表移除
+    _, _, delta = run(tmp_path, shopify, pinkoi, tolerance=1)
+    assert 'Pinkoi金額不一致' not in delta['寫出']
+    assert_report_matches(tmp_path, shopify, pinkoi, tolerance=1)
+
+
+def test_report_is_current(tmp_path):
+    source = tmp_path / 'pinkoi.xlsx'
+    pinkoi_orders().to_excel(source, index=False)
+    shopify = standardize_shopify(make_v3_orders(30))
+    pinkoi = standardize_pinkoi(pd.read_excel(source))
+    state_path, output_path = str(tmp_path / 'state.pkl'), str(tmp_path / 'report.xlsx')
+
+    assert not report_is_current(state_path, output_path, [source], {'amount_tolerance': 1})
+    update_monthly_report(shopify, pinkoi, state_path, output_path=output_path, inputs=[source],
+                          settings={'amount_tolerance': 1})
+    assert report_is_current(state_path, output_path, [source], {'amount_tolerance': 1})
+    assert not report_is_current(state_path, output_path, [source], {'amount_tolerance': 2})
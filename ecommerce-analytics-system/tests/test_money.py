@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from ecommerce_analytics.money import from_cents, prefer_positive, times_cents, to_cents
+
+
+def test_to_cents_rounds_to_cent_and_treats_text_as_zero():
+    cents = to_cents(pd.Series([0.1, 0.2, 19.995, '12.50', 'abc', None]))
+    assert cents.dtype == 'int64'
+    assert cents.tolist() == [10, 20, 2000, 1250, 0, 0]
+    assert to_cents(0.1) + to_cents(0.2) == to_cents(0.3)
+
+
+def test_from_cents():
+    assert from_cents(pd.Series([1234, -5])).tolist() == [12.34, -0.05]
+    assert from_cents(150) == 1.5
+
+
+def test_times_cents_fractional_quantity():
+    # 1.5 × 3.33 = 4.995 → 500 分；0.333 × 100.00 = 33.3 → 3330 分
+    result = times_cents(pd.Series([1.5, 0.333, 2, 0]), pd.Series([333, 10000, 199, 500]))
+    assert result.dtype == 'int64'
+    assert result.tolist() == [500, 3330, 398, 0]
+
+
+def test_times_cents_keeps_index_and_accepts_arrays():
+    cents = pd.Series([100, 200], index=[10, 20])
+    assert times_cents(pd.Series([0.5, 1.25], index=[10, 20]), cents).index.tolist() == [10, 20]
+    assert times_cents(np.array([2.5]), np.array([101])).tolist() == [252]
+
+
+def test_prefer_positive():
+    preferred = pd.Series([500, 0, -10, 300])
+    fallback = pd.Series([100, 200, 300, 400])
+    assert prefer_positive(preferred, fallback).tolist() == [500, 200, 300, 300]
@@ -0,0 +1,24 @@
+import pytest
+
+from check_rowwise import module_paths, rowwise_calls
+
+
+@pytest.mark.parametrize('path', module_paths())
+def test_modules_have_no_rowwise_calls(path):
+    with open(path, encoding='utf-8') as f:
+        assert rowwise_calls(f.read(), path) == []
+
+
+@pytest.mark.parametrize('source', [
+    "df.apply(f, axis=1)",
+    "df.apply(f, 1)",
+    "df.apply(f, axis='columns')",
+    "df.iterrows()",
+])
+def test_rowwise_calls_are_detected(source):
+    assert len(rowwise_calls(source, '<test>')) == 1
+
+
+@pytest.mark.parametrize('source', ["df.apply(f)", "df.apply(f, 0)", "df.to_dict('records')"])
+def test_columnwise_calls_pass(source):
+    assert rowwise_calls(source, '<test>') == []
@@ -0,0 +1,21 @@
+import pytest
+
+from ecommerce_analytics import readers
+from ecommerce_analytics.readers import ENGINE_ENV, select_engine
+
+
+@pytest.mark.parametrize('has_calamine, expected', [(False, 'openpyxl'), (True, 'calamine')])
+def test_default_engine(monkeypatch, has_calamine, expected):
+    monkeypatch.delenv(ENGINE_ENV, raising=False)
+    monkeypatch.setattr(readers, '_has_calamine', lambda: has_calamine)
+    assert select_engine() == expected
+
+
+def test_engine_from_env(monkeypatch):
+    monkeypatch.setattr(readers, '_has_calamine', lambda: False)
+    monkeypatch.setenv(ENGINE_ENV, 'openpyxl')
+    assert select_engine() == 'openpyxl'
+    with pytest.raises(ValueError):
+        select_engine('calamine')
+    with pytest.raises(ValueError):
+        select_engine('xml')
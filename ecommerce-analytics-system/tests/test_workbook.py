@@ -0,0 +1,50 @@
+import zipfile
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from ecommerce_analytics.workbook import replace_sheet_part, write_sheet
+
+
+def write_book(path):
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame({'年份': [2025], '總訂單數': [3]}).to_excel(writer, sheet_name='統計', index=False)
+        pd.DataFrame({'訂單編號': ['P1', 'P2']}).to_excel(writer, sheet_name='明細', index=False)
+
+
+def test_non_finite_values_are_written_as_empty_cells(tmp_path):
+    path = tmp_path / 'book.xlsx'
+    write_book(path)
+    df = pd.DataFrame({'利潤率': [np.inf, 0.25, -np.inf, np.nan, 1.5]})
+    assert replace_sheet_part(path, '統計', df)
+
+    # 檔案要能正常開啟，inf 和 NaN 一樣是空白
+    sheet = openpyxl.load_workbook(path)['統計']
+    assert [cell.value for cell in sheet['A']] == ['利潤率', None, 0.25, None, None, 1.5]
+
+
+@pytest.mark.parametrize('customize', [
+    lambda sheet: sheet.merge_cells('A1:B1'),
+    lambda sheet: setattr(sheet.column_dimensions['A'], 'width', 30),
+    lambda sheet: setattr(sheet['A2'], 'hyperlink', 'https://example.com'),
+])
+def test_sheet_with_layout_is_not_replaced(tmp_path, customize):
+    path = tmp_path / 'book.xlsx'
+    write_book(path)
+    book = openpyxl.load_workbook(path)
+    customize(book['統計'])
+    book.save(path)
+    with zipfile.ZipFile(path) as archive:
+        before = {info.filename: archive.read(info) for info in archive.infolist()}
+
+    # 換掉工作表 XML 會遺失欄寬、合併儲存格等設定，不替換，檔案不變
+    assert not replace_sheet_part(path, '統計', pd.DataFrame({'年份': [2026]}))
+    with zipfile.ZipFile(path) as archive:
+        assert {info.filename: archive.read(info) for info in archive.infolist()} == before
+
+    # write_sheet 改用 openpyxl 寫入
+    write_sheet(path, '統計', pd.DataFrame({'年份': [2026]}))
+    assert pd.read_excel(path, sheet_name='統計')['年份'].tolist() == [2026]
+    assert pd.read_excel(path, sheet_name='明細')['訂單編號'].tolist() == ['P1', 'P2']